@@ -0,0 +1,94 @@
+"""Rule evaluation benchmark for the filter hot loop.
+
+Run from the repository root:
+
+    python benchmarks/filters.py --commits 200000
+
+Compares the predicates the analyzer builds with logging disabled against
+the instrumented ones it builds for DEBUG runs, both measured with logging
+disabled, i.e. the per-commit logger call cost the quiet path no longer pays.
+"""
+import argparse
+import collections
+import copy
+import json
+import logging
+import time
+
+from dikort.analyzer import _enabled_checks, _iter_violations
+from dikort.commits import CommitRecord
+from dikort.config import DEFAULTS, _post_processing
+
+ENABLED_RULES = (
+    "enable_length",
+    "enable_capitalized_summary",
+    "enable_trailing_period",
+    "enable_singleline_summary",
+    "enable_signoff",
+    "enable_regex",
+    "enable_author_name_regex",
+    "enable_author_email_regex",
+)
+
+
+def benchmark_config():
+    config = copy.deepcopy(DEFAULTS.copy())
+    for rule_param in ENABLED_RULES:
+        config["rules"][rule_param] = True
+    _post_processing(config)
+    return config
+
+
+def synthetic_commits(commits_count):
+    return [
+        CommitRecord(
+            hexsha=f"{commit_index:040x}",
+            parents_count=1,
+            summary=f"Change number {commit_index}",
+            message_tail="Signed-off-by: Neo <neo@matrix.com>",
+            author_name=f"Author {commit_index % 10}",
+            author_email=f"author{commit_index % 10}@matrix.com",
+        )
+        for commit_index in range(commits_count)
+    ]
+
+
+def build_checks(config, level):
+    logging.getLogger().setLevel(level)
+    return _enabled_checks(config)
+
+
+def measure(commits, checks, repeat):
+    timings = []
+    for _ in range(repeat):
+        started_at = time.perf_counter()
+        collections.deque(_iter_violations(commits, checks), maxlen=0)
+        timings.append(time.perf_counter() - started_at)
+    return min(timings) * 1e9 / len(commits)
+
+
+def main():
+    cmd_args_parser = argparse.ArgumentParser(description="Measure rule evaluation cost per commit")
+    cmd_args_parser.add_argument("--commits", type=int, default=100000, help="Number of commits (default: 100000)")
+    cmd_args_parser.add_argument("--repeat", type=int, default=5, help="Number of measurements (default: 5)")
+    cmd_args = cmd_args_parser.parse_args()
+    logging.basicConfig(handlers=[logging.NullHandler()])
+    config = benchmark_config()
+    commits = synthetic_commits(cmd_args.commits)
+    quiet_checks = build_checks(config, logging.INFO)
+    instrumented_checks = build_checks(config, logging.DEBUG)
+    logging.getLogger().setLevel(logging.INFO)
+    quiet_ns = measure(commits, quiet_checks, cmd_args.repeat)
+    instrumented_ns = measure(commits, instrumented_checks, cmd_args.repeat)
+    report = {
+        "commits": cmd_args.commits,
+        "rules": len(ENABLED_RULES),
+        "quiet_ns_per_commit": round(quiet_ns),
+        "instrumented_ns_per_commit": round(instrumented_ns),
+        "logging_overhead_removed": f"{1 - quiet_ns / instrumented_ns:.0%}",
+    }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
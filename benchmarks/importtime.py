@@ -0,0 +1,60 @@
+"""Import time regression benchmark for the dikort entry point.
+
+Run from the repository root:
+
+    python benchmarks/importtime.py --budget-ms 100
+
+Exits with a non-zero status if importing ``dikort.main`` takes longer than the
+budget or pulls in any of the modules which must stay lazy.
+"""
+import argparse
+import json
+import subprocess  # noqa: S404
+import sys
+
+ENTRY_POINT_MODULE = "dikort.main"
+LAZY_MODULES = ("git", "urllib.request", "sqlite3", "concurrent.futures", "tempfile", "argparse", "configparser")
+_IMPORT_TIME_PREFIX = "import time:"
+
+
+def measure_import(module):
+    command = (sys.executable, "-X", "importtime", "-c", f"import {module}")
+    python_run = subprocess.run(command, capture_output=True, check=True, text=True)  # noqa: S603
+    import_time_lines = filter(_is_import_time, python_run.stderr.splitlines())
+    return dict(map(_parse_import_time, import_time_lines))
+
+
+def _is_import_time(line):
+    return line.startswith(_IMPORT_TIME_PREFIX) and not line.endswith("| imported package")
+
+
+def _parse_import_time(line):
+    _, cumulative, imported_module = line.split("|")
+    return imported_module.strip(), int(cumulative)
+
+
+def main():
+    cmd_args_parser = argparse.ArgumentParser(description="Measure dikort import time")
+    cmd_args_parser.add_argument("--budget-ms", type=float, default=100, help="Maximum import time (default: 100)")
+    cmd_args_parser.add_argument("--repeat", type=int, default=5, help="Number of measurements (default: 5)")
+    cmd_args = cmd_args_parser.parse_args()
+    measurements = [measure_import(ENTRY_POINT_MODULE) for _ in range(cmd_args.repeat)]
+    import_time_ms = min(measurement[ENTRY_POINT_MODULE] for measurement in measurements) / 1000
+    eagerly_imported = set(LAZY_MODULES).intersection(*measurements)
+    _report(import_time_ms, cmd_args.budget_ms, eagerly_imported=sorted(eagerly_imported))
+
+
+def _report(import_time_ms, budget_ms, *, eagerly_imported):
+    report = {
+        "module": ENTRY_POINT_MODULE,
+        "import_time_ms": round(import_time_ms, 3),
+        "budget_ms": budget_ms,
+        "eagerly_imported": eagerly_imported,
+    }
+    print(json.dumps(report, indent=2))
+    if import_time_ms > budget_ms or eagerly_imported:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+"""Synthetic git repository generator for the benchmarks.
+
+Run from the repository root:
+
+    python benchmarks/synthetic.py /tmp/dikort-100k --commits 100000 --merge-ratio 0.1 --signed-ratio 0.3
+
+Writes all commits as a single pack streamed into ``git index-pack``, so even
+a million commits are generated in seconds without one git process per commit.
+Merge commits take a random recent commit as the second parent, signed commits
+carry a dummy ``gpgsig`` header (dikort checks for its presence only).
+"""
+import argparse
+import collections
+import hashlib
+import itertools
+import random
+import struct
+import subprocess  # noqa: S404
+import zlib
+
+BRANCH_REF = "refs/heads/main"
+EMPTY_TREE = b""
+START_TIMESTAMP = 1600000000
+MERGE_WINDOW = 100
+_COMMIT_TYPE = 1
+_TREE_TYPE = 2
+_PACK_VERSION = 2
+_SIZE_BITS = 4
+_VARINT_BITS = 7
+_ZLIB_LEVEL = 0
+_ZLIB_WINDOW_BITS = 9
+_ZLIB_MEMORY_LEVEL = 1
+_SIGNATURE_LINES = (
+    "-----BEGIN PGP SIGNATURE-----",
+    "",
+    "iQEzBAABCAAdFiEEZGlrb3J0IGJlbmNobWFyayBzaWduYXR1cmU=",
+    "-----END PGP SIGNATURE-----",
+)
+_SIGNATURE_HEADER = "gpgsig {0}\n".format("\n ".join(_SIGNATURE_LINES))
+
+
+def object_hexsha(object_kind, object_bytes):
+    return hashlib.sha1(b"%s %d\0%s" % (object_kind, len(object_bytes), object_bytes)).hexdigest()  # noqa: S303,S324
+
+
+def generate_repository(  # noqa: WPS211
+    repository_path,
+    commits_count,
+    *,
+    merge_ratio=0.1,
+    signed_ratio=0.3,
+    authors_count=10,
+    seed=0,
+):
+    _git("init", "--quiet", repository_path)
+    tree_hexsha = object_hexsha(b"tree", EMPTY_TREE)
+    recent_hexshas = collections.deque(maxlen=MERGE_WINDOW)
+    commits = _synthetic_commits(
+        recent_hexshas,
+        tree_hexsha,
+        commits_count,
+        rng=random.Random(seed),  # noqa: S311
+        merge_ratio=merge_ratio,
+        signed_ratio=signed_ratio,
+        authors_count=authors_count,
+    )
+    index_pack_command = ("git", "-C", repository_path, "index-pack", "--stdin")
+    index_pack = subprocess.Popen(index_pack_command, stdin=subprocess.PIPE, stdout=subprocess.DEVNULL)  # noqa: S603
+    _write_pack(index_pack.stdin, commits, objects_count=commits_count + 1)
+    index_pack.stdin.close()
+    if index_pack.wait():
+        raise RuntimeError("git index-pack failed")
+    _git("-C", repository_path, "update-ref", BRANCH_REF, recent_hexshas[-1])
+    _git("-C", repository_path, "symbolic-ref", "HEAD", BRANCH_REF)
+
+
+def _synthetic_commits(  # noqa: WPS211
+    recent_hexshas,
+    tree_hexsha,
+    commits_count,
+    *,
+    rng,
+    merge_ratio,
+    signed_ratio,
+    authors_count,
+):
+    for commit_index in range(commits_count):
+        parents = [recent_hexshas[-1]] if recent_hexshas else []
+        if len(recent_hexshas) > 1 and rng.random() < merge_ratio:
+            parents.append(recent_hexshas[rng.randrange(len(recent_hexshas) - 1)])
+        commit = _commit_content(
+            tree_hexsha,
+            parents,
+            commit_index,
+            author_index=commit_index % authors_count,
+            signed=rng.random() < signed_ratio,
+        )
+        commit_hexsha = object_hexsha(b"commit", commit)
+        recent_hexshas.append(commit_hexsha)
+        yield commit
+
+
+def _commit_content(tree_hexsha, parents, commit_index, *, author_index, signed):  # noqa: WPS210
+    author = "Author {0} <author{0}@example.com>".format(author_index)
+    identity = "{0} {1} +0000".format(author, START_TIMESTAMP + commit_index)
+    header_lines = [f"tree {tree_hexsha}\n"]
+    header_lines.extend(f"parent {parent}\n" for parent in parents)
+    header_lines.append(f"author {identity}\ncommitter {identity}\n")
+    if signed:
+        header_lines.append(_SIGNATURE_HEADER)
+    if len(parents) > 1:
+        summary = f"Merge change number {commit_index}"
+    else:
+        summary = f"Change number {commit_index}"
+    message = f"\n{summary}\n\nSigned-off-by: {author}\n"
+    return "".join((*header_lines, message)).encode()
+
+
+def _write_pack(stream, commits, *, objects_count):
+    pack_digest = hashlib.sha1()  # noqa: S303,S324
+    pack_header = struct.pack(">4sII", b"PACK", _PACK_VERSION, objects_count)
+    commit_entries = (_pack_entry(_COMMIT_TYPE, commit) for commit in commits)
+    pack_chunks = itertools.chain((pack_header, _pack_entry(_TREE_TYPE, EMPTY_TREE)), commit_entries)
+    for pack_chunk in pack_chunks:
+        pack_digest.update(pack_chunk)
+        stream.write(pack_chunk)
+    stream.write(pack_digest.digest())
+
+
+def _pack_entry(object_type, object_bytes):
+    size = len(object_bytes)
+    header_byte = (object_type << _SIZE_BITS) | (size & 0xF)
+    size >>= _SIZE_BITS
+    header = bytearray()
+    while size:
+        header.append(header_byte | 0x80)
+        header_byte = size & 0x7F
+        size >>= _VARINT_BITS
+    header.append(header_byte)
+    compressor = zlib.compressobj(_ZLIB_LEVEL, zlib.DEFLATED, _ZLIB_WINDOW_BITS, _ZLIB_MEMORY_LEVEL)
+    return b"".join((header, compressor.compress(object_bytes), compressor.flush()))
+
+
+def _git(*git_args):
+    subprocess.run(("git", *git_args), check=True, stdout=subprocess.DEVNULL)  # noqa: S603,S607
+
+
+def main():
+    cmd_args_parser = argparse.ArgumentParser(description="Generate a synthetic git repository")
+    cmd_args_parser.add_argument("repository", help="Path of the repository to create")
+    cmd_args_parser.add_argument("--commits", type=int, default=1000, help="Number of commits (default: 1000)")
+    cmd_args_parser.add_argument("--merge-ratio", type=float, default=0.1, help="Share of merges (default: 0.1)")
+    cmd_args_parser.add_argument("--signed-ratio", type=float, default=0.3, help="Share of signed (default: 0.3)")
+    cmd_args_parser.add_argument("--authors", type=int, default=10, help="Number of authors (default: 10)")
+    cmd_args_parser.add_argument("--seed", type=int, default=0, help="Random seed (default: 0)")
+    cmd_args = cmd_args_parser.parse_args()
+    generate_repository(
+        cmd_args.repository,
+        cmd_args.commits,
+        merge_ratio=cmd_args.merge_ratio,
+        signed_ratio=cmd_args.signed_ratio,
+        authors_count=cmd_args.authors,
+        seed=cmd_args.seed,
+    )
+
+
+if __name__ == "__main__":
+    main()
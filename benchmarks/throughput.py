@@ -0,0 +1,209 @@
+"""End-to-end throughput benchmark on synthetic repositories.
+
+Run from the repository root:
+
+    python benchmarks/throughput.py --commits 1000 100000 1000000 --output throughput.json
+
+Generates a synthetic repository for every size (see ``synthetic.py``), runs
+``analyze_commits`` over its whole history in a fresh interpreter and records
+commits per second, peak RSS of dikort and of its git children, and the number
+of spawned subprocesses. Then every enabled rule is timed alone against the
+already parsed commits. The JSON report carries the dikort, git and Python
+versions, so reports of different releases can be compared side by side.
+"""
+import argparse
+import collections
+import contextlib
+import copy
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import subprocess  # noqa: S404
+import tempfile
+import time
+
+from git import Repo
+from synthetic import generate_repository
+
+import dikort
+from dikort.analyzer import (
+    _enabled_checks,
+    _iter_violations,
+    _required_fields,
+    analyze_commits,
+)
+from dikort.commits import iter_commits
+from dikort.config import DEFAULTS, _post_processing
+
+BENCHMARK_RANGE = "HEAD"
+RULES_SECTIONS = ("rules", "merge_rules")
+_KILOBYTES_PER_MAXRSS_UNIT = 1 / 1024 if platform.system() == "Darwin" else 1
+
+
+def benchmark_config(repository_path, jobs=1):
+    config = copy.deepcopy(DEFAULTS.copy())
+    config["main"].update(repository=repository_path, range=BENCHMARK_RANGE, jobs=jobs)
+    for section in RULES_SECTIONS:
+        config[section] = dict.fromkeys(config[section], True)  # noqa: WPS425
+    _post_processing(config)
+    return config
+
+
+def measure_end_to_end(repository_path, *, jobs, repeat):
+    spawn_context = multiprocessing.get_context("spawn")
+    measurements = []
+    for _ in range(repeat):
+        receiver, sender = spawn_context.Pipe(duplex=False)
+        analysis = spawn_context.Process(target=_analyze_in_fresh_process, args=(sender, repository_path, jobs))
+        analysis.start()
+        measurements.append(receiver.recv())
+        analysis.join()
+    return min(measurements, key=lambda measurement: measurement["seconds"])
+
+
+def measure_rules(repository_path, *, repeat):
+    config = benchmark_config(repository_path)
+    started_at = time.perf_counter()
+    with Repo(repository_path) as repo:
+        commits = list(iter_commits(repo, BENCHMARK_RANGE, _required_fields(config)))
+    read_seconds = time.perf_counter() - started_at
+    rules = {}
+    for parents_count, rule_checks in _enabled_checks(config).items():
+        for rule, predicate in rule_checks:
+            rule_seconds = _best_time(commits, {parents_count: [(rule, predicate)]}, repeat)
+            rules[rule] = _throughput(len(commits), rule_seconds)
+    return {"read": _throughput(len(commits), read_seconds), "rules": rules}
+
+
+def _analyze_in_fresh_process(sender, repository_path, jobs):
+    spawned_commands = _count_subprocesses()
+    config = benchmark_config(repository_path, jobs)
+    started_at = time.perf_counter()
+    with open(os.devnull, "w") as devnull:
+        with contextlib.redirect_stdout(devnull):
+            with contextlib.suppress(SystemExit):
+                analyze_commits(config)
+    measurement = {
+        "seconds": time.perf_counter() - started_at,
+        "subprocesses": len(spawned_commands),
+        "peak_rss_kb": _peak_rss_kb(resource.RUSAGE_SELF),
+        "children_peak_rss_kb": _peak_rss_kb(resource.RUSAGE_CHILDREN),
+    }
+    sender.send(measurement)
+
+
+def _count_subprocesses():
+    spawned_commands = []
+    popen_init = subprocess.Popen.__init__  # noqa: WPS609
+
+    def counting_popen_init(popen, popen_args, *args, **kwargs):  # noqa: WPS430
+        spawned_commands.append(popen_args)
+        popen_init(popen, popen_args, *args, **kwargs)
+
+    subprocess.Popen.__init__ = counting_popen_init  # noqa: WPS609
+    return spawned_commands
+
+
+def _peak_rss_kb(who):
+    return round(resource.getrusage(who).ru_maxrss * _KILOBYTES_PER_MAXRSS_UNIT)
+
+
+def _best_time(commits, checks, repeat):
+    timings = []
+    for _ in range(repeat):
+        started_at = time.perf_counter()
+        collections.deque(_iter_violations(commits, checks), maxlen=0)
+        timings.append(time.perf_counter() - started_at)
+    return min(timings)
+
+
+def _throughput(commits_count, seconds):
+    return {"seconds": round(seconds, 6), "commits_per_second": round(commits_count / seconds)}
+
+
+def _benchmark_repository(repository_path, commits_count, cmd_args):
+    if os.path.exists(repository_path):
+        generate_seconds = None
+    else:
+        started_at = time.perf_counter()
+        generate_repository(
+            repository_path,
+            commits_count,
+            merge_ratio=cmd_args.merge_ratio,
+            signed_ratio=cmd_args.signed_ratio,
+            authors_count=cmd_args.authors,
+        )
+        generate_seconds = round(time.perf_counter() - started_at, 3)
+    end_to_end = measure_end_to_end(repository_path, jobs=cmd_args.jobs, repeat=cmd_args.repeat)
+    end_to_end.update(_throughput(commits_count, end_to_end["seconds"]))
+    return {
+        "commits": commits_count,
+        "generate_seconds": generate_seconds,
+        "end_to_end": end_to_end,
+        **measure_rules(repository_path, repeat=cmd_args.repeat),
+    }
+
+
+def _environment():
+    git_version = subprocess.run(("git", "--version"), capture_output=True, check=True, text=True)  # noqa: S603,S607
+    return {
+        "dikort": dikort.__version__,
+        "python": platform.python_version(),
+        "git": git_version.stdout.strip(),
+        "platform": platform.platform(),
+    }
+
+
+def _run(cmd_args, work_dir):
+    repositories = []
+    for commits_count in cmd_args.commits:
+        repository_name = "commits-{0}-merges-{1}-signed-{2}-authors-{3}".format(
+            commits_count,
+            cmd_args.merge_ratio,
+            cmd_args.signed_ratio,
+            cmd_args.authors,
+        )
+        repository_path = os.path.join(work_dir, repository_name)
+        repositories.append(_benchmark_repository(repository_path, commits_count, cmd_args))
+    return {
+        "environment": _environment(),
+        "parameters": {
+            "jobs": cmd_args.jobs,
+            "merge_ratio": cmd_args.merge_ratio,
+            "signed_ratio": cmd_args.signed_ratio,
+            "authors": cmd_args.authors,
+        },
+        "repositories": repositories,
+    }
+
+
+def _parse_cmd_args():
+    cmd_args_parser = argparse.ArgumentParser(description="Measure dikort throughput on synthetic repositories")
+    cmd_args_parser.add_argument("--commits", type=int, nargs="+", default=[1000], help="Sizes (default: 1000)")
+    cmd_args_parser.add_argument("--merge-ratio", type=float, default=0.1, help="Share of merges (default: 0.1)")
+    cmd_args_parser.add_argument("--signed-ratio", type=float, default=0.3, help="Share of signed (default: 0.3)")
+    cmd_args_parser.add_argument("--authors", type=int, default=10, help="Number of authors (default: 10)")
+    cmd_args_parser.add_argument("-j", "--jobs", type=int, default=1, help="Value of --jobs (default: 1)")
+    cmd_args_parser.add_argument("--repeat", type=int, default=3, help="Number of measurements (default: 3)")
+    cmd_args_parser.add_argument("--work-dir", help="Keep and reuse generated repositories here")
+    cmd_args_parser.add_argument("--output", help="Write the JSON report to this file")
+    return cmd_args_parser.parse_args()
+
+
+def main():
+    cmd_args = _parse_cmd_args()
+    with contextlib.ExitStack() as stack:
+        work_dir = cmd_args.work_dir or stack.enter_context(tempfile.TemporaryDirectory())
+        report = _run(cmd_args, work_dir)
+    serialized_report = json.dumps(report, indent=2)
+    print(serialized_report)
+    if cmd_args.output:
+        with open(cmd_args.output, "w") as report_file:
+            report_file.write(serialized_report)
+            report_file.write("\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,19 @@
+import contextlib
 import functools
 import logging
 import sys
+import time
 import types
 
-from git import Repo
-from git.exc import GitCommandError, InvalidGitRepositoryError, NoSuchPathError
-
+from dikort.commits import (
+    CommitRecord,
+    GitCommitReader,
+    has_commit_graph,
+    read_commits,
+)
 from dikort.config import ERROR_EXIT_CODE, FAILED_EXIT_CODE
 from dikort.filters import (
+    GPG_VERIFIED,
     filter_author_email_regex,
     filter_author_name_regex,
     filter_capitalized,
@@ -18,7 +24,12 @@ from dikort.filters import (
     filter_singleline,
     filter_trailing_period,
 )
-from dikort.print import print_error, print_success
+from dikort.message import read_message_commit
+from dikort.print import print_error, print_format_warning
+from dikort.reporters import REPORTERS
+
+FAST_PATH_MAX_COMMITS = 100
+_WORKER_STATE = {}  # noqa: WPS407
 
 RULES = types.MappingProxyType(
     {
@@ -28,38 +39,47 @@ RULES = types.MappingProxyType(
             "Summary length": {
                 "param": "enable_length",
                 "filter": filter_length,
+                "fields": (),
             },
             "Trailing period": {
                 "param": "enable_trailing_period",
                 "filter": filter_trailing_period,
+                "fields": (),
             },
             "Capitalized summary": {
                 "param": "enable_capitalized_summary",
                 "filter": filter_capitalized,
+                "fields": (),
             },
             "Single line summary": {
                 "param": "enable_singleline_summary",
                 "filter": filter_singleline,
+                "fields": (),
             },
             "Signoff": {
                 "param": "enable_signoff",
                 "filter": filter_signoff,
+                "fields": ("message_tail",),
             },
             "GPG": {
                 "param": "enable_gpg",
                 "filter": filter_gpg,
+                "fields": ("has_signature",),
             },
             "Regex": {
                 "param": "enable_regex",
                 "filter": filter_regex,
+                "fields": (),
             },
             "Author name regex": {
                 "param": "enable_author_name_regex",
                 "filter": filter_author_name_regex,
+                "fields": ("author_name",),
             },
             "Author email regex": {
                 "param": "enable_author_email_regex",
                 "filter": filter_author_email_regex,
+                "fields": ("author_email",),
             },
         },
     }
@@ -74,118 +94,529 @@ MERGE_RULES = types.MappingProxyType(
             "Summary length (merge commits)": {
                 "param": "enable_length",
                 "filter": filter_length,
+                "fields": (),
             },
             "Trailing period (merge commits)": {
                 "param": "enable_trailing_period",
                 "filter": filter_trailing_period,
+                "fields": (),
             },
             "Capitalized summary (merge commits)": {
                 "param": "enable_capitalized_summary",
                 "filter": filter_capitalized,
+                "fields": (),
             },
             "Signle line summary (merge commits)": {
                 "param": "enable_singleline_summary",
                 "filter": filter_singleline,
+                "fields": (),
             },
             "Signoff (merge commits)": {
                 "param": "enable_signoff",
                 "filter": filter_signoff,
+                "fields": ("message_tail",),
             },
             "GPG (merge commits)": {
                 "param": "enable_gpg",
                 "filter": filter_gpg,
+                "fields": ("has_signature",),
             },
             "Regex (merge commits)": {
                 "param": "enable_regex",
                 "filter": filter_regex,
+                "fields": (),
             },
             "Author name regex (merge commits)": {
                 "param": "enable_author_name_regex",
                 "filter": filter_author_name_regex,
+                "fields": ("author_name",),
             },
             "Author email regex (merge commits)": {
                 "param": "enable_author_email_regex",
                 "filter": filter_author_email_regex,
+                "fields": ("author_email",),
             },
         },
     }
 )
 
 
-def _generic_check(commit_range, predicate, *, check_merge_commits):
-    desired_parents_count = 2 if check_merge_commits else 1
-    try:
-        return list(
-            filter(
-                predicate,
-                filter(
-                    lambda commit: len(commit.parents) == desired_parents_count,
-                    commit_range,
-                ),
-            )
+def _enabled_rules(config):
+    for rules in (RULES, MERGE_RULES):
+        for rule in rules["checks"]:
+            param_name = rules["checks"][rule]["param"]
+            if not config[rules["params_section"]][param_name]:
+                logging.info("Rule '%s' disabled. Skip.", rule)
+                continue
+            logging.debug("Rule '%s' enabled.", rule)
+            yield rules, rule
+
+
+def _debug_enabled(logging_config):
+    return logging_config["enabled"] and logging.getLogger().isEnabledFor(logging.DEBUG)
+
+
+def _enabled_checks(config, metrics=None):  # noqa: WPS210
+    checks = {}
+    debug_enabled = _debug_enabled(config["logging"])
+    for rules, rule in _enabled_rules(config):
+        parents_count = 2 if rules["check_merge_commits"] else 1
+        predicate = functools.partial(
+            rules["checks"][rule]["filter"],
+            config=config[f"{rules['params_section']}.settings"],
         )
-    except GitCommandError as err:
+        if debug_enabled:
+            predicate = functools.partial(_logged_predicate, predicate, rule=rule)
+        if metrics:
+            predicate = functools.partial(_timed_predicate, predicate, rule_metrics=metrics.rule(rule))
+        checks.setdefault(parents_count, []).append((rule, predicate))
+    return checks
+
+
+def _logged_predicate(predicate, commit, *, rule):
+    logging.debug("Check %s commit for '%s' rule", commit.hexsha, rule)
+    return predicate(commit)
+
+
+def _timed_predicate(predicate, commit, *, rule_metrics):
+    started_at = time.perf_counter()
+    failed = predicate(commit)
+    rule_metrics.record(time.perf_counter() - started_at, failed)
+    return failed
+
+
+def _required_fields(config):
+    fields = set()
+    for rules, rule in _enabled_rules(config):
+        fields.update(rules["checks"][rule]["fields"])
+    return frozenset(fields)
+
+
+def _check_commits(commit_range, checks, jobs=1, max_violations=0, metrics=None):
+    from subprocess import CalledProcessError  # noqa: S404
+
+    from git.exc import GitCommandError
+
+    from dikort.packs import PackError
+
+    if jobs > 1:
+        evaluate = functools.partial(_check_commits_in_pool, jobs=jobs, metrics=metrics)
+    else:
+        evaluate = _iter_violations
+    violations = evaluate(commit_range, checks)
+    try:
+        with contextlib.closing(violations):
+            yield from _limit_violations(violations, max_violations)
+    except (GitCommandError, PackError, CalledProcessError) as err:
         print_error(f"Cannot read commit in rage. Error: {err}")
         sys.exit(ERROR_EXIT_CODE)
 
 
-def analyze_commits(config):  # noqa: WPS210
+def _iter_violations(commit_range, checks):
+    for commit in commit_range:
+        for rule, predicate in checks.get(commit.parents_count, ()):
+            if predicate(commit):
+                yield rule, commit
+
+
+def _limit_violations(violations, max_violations=0):
+    for violations_count, violation in enumerate(violations, 1):
+        yield violation
+        if violations_count == max_violations:
+            logging.info("Stop checks after %d violations", violations_count)
+            return
+
+
+def _check_commits_in_pool(commit_range, checks, *, jobs, metrics=None):
+    from dikort.parallel import imap_chunks
+
+    logging.debug("Evaluate rules in %d processes", jobs)
+    chunks_results = imap_chunks(
+        _evaluate_chunk,
+        commit_range,
+        jobs=jobs,
+        initializer=_init_worker,
+        initargs=(checks, metrics),
+    )
+    with contextlib.closing(chunks_results):
+        for chunk_violations, chunk_rules_metrics in chunks_results:
+            if metrics:
+                metrics.merge_rules(chunk_rules_metrics)
+            yield from chunk_violations
+
+
+def _max_violations(main_config):
+    return 1 if main_config["fail_fast"] else main_config["max_violations"]
+
+
+def _stopped_early(violations_count, main_config):
+    max_violations = _max_violations(main_config)
+    return bool(max_violations) and violations_count >= max_violations
+
+
+def _checked_rules(checks):
+    return [rule for rules_checks in checks.values() for rule, _ in rules_checks]
+
+
+def _init_worker(checks, metrics=None):
+    if metrics:
+        metrics.take_rules()
+    _WORKER_STATE.update(checks=checks, metrics=metrics)
+
+
+def _evaluate_chunk(commits):
+    violations = list(_iter_violations(commits, _WORKER_STATE["checks"]))
+    metrics = _WORKER_STATE["metrics"]
+    return violations, metrics and metrics.take_rules()
+
+
+def analyze_commits(config, repo=None):  # noqa: WPS210
     logging.info("Start checks")
-    repo = _open_repository(config)
-    all_clear = True
+    config, ref_tips = _resolve_range(config)
+    metrics = _open_metrics(config["main"])
+    checks = _enabled_checks(config, metrics)
+    rules = _checked_rules(checks)
+    reporter = REPORTERS[config["main"]["format"]](sys.stdout, rules)
+    violations = None if repo else _collect_violations_fast(config, checks)
+    if violations is not None:
+        violations_count = _report_violations(_with_refs(violations, config, ref_tips), rules, reporter)
+        _export_metrics(metrics, config["main"])
+        _finish(not violations_count, reporter, _stopped_early(violations_count, config["main"]))
+        return
+    repo = repo or _open_repository(config)
+    main_config = config["main"]
+    watermark = _open_watermark(repo, main_config) if main_config["incremental"] else None
+    if watermark:
+        config = _with_range(config, watermark.commit_range(config["main"]["range"]))
+    violations = _collect_violations(_open_commit_reader(repo, config), config, checks, metrics) if checks else ()
+    violations_count = _report_violations(_with_refs(violations, config, ref_tips), rules, reporter)
+    if watermark and not violations_count:
+        watermark.update()
+    _export_metrics(metrics, config["main"])
+    _finish(not violations_count, reporter, _stopped_early(violations_count, config["main"]))
+
+
+def analyze_message(config):  # noqa: WPS210
+    logging.info("Start message checks")
+    commit = read_message_commit(config["main"]["message_file"])
+    if not commit.summary:
+        logging.info("Commit message is empty. Skip checks, git aborts the commit")
+        return
+    metrics = _open_metrics(config["main"])
+    checks = _message_checks(_enabled_checks(config, metrics), commit)
+    rules = _checked_rules(checks)
+    reporter = REPORTERS[config["main"]["format"]](sys.stdout, rules)
+    violations_count = _report_violations(_iter_violations((commit,), checks), rules, reporter)
+    _export_metrics(metrics, config["main"])
+    _finish(not violations_count, reporter)
+
+
+def _message_checks(checks, commit):
+    rules_fields = {**_rules_fields(RULES), **_rules_fields(MERGE_RULES)}
+    message_checks = []
+    for rule, predicate in checks.get(commit.parents_count, ()):
+        if any(getattr(commit, field) is None for field in rules_fields[rule]):
+            logging.info("Rule '%s' cannot be checked before commit is created. Skip.", rule)
+            continue
+        message_checks.append((rule, predicate))
+    return {commit.parents_count: message_checks}
+
+
+def _rules_fields(rules):
+    return {rule: rule_spec["fields"] for rule, rule_spec in rules["checks"].items()}
+
+
+def _report_violations(violations, rules, reporter):
+    violations_counts = dict.fromkeys(rules, 0)
+    for rule, commit in violations:
+        logging.debug("Rule '%s' failed. Hash: %s, message: '%s'", rule, commit.hexsha, commit.summary)
+        violations_counts[rule] += 1
+        reporter.report_violation(rule, commit)
+    _log_violations_counts(violations_counts)
+    return sum(violations_counts.values())
+
+
+def _log_violations_counts(violations_counts):
+    for rule, violations_count in violations_counts.items():
+        if violations_count:
+            logging.info("Failed %d commit for '%s' rule", violations_count, rule)
+        else:
+            logging.info("Errors not found for rule '%s'", rule)
+
+
+def _open_metrics(main_config):
+    if not (main_config["profile"] or main_config["metrics_file"]):
+        return None
+    from dikort.metrics import Metrics
+
+    return Metrics()
+
+
+def _export_metrics(metrics, main_config):
+    if not metrics:
+        return
+    if main_config["profile"]:
+        metrics.print_profile()
+    if main_config["metrics_file"]:
+        try:
+            metrics.write(main_config["metrics_file"])
+        except OSError as err:
+            warning = f"Cannot write metrics to {main_config['metrics_file']}. Error: {err}"
+            print_format_warning(main_config["format"], warning)
+
+
+def _collect_violations_fast(config, checks):
+    if not checks or not _fast_path_allowed(config):
+        return None
+    commits = read_commits(
+        config["main"]["repository"],
+        config["main"]["range"],
+        _required_fields(config),
+        frozenset(checks),
+        max_count=FAST_PATH_MAX_COMMITS,
+    )
+    if commits is None:
+        logging.debug("Fast path is not applicable. Open repository.")
+        return None
+    logging.debug("Check %d commits read with fast path", len(commits))
+    return _limit_violations(_iter_violations(commits, checks), _max_violations(config["main"]))
+
+
+def _fast_path_allowed(config):
+    main_config = config["main"]
+    if _verified_parents_counts(config):
+        return False
+    return main_config["backend"] == "git" and not (
+        main_config["cache"] or main_config["incremental"] or main_config["jobs"] > 1
+    )
+
+
+def _with_range(config, commit_range):
+    return {**config, "main": {**config["main"], "range": commit_range}}
+
+
+def _resolve_range(config):
+    main_config = config["main"]
+    if main_config["pre_receive"]:
+        return _with_range(config, _read_pushed_range()), None
+    if main_config["pr_base"]:
+        return _with_range(config, _read_pull_request_range(main_config)), None
+    if main_config["all_refs"]:
+        ref_tips = _read_ref_tips(main_config)
+        logging.info("Check %d refs", len(ref_tips))
+        return _with_range(config, tuple(dict.fromkeys(ref_tips.values()))), ref_tips
+    return config, None
+
+
+def _read_pushed_range():
+    from dikort.prereceive import pushed_range
+
+    try:
+        return pushed_range(sys.stdin)
+    except ValueError as err:
+        print_error(f"Cannot parse ref updates from stdin. Error: {err}")
+        sys.exit(ERROR_EXIT_CODE)
+
+
+def _read_pull_request_range(main_config):
+    from dikort.pullrequest import PullRequestError, pull_request_range
+
+    try:
+        return pull_request_range(main_config["repository"], main_config["pr_base"])
+    except PullRequestError as err:
+        print_error(f"Cannot find pull request commits. Error: {err}")
+        sys.exit(ERROR_EXIT_CODE)
+
+
+def _read_ref_tips(main_config):
+    from dikort.refs import RefsError, read_ref_tips
+
+    try:
+        return read_ref_tips(main_config["repository"], main_config["refs_glob"])
+    except RefsError as err:
+        print_error(f"Cannot read refs. Error: {err}")
+        sys.exit(ERROR_EXIT_CODE)
+
+
+def _with_refs(violations, config, ref_tips):
+    if not ref_tips:
+        return violations
+    from dikort.refs import RefsError, attribute_refs
+
+    violations = list(violations)
+    failed_commits = [commit for _, commit in violations]
+    try:
+        attribute_refs(failed_commits, config["main"]["repository"], ref_tips)
+    except RefsError as err:
+        print_error(f"Cannot find refs of failed commits. Error: {err}")
+        sys.exit(ERROR_EXIT_CODE)
+    return violations
+
+
+def _open_watermark(repo, main_config):
+    from git.exc import GitCommandError
+
+    from dikort.watermark import Watermark
+
+    try:
+        return Watermark(repo)
+    except TypeError as err:
+        print_format_warning(main_config["format"], f"Cannot check incrementally. Error: {err}")
+    except GitCommandError as err:
+        print_error(f"Cannot resolve HEAD. Error: {err}")
+        sys.exit(ERROR_EXIT_CODE)
+    return None
+
+
+def _collect_violations(reader, config, checks, metrics=None):
+    logging.debug("Walk commits in range %s", config["main"]["range"])
+    fields = _required_fields(config)
+    logging.debug("Load commit fields: %s", ", ".join(sorted(fields)))
+    if config["main"]["cache"]:
+        import sqlite3
+
+        try:
+            return _check_commits_with_cache(reader, config, checks, fields, metrics)
+        except sqlite3.Error as err:
+            print_format_warning(config["main"]["format"], f"Cannot use verdict cache. Error: {err}")
+    commit_range = reader.iter_commits(config["main"]["range"], fields, frozenset(checks))
+    commit_range = _with_signatures(commit_range, reader.git_dir, config)
+    max_violations = _max_violations(config["main"])
+    return _check_commits(commit_range, checks, config["main"]["jobs"], max_violations, metrics)
+
+
+def _check_commits_with_cache(reader, config, checks, fields, metrics=None):  # noqa: WPS210, WPS211
+    from dikort.cache import VerdictCache, config_digest
+
+    rules = _checked_rules(checks)
+    verdict_cache = VerdictCache(
+        reader.git_dir,
+        digest=config_digest(config),
+        max_size=config["main"]["cache_size"],
+    )
+    with contextlib.closing(verdict_cache):
+        commit_parents = _list_commit_parents(reader, config["main"]["range"], frozenset(checks))
+        verdicts = verdict_cache.get([hexsha for hexsha, _ in commit_parents])
+        new_hexshas = [hexsha for hexsha, _ in commit_parents if hexsha not in verdicts]
+        logging.info("Found %d cached verdicts, check %d new commits", len(verdicts), len(new_hexshas))
+        new_commits = _with_signatures(reader.load_commits(new_hexshas, fields), reader.git_dir, config)
+        max_violations = _max_violations(config["main"])
+        new_violations = _check_commits(new_commits, checks, config["main"]["jobs"], max_violations, metrics)
+        new_violations = list(new_violations)
+        new_verdicts = _verdicts_from_violations(new_hexshas, new_violations, rules)
+        if _stopped_early(len(new_violations), config["main"]):
+            logging.info("Checks stopped early. Skip verdict cache update")
+        else:
+            verdict_cache.update(new_verdicts)
+    verdicts.update(new_verdicts)
+    return _violations_from_verdicts(commit_parents, verdicts, rules, max_violations)
+
+
+def _with_signatures(commits, git_dir, config):
+    parents_counts = _verified_parents_counts(config)
+    if not parents_counts:
+        return commits
+    from dikort.signatures import attach_signatures
+
+    logging.debug("Verify signatures of commits with %s parents", sorted(parents_counts))
+    return attach_signatures(commits, git_dir, parents_counts=parents_counts, jobs=config["main"]["jobs"])
+
+
+def _verified_parents_counts(config):
+    parents_counts = set()
     for rules in (RULES, MERGE_RULES):
         params_section = rules["params_section"]
-        for rule in rules["checks"]:
-            param_name = rules["checks"][rule]["param"]
-            if not config[params_section][param_name]:
-                logging.info("Rule '%s' disabled. Skip.", rule)
-                continue
-            logging.debug("Rule '%s' enabled. Start.", rule)
-            print(f"[{rule}] - ", end="")
-            predicate = functools.partial(
-                rules["checks"][rule]["filter"],
-                config=config[f"{params_section}.settings"],
-            )
-            failed_commits = _generic_check(
-                repo.iter_commits(rev=config["main"]["range"]),
-                predicate,
-                check_merge_commits=rules["check_merge_commits"],
-            )
-            all_clear = _process_failed_commits(failed_commits, rule) and all_clear
-    _finish(all_clear)
+        settings = config[f"{params_section}.settings"]
+        if config[params_section]["enable_gpg"] and settings["gpg"] == GPG_VERIFIED:
+            parents_counts.add(2 if rules["check_merge_commits"] else 1)
+    return frozenset(parents_counts)
+
+
+def _list_commit_parents(reader, rev, parents_counts=()):
+    from git.exc import GitCommandError
+
+    from dikort.packs import PackError
+
+    try:
+        return list(reader.iter_commit_parents(rev, parents_counts))
+    except (GitCommandError, PackError) as err:
+        print_error(f"Cannot read commit in rage. Error: {err}")
+        sys.exit(ERROR_EXIT_CODE)
+
+
+def _verdicts_from_violations(hexshas, violations, rules):  # noqa: WPS210
+    verdicts = dict.fromkeys(hexshas, (0, ""))
+    rule_bits = {rule: 1 << rule_index for rule_index, rule in enumerate(rules)}
+    for rule, commit in violations:
+        mask, _ = verdicts[commit.hexsha]
+        verdicts[commit.hexsha] = (mask | rule_bits[rule], commit.summary)
+    return verdicts
+
+
+def _violations_from_verdicts(commit_parents, verdicts, rules, max_violations=0):
+    return _limit_violations(_iter_verdicts_violations(commit_parents, verdicts, rules), max_violations)
+
+
+def _iter_verdicts_violations(commit_parents, verdicts, rules):  # noqa: WPS210
+    for hexsha, parents_count in commit_parents:
+        mask, summary = verdicts[hexsha]
+        if not mask:
+            continue
+        commit = CommitRecord(hexsha, parents_count, summary)
+        yield from ((rule, commit) for rule in _rules_from_mask(mask, rules))
+
+
+def _rules_from_mask(mask, rules):
+    return [rule for rule_bit, rule in enumerate(rules) if mask & (1 << rule_bit)]
+
+
+def _open_commit_reader(repo, config):
+    if config["main"]["backend"] == "mmap":
+        from dikort.packs import PackError, open_pack_reader
+
+        try:
+            reader = open_pack_reader(repo.git_dir, config["main"]["range"])
+        except (PackError, OSError) as err:
+            warning = f"Cannot read commits from packfiles, read them with git. Error: {err}"
+            print_format_warning(config["main"]["format"], warning)
+        else:
+            logging.debug("Read commits from packfiles of %s", repo.git_dir)
+            return reader
+    return GitCommitReader(repo)
 
 
 def _open_repository(config):
+    from git import Repo
+    from git.exc import InvalidGitRepositoryError, NoSuchPathError
+
     repository_path = config["main"]["repository"]
     logging.debug("Open repo at %s", repository_path)
     try:
-        return Repo(repository_path)
+        repo = Repo(repository_path)
     except (NoSuchPathError, InvalidGitRepositoryError) as err:
         print_error(f"Cannot open git repo at {repository_path}. Error: {err}")
         sys.exit(ERROR_EXIT_CODE)
+    else:
+        _check_commit_graph(repo, config["main"]["format"])
+        return repo
+
 
+def _check_commit_graph(repo, output_format):
+    common_dir = getattr(repo, "common_dir", repo.git_dir)
+    if has_commit_graph(common_dir):
+        logging.debug("Walk commits with commit-graph of %s", common_dir)
+        return
+    warning = f"Commit-graph not found in {common_dir}. Run 'git commit-graph write --reachable' to speed up checks"
+    print_format_warning(output_format, warning)
 
-def _finish(all_clear):
+
+def _finish(all_clear, reporter, stopped_early=False):
+    reporter.finish(all_clear, stopped_early=stopped_early)
+    if stopped_early:
+        logging.info("Checks stopped early. Some commits are not checked.")
     if all_clear:
         logging.info("All clear.")
-        print_success("All clear.")
     else:
-        print_error("Some checks are failed.")
         logging.info("Some checks are failed.")
         logging.info("Exit with state %d", FAILED_EXIT_CODE)
         sys.exit(FAILED_EXIT_CODE)
-
-
-def _process_failed_commits(failed_commits, rule):
-    all_clear = True
-    if failed_commits:
-        print_error("ERROR")
-        all_clear = False
-        logging.info("Failed %d commit for '%s' rule", len(failed_commits), rule)
-        for commit in failed_commits:
-            logging.debug("Hash: %s, message: '%s'", commit.hexsha, commit.summary)
-            print(f"Hash: {commit.hexsha}, message: '{commit.summary}'")
-    else:
-        logging.info("Errors not found for rule '%s'", rule)
-        print_success("SUCCESS")
-    return all_clear
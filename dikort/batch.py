@@ -0,0 +1,205 @@
+import contextlib
+import functools
+import glob
+import io
+import json
+import logging
+import os
+import pathlib
+import re
+import sys
+import types
+from concurrent.futures import ProcessPoolExecutor
+
+import dikort
+from dikort.analyzer import analyze_commits
+from dikort.config import ERROR_EXIT_CODE
+from dikort.print import BColors, print_error, print_format_warning
+from dikort.reporters import (
+    SARIF_SCHEMA_URL,
+    SARIF_VERSION,
+    TOOL_URL,
+    XML_DECLARATION,
+)
+
+STDIN_PATH = "-"
+_GLOB_MAGIC_REGEX = re.compile(r"[*?\[]")
+_COMMENT_PREFIX = "#"
+_COLOR_REGEX = re.compile(r"\033\[[0-9;]*m")
+_EXIT_STATUSES = types.MappingProxyType(
+    {
+        0: f"{BColors.okgreen}SUCCESS{BColors.endc}",
+        1: f"{BColors.fail}FAILED{BColors.endc}",
+    }
+)
+_ERROR_STATUS = f"{BColors.fail}ERROR{BColors.endc}"
+
+
+def check_repositories_from(config):
+    repositories_from = config["main"]["repositories_from"]
+    try:
+        repository_paths = _read_repository_paths(repositories_from)
+    except OSError as err:
+        print_error(f"Cannot read repositories from {repositories_from}. Error: {err}")
+        sys.exit(ERROR_EXIT_CODE)
+    if not repository_paths:
+        print_format_warning(config["main"]["format"], f"No repositories found in {repositories_from}")
+        return
+    logging.info("Check %d repositories", len(repository_paths))
+    exit_codes = []
+    repositories_results = _record_exit_codes(check_repositories(config, repository_paths), exit_codes)
+    BATCH_REPORTERS[config["main"]["format"]](repositories_results, sys.stdout)
+    exit_code = max(exit_codes)
+    if exit_code:
+        logging.info("Exit with state %d", exit_code)
+        sys.exit(exit_code)
+
+
+def check_repositories(config, repository_paths):
+    jobs = min(config["main"]["jobs"], len(repository_paths))
+    logging.debug("Check repositories in %d processes", jobs)
+    check = functools.partial(check_repository, config)
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        yield from zip(repository_paths, executor.map(check, repository_paths))
+
+
+def check_repository(config, repository_path):
+    repository_config = {**config, "main": {**config["main"], "repository": repository_path, "jobs": 1}}
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        exit_code = _analyze_repository(repository_config)
+    return exit_code, output.getvalue()
+
+
+def read_repositories(lines):
+    repository_paths = {}
+    for line in lines:
+        pattern = os.path.expanduser(line.strip())
+        if pattern and not pattern.startswith(_COMMENT_PREFIX):
+            repository_paths.update(dict.fromkeys(_expand_pattern(pattern)))
+    return list(repository_paths)
+
+
+def _expand_pattern(pattern):
+    if not _GLOB_MAGIC_REGEX.search(pattern):
+        return [pattern]
+    matched_paths = sorted(glob.glob(pattern))
+    if not matched_paths:
+        logging.warning("No repositories match %s", pattern)
+    return matched_paths
+
+
+def _read_repository_paths(repositories_from):
+    if repositories_from == STDIN_PATH:
+        return read_repositories(sys.stdin)
+    with open(repositories_from) as repositories_fp:
+        return read_repositories(repositories_fp)
+
+
+def _analyze_repository(config):
+    try:
+        analyze_commits(config)
+    except SystemExit as exit_err:
+        return exit_err.code or 0
+    return 0
+
+
+def _record_exit_codes(repositories_results, exit_codes):
+    for repository_path, (exit_code, output) in repositories_results:
+        exit_codes.append(exit_code)
+        yield repository_path, exit_code, output
+
+
+def _status_line(repository_path, exit_code):
+    exit_status = _EXIT_STATUSES.get(exit_code, _ERROR_STATUS)
+    return f"[{repository_path}] - {exit_status} (exit {exit_code})\n"
+
+
+def _write_text_report(repositories_results, stream):
+    status_lines = []
+    for repository_path, exit_code, output in repositories_results:
+        header = f"Repository {repository_path}"
+        stream.write(f"{BColors.header}{header}{BColors.endc}\n")
+        stream.write(output)
+        stream.flush()
+        status_lines.append(_status_line(repository_path, exit_code))
+    stream.write("".join(status_lines))
+    stream.flush()
+
+
+def _write_jsonl_report(repositories_results, stream):
+    for repository_path, exit_code, output in repositories_results:
+        messages = []
+        for line in output.splitlines():
+            try:
+                violation = json.loads(line)
+            except ValueError:
+                messages.append(_COLOR_REGEX.sub("", line))
+                continue
+            stream.write(json.dumps({"repository": repository_path, **violation}))
+            stream.write("\n")
+        repository_status = {"repository": repository_path, "exit_code": exit_code, "messages": messages}
+        stream.write(json.dumps(repository_status))
+        stream.write("\n")
+        stream.flush()
+
+
+def _write_sarif_report(repositories_results, stream):
+    sarif_runs = []
+    for repository_path, exit_code, output in repositories_results:
+        try:
+            sarif_run = json.loads(output)["runs"][0]
+        except (ValueError, KeyError, IndexError):
+            sarif_run = {"tool": {"driver": _sarif_driver()}, "results": []}
+        invocation = {
+            "executionSuccessful": exit_code != ERROR_EXIT_CODE,
+            "exitCode": exit_code,
+            "workingDirectory": {"uri": pathlib.Path(repository_path).absolute().as_uri()},
+        }
+        sarif_run["invocations"] = [invocation]
+        sarif_runs.append(sarif_run)
+    sarif_log = {"$schema": SARIF_SCHEMA_URL, "version": SARIF_VERSION, "runs": sarif_runs}
+    stream.write(json.dumps(sarif_log, indent=2))
+    stream.write("\n")
+    stream.flush()
+
+
+def _sarif_driver():
+    return {"name": "dikort", "version": dikort.__version__, "informationUri": TOOL_URL, "rules": []}
+
+
+def _write_junit_report(repositories_results, stream):
+    from xml.etree import ElementTree  # noqa: S405
+
+    test_suites = ElementTree.Element("testsuites", name="dikort")
+    for repository_path, exit_code, output in repositories_results:
+        test_suite = _junit_test_suite(output)
+        test_suite.set("name", repository_path)
+        properties = ElementTree.SubElement(test_suite, "properties")
+        ElementTree.SubElement(properties, "property", name="exit_code", value=str(exit_code))
+        test_suites.append(test_suite)
+    stream.write(XML_DECLARATION)
+    stream.write(ElementTree.tostring(test_suites, encoding="unicode"))
+    stream.write("\n")
+    stream.flush()
+
+
+def _junit_test_suite(output):
+    from xml.etree import ElementTree  # noqa: S405
+
+    with contextlib.suppress(ElementTree.ParseError):
+        return ElementTree.fromstring(output.replace(XML_DECLARATION, "", 1))  # noqa: S314
+    test_suite = ElementTree.Element("testsuite", tests="1", failures="0", errors="1")
+    test_case = ElementTree.SubElement(test_suite, "testcase", classname="dikort", name="Repository check")
+    ElementTree.SubElement(test_case, "error", message="Repository was not checked").text = output
+    return test_suite
+
+
+BATCH_REPORTERS = types.MappingProxyType(
+    {
+        "text": _write_text_report,
+        "jsonl": _write_jsonl_report,
+        "sarif": _write_sarif_report,
+        "junit": _write_junit_report,
+    }
+)
@@ -0,0 +1,91 @@
+import hashlib
+import json
+import os
+import time
+
+import dikort
+
+CACHE_FILENAME = "dikort-cache"
+_QUERY_CHUNK_SIZE = 500
+_VERDICT_SECTIONS = ("rules", "rules.settings", "merge_rules", "merge_rules.settings")
+_CREATE_TABLE_QUERY = """
+CREATE TABLE IF NOT EXISTS verdicts (
+    digest TEXT NOT NULL,
+    hexsha TEXT NOT NULL,
+    mask INTEGER NOT NULL,
+    summary TEXT NOT NULL,
+    last_used INTEGER NOT NULL,
+    PRIMARY KEY (digest, hexsha)
+)
+"""
+_SELECT_QUERY = "SELECT hexsha, mask, summary FROM verdicts WHERE digest = ? AND hexsha IN ({placeholders})"
+_TOUCH_QUERY = "UPDATE verdicts SET last_used = ? WHERE digest = ? AND hexsha = ?"
+_INSERT_QUERY = "INSERT OR REPLACE INTO verdicts VALUES (?, ?, ?, ?, ?)"
+_EVICT_QUERY = """
+DELETE FROM verdicts WHERE rowid IN (
+    SELECT rowid FROM verdicts ORDER BY last_used DESC LIMIT -1 OFFSET ?
+)
+"""
+
+
+def user_cache_dir():
+    default_cache_home = os.path.join(os.path.expanduser("~"), ".cache")
+    cache_home = os.environ.get("XDG_CACHE_HOME") or default_cache_home
+    return os.path.join(cache_home, "dikort")
+
+
+def config_digest(config):
+    verdict_config = {section: config[section] for section in _VERDICT_SECTIONS}
+    serialized_config = json.dumps([dikort.__version__, verdict_config], sort_keys=True, default=_serialize_setting)
+    return hashlib.sha256(serialized_config.encode()).hexdigest()
+
+
+def _serialize_setting(setting):
+    if isinstance(setting, frozenset):
+        return sorted(setting)
+    return setting.pattern
+
+
+class VerdictCache:
+    def __init__(self, git_dir, *, digest, max_size):
+        import sqlite3
+
+        self._digest = digest
+        self._max_size = max_size
+        self._connection = sqlite3.connect(os.path.join(git_dir, CACHE_FILENAME))
+        self._connection.execute(_CREATE_TABLE_QUERY)
+
+    def get(self, hexshas):
+        verdicts = {}
+        for offset in range(0, len(hexshas), _QUERY_CHUNK_SIZE):
+            chunk_end = offset + _QUERY_CHUNK_SIZE
+            verdicts.update(self._select(hexshas[offset:chunk_end]))
+        with self._connection:
+            self._connection.executemany(
+                _TOUCH_QUERY,
+                ((time.time_ns(), self._digest, hexsha) for hexsha in verdicts),
+            )
+        return verdicts
+
+    def update(self, verdicts):
+        with self._connection:
+            self._connection.executemany(_INSERT_QUERY, self._rows(verdicts))
+            self._connection.execute(_EVICT_QUERY, (self._max_size,))
+
+    def close(self):
+        self._connection.close()
+
+    def _rows(self, verdicts):
+        rows = []
+        last_used = time.time_ns()
+        for hexsha, (mask, summary) in verdicts.items():
+            rows.append((self._digest, hexsha, mask, summary, last_used))
+        return rows
+
+    def _select(self, hexshas):
+        placeholders = ", ".join("?" * len(hexshas))
+        rows = self._connection.execute(
+            _SELECT_QUERY.format(placeholders=placeholders),
+            (self._digest, *hexshas),
+        )
+        return {hexsha: (mask, summary) for hexsha, mask, summary in rows}
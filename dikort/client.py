@@ -0,0 +1,14 @@
+import json
+import os
+import socket
+
+
+def forward(socket_path, argv):
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.connect(socket_path)
+        check_request = {"argv": argv, "cwd": os.getcwd()}
+        client.sendall(json.dumps(check_request).encode())
+        client.sendall(b"\n")
+        with client.makefile("rb") as response_file:
+            check_response = json.loads(response_file.readline())
+    return check_response["exit_code"], check_response["output"]
@@ -0,0 +1,263 @@
+import collections
+import functools
+import os
+import re
+import subprocess  # noqa: S404
+import types
+
+GIT_COUNTERS = collections.Counter()  # noqa: WPS407
+_READ_CHUNK_SIZE = 65536
+_RECORD_SEPARATOR = b"\0"
+_HEXSHA_FORMAT = "--format=%H"
+_AUTHOR_REGEX = re.compile("(.*) <(.*?)>")
+_HEADER_SEPARATOR_REGEX = re.compile("\n(?! )")
+_FORMAT_PLACEHOLDERS = types.MappingProxyType(
+    {
+        "author_name": "%an",
+        "author_email": "%ae",
+    }
+)
+_COMMIT_GRAPH_PATHS = (
+    os.path.join("objects", "info", "commit-graph"),
+    os.path.join("objects", "info", "commit-graphs", "commit-graph-chain"),
+)
+_LOG_ARGS = (
+    "-z",
+    "--no-color",
+    "--no-decorate",
+    "--no-abbrev-commit",
+    "--no-show-signature",
+    "--no-use-mailmap",
+)
+
+
+class CommitRecord:  # noqa: WPS230
+    __slots__ = (
+        "hexsha",
+        "parents_count",
+        "summary",
+        "message_tail",
+        "author_name",
+        "author_email",
+        "has_signature",
+        "signature",
+        "refs",
+    )
+
+    def __init__(  # noqa: WPS211
+        self,
+        hexsha,
+        parents_count,
+        summary,
+        message_tail=None,
+        author_name=None,
+        author_email=None,
+        has_signature=None,
+        signature=None,
+        refs=None,
+    ):
+        self.hexsha = hexsha
+        self.parents_count = parents_count
+        self.summary = summary
+        self.message_tail = message_tail
+        self.author_name = author_name
+        self.author_email = author_email
+        self.has_signature = has_signature
+        self.signature = signature
+        self.refs = refs
+
+
+class GitCommitReader:
+    def __init__(self, repo):
+        self.repo = repo
+        self.git_dir = repo.git_dir
+
+    def iter_commits(self, rev, fields=(), parents_counts=()):
+        return iter_commits(self.repo, rev, fields, parents_counts)
+
+    def iter_commit_parents(self, rev, parents_counts=()):
+        return iter_commit_parents(self.repo, rev, parents_counts)
+
+    def load_commits(self, hexshas, fields=()):
+        return load_commits(self.repo, hexshas, fields)
+
+
+def iter_commits(repo, rev, fields=(), parents_counts=()):
+    yield from _stream_log(repo, (*_rev_args(rev, parents_counts), "--"), fields)
+
+
+def load_commits(repo, hexshas, fields=()):
+    import tempfile
+
+    if not hexshas:
+        return
+    with tempfile.TemporaryFile() as revs_file:
+        revs_file.writelines(f"{hexsha}\n".encode() for hexsha in hexshas)
+        revs_file.seek(0)
+        rev_args = ("--no-walk=unsorted", "--stdin")
+        yield from _stream_log(repo, rev_args, fields, istream=revs_file)
+
+
+def iter_commit_parents(repo, rev, parents_counts=()):
+    rev_args = _rev_args(rev, parents_counts)
+    proc = repo.git.rev_list("--parents", *rev_args, "--", as_process=True)
+    GIT_COUNTERS["calls"] += 1
+    for line in proc.stdout:
+        GIT_COUNTERS["bytes_read"] += len(line)
+        hexsha, *parents = line.split()
+        yield hexsha.decode(), len(parents)
+    proc.wait()
+
+
+def read_commits(repository_path, rev, fields=(), parents_counts=(), *, max_count):  # noqa: WPS210
+    log_format, parser = _log_format(fields)
+    max_count_arg = "--max-count={0}".format(max_count + 1)
+    log_args = (max_count_arg, log_format, *_LOG_ARGS, *_rev_args(rev, parents_counts), "--")
+    git_log = _run_git(repository_path, "log", *log_args)
+    if git_log is None:
+        return None
+    records = [record for record in git_log.split(_RECORD_SEPARATOR) if record]
+    if len(records) > max_count:
+        return None
+    if log_format == _HEXSHA_FORMAT:
+        records = _read_batch_commits(repository_path, records)
+    if records is None:
+        return None
+    return [parser(record) for record in records]
+
+
+def has_commit_graph(git_dir):
+    graph_paths = (os.path.join(git_dir, graph_path) for graph_path in _COMMIT_GRAPH_PATHS)
+    return any(map(os.path.exists, graph_paths))
+
+
+def _rev_args(rev, parents_counts=()):
+    revs = (rev,) if isinstance(rev, str) else tuple(rev)
+    return (*revs, *_parents_args(parents_counts))
+
+
+def _parents_args(parents_counts):
+    if not parents_counts:
+        return ()
+    return ("--min-parents={0}".format(min(parents_counts)), "--max-parents={0}".format(max(parents_counts)))
+
+
+def _log_format(fields):
+    if "has_signature" in fields:
+        return _HEXSHA_FORMAT, _parse_raw_commit
+    header_fields = tuple(field for field in _FORMAT_PLACEHOLDERS if field in fields)
+    placeholders = ("%H", "%P", *(_FORMAT_PLACEHOLDERS[field] for field in header_fields), "%B")
+    log_format = "--format={0}".format("%n".join(placeholders))
+    return log_format, functools.partial(_parse_formatted_commit, header_fields=header_fields)
+
+
+def _stream_log(repo, rev_args, fields, istream=None):
+    log_format, parser = _log_format(fields)
+    log_args = (log_format, *_LOG_ARGS, *rev_args)
+    proc = repo.git.log(*log_args, as_process=True, istream=istream)
+    GIT_COUNTERS["calls"] += 1
+    records = _split_records(proc.stdout)
+    if log_format == _HEXSHA_FORMAT:
+        records = _read_raw_commits(repo, records)
+    yield from map(parser, records)
+    proc.wait()
+
+
+def _read_raw_commits(repo, hexshas):
+    for hexsha in hexshas:
+        _, _, _, object_bytes = repo.git.get_object_data(hexsha.decode())
+        GIT_COUNTERS["bytes_read"] += len(object_bytes)
+        yield b"\n".join((hexsha, object_bytes))
+
+
+def _read_batch_commits(repository_path, hexshas):
+    if not hexshas:
+        return hexshas
+    batch_input = b"\n".join((*hexshas, b""))
+    batch_output = _run_git(repository_path, "cat-file", "--batch", input_bytes=batch_input)
+    if batch_output is None:
+        return None
+    return list(_split_batch_output(batch_output))
+
+
+def _run_git(repository_path, *git_args, input_bytes=None):
+    command = ("git", "-C", repository_path, *git_args)
+    try:
+        git_process = subprocess.run(command, input=input_bytes, capture_output=True, check=False)  # noqa: S603
+    except OSError:
+        return None
+    GIT_COUNTERS.update(calls=1, bytes_read=len(git_process.stdout))
+    if git_process.returncode:
+        return None
+    return git_process.stdout
+
+
+def _split_batch_output(output):  # noqa: WPS210
+    offset = 0
+    while offset < len(output):
+        header_end = output.index(b"\n", offset)
+        hexsha, _, object_size = output[offset:header_end].split(b" ")
+        object_start = header_end + 1
+        object_end = object_start + int(object_size)
+        yield b"\n".join((hexsha, output[object_start:object_end]))
+        offset = object_end + 1
+
+
+def _split_records(stream):
+    tail = b""
+    for chunk in iter(functools.partial(stream.read, _READ_CHUNK_SIZE), b""):
+        GIT_COUNTERS["bytes_read"] += len(chunk)
+        records = (tail + chunk).split(_RECORD_SEPARATOR)
+        tail = records.pop()
+        yield from records
+    if tail:
+        yield tail
+
+
+def _parse_formatted_commit(record, *, header_fields):  # noqa: WPS210
+    lines_count = len(header_fields) + 2
+    lines = record.decode("utf-8", "replace").split("\n", lines_count)
+    hexsha, parents, *header_values, message = lines
+    return CommitRecord(
+        hexsha=hexsha,
+        parents_count=len(parents.split()),
+        summary=message.split("\n", 1)[0],
+        message_tail=_message_tail(message),
+        **dict(zip(header_fields, header_values)),
+    )
+
+
+def _parse_raw_commit(record):  # noqa: WPS210
+    hexsha, _, object_bytes = record.partition(b"\n")
+    header, _, message_bytes = object_bytes.partition(b"\n\n")
+    fields = {"parent": []}
+    for header_line in _HEADER_SEPARATOR_REGEX.split(header.decode("utf-8", "replace")):
+        field_name, _, field_value = header_line.partition(" ")
+        field_value = field_value.replace("\n ", "\n")
+        if field_name == "parent":
+            fields["parent"].append(field_value)
+        else:
+            fields[field_name] = field_value
+    author_match = _AUTHOR_REGEX.match(fields.get("author", ""))
+    author_name, author_email = author_match.groups() if author_match else ("", "")
+    message = _decode_message(message_bytes, fields.get("encoding", "utf-8"))
+    return CommitRecord(
+        hexsha=hexsha.decode(),
+        parents_count=len(fields["parent"]),
+        summary=message.split("\n", 1)[0],
+        message_tail=_message_tail(message),
+        author_name=author_name,
+        author_email=author_email,
+        has_signature=bool(fields.get("gpgsig")),
+    )
+
+
+def _message_tail(message):
+    return message.rstrip().rpartition("\n")[2]
+
+
+def _decode_message(message_bytes, encoding):
+    try:
+        return message_bytes.decode(encoding, "replace")
+    except LookupError:
+        return message_bytes.decode("utf-8", "replace")
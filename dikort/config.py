@@ -1,12 +1,13 @@
-import configparser
 import copy
 import re
 import sys
 import types
 
+from dikort.filters import GPG_VERIFIED
 from dikort.print import print_error
+from dikort.reporters import REPORTERS
 
-_FILE_CONFIG_INT_OPTIONS = ("min_length", "max_length")
+_FILE_CONFIG_INT_OPTIONS = ("min_length", "max_length", "jobs", "cache_size", "max_violations")
 _FILE_CONFIG_BOOL_OPTIONS = (
     "enable_length",
     "enable_capitalized_summary",
@@ -23,7 +24,18 @@ _FILE_CONFIG_BOOL_OPTIONS = (
     "signoff",
     "gpg",
     "enabled",
+    "cache",
+    "incremental",
+    "fail_fast",
+    "pre_receive",
+    "check_version",
+    "serve",
+    "profile",
+    "all_refs",
 )
+_HEX_FINGERPRINT_REGEX = re.compile("[0-9a-fA-F]+")
+_FINGERPRINT_SEPARATOR_REGEX = re.compile(r"[\s,]+")
+BACKENDS = ("git", "mmap")
 ERROR_EXIT_CODE = 128
 FAILED_EXIT_CODE = 1
 DEFAULTS = types.MappingProxyType(
@@ -32,6 +44,25 @@ DEFAULTS = types.MappingProxyType(
             "config": "./.dikort.cfg",
             "repository": "./",
             "range": "HEAD~1..HEAD",
+            "jobs": 1,
+            "cache": False,
+            "cache_size": 100000,
+            "incremental": False,
+            "fail_fast": False,
+            "max_violations": 0,
+            "pre_receive": False,
+            "check_version": False,
+            "format": "text",
+            "serve": False,
+            "socket": "",
+            "profile": False,
+            "metrics_file": "",
+            "backend": "git",
+            "repositories_from": "",
+            "message_file": "",
+            "pr_base": "",
+            "all_refs": False,
+            "refs_glob": "",
         },
         "rules": {
             "enable_length": False,
@@ -52,6 +83,7 @@ DEFAULTS = types.MappingProxyType(
             "singleline_summary": True,
             "signoff": True,
             "gpg": True,
+            "trusted_keys": "",
             "regex": ".*",
             "author_name_regex": ".*",
             "author_email_regex": ".*",
@@ -75,6 +107,7 @@ DEFAULTS = types.MappingProxyType(
             "singleline_summary": True,
             "signoff": True,
             "gpg": True,
+            "trusted_keys": "",
             "regex": ".*",
             "author_name_regex": ".*",
             "author_email_regex": ".*",
@@ -114,6 +147,8 @@ def merge(cmd_args):
 
 
 def _merge_fileconfig(config, file_config_path):  # noqa: WPS231
+    import configparser
+
     file_config = configparser.ConfigParser(interpolation=None)
     _read_file_config(file_config, file_config_path)
     for section in config:
@@ -127,6 +162,8 @@ def _merge_fileconfig(config, file_config_path):  # noqa: WPS231
 
 def _parse_value_from_file(file_config, option, section):
     option_value = file_config[section][option]
+    if option == "gpg" and option_value == GPG_VERIFIED:
+        return option_value
     try:
         if option in _FILE_CONFIG_INT_OPTIONS:
             option_value = file_config[section].getint(option)
@@ -153,6 +190,7 @@ def _read_file_config(file_config, file_config_path):
 
 
 def _validate(config):
+    _validate_main(config["main"])
     if config["rules.settings"]["min_length"] > config["rules.settings"]["max_length"]:
         print_error("rules.settings.min_length is greater than rules.settings.max_length")
         sys.exit(ERROR_EXIT_CODE)
@@ -161,6 +199,50 @@ def _validate(config):
         sys.exit(ERROR_EXIT_CODE)
 
 
+def _validate_main(main_config):
+    main_errors = (
+        (main_config["jobs"] < 1, "main.jobs must be a positive number"),
+        (main_config["cache_size"] < 1, "main.cache_size must be a positive number"),
+        (main_config["max_violations"] < 0, "main.max_violations must not be negative"),
+        (main_config["serve"] and not main_config["socket"], "main.socket must be set to serve"),
+        (main_config["format"] not in REPORTERS, f"main.format must be one of: {', '.join(REPORTERS)}"),
+        (main_config["backend"] not in BACKENDS, f"main.backend must be one of: {', '.join(BACKENDS)}"),
+        (
+            main_config["pre_receive"] and main_config["incremental"],
+            "main.pre_receive cannot be combined with main.incremental",
+        ),
+        (
+            main_config["pre_receive"] and main_config["repositories_from"],
+            "main.pre_receive cannot be combined with main.repositories_from",
+        ),
+        (
+            main_config["message_file"] and (main_config["pre_receive"] or main_config["repositories_from"]),
+            "main.message_file cannot be combined with main.pre_receive or main.repositories_from",
+        ),
+        (
+            main_config["pr_base"] and _pr_base_conflict_set(main_config),
+            "main.pr_base cannot be combined with main.pre_receive, main.message_file or main.incremental",
+        ),
+        (main_config["refs_glob"] and not main_config["all_refs"], "main.refs_glob requires main.all_refs"),
+        (
+            main_config["all_refs"] and _range_option_set(main_config),
+            "main.all_refs cannot be combined with main.pre_receive, pr_base, message_file or incremental",
+        ),
+    )
+    for failed, error_message in main_errors:
+        if failed:
+            print_error(error_message)
+            sys.exit(ERROR_EXIT_CODE)
+
+
+def _pr_base_conflict_set(main_config):
+    return any(main_config[option] for option in ("pre_receive", "message_file", "incremental"))
+
+
+def _range_option_set(main_config):
+    return any(main_config[option] for option in ("pre_receive", "pr_base", "message_file", "incremental"))
+
+
 def _post_processing(config):
     config["rules.settings"]["regex"] = re.compile(config["rules.settings"]["regex"])
     config["rules.settings"]["author_name_regex"] = re.compile(config["rules.settings"]["author_name_regex"])
@@ -172,6 +254,19 @@ def _post_processing(config):
     config["merge_rules.settings"]["author_email_regex"] = re.compile(
         config["merge_rules.settings"]["author_email_regex"]
     )
+    config["rules.settings"]["trusted_keys"] = _trusted_keys_index(config["rules.settings"]["trusted_keys"])
+    config["merge_rules.settings"]["trusted_keys"] = _trusted_keys_index(config["merge_rules.settings"]["trusted_keys"])
+
+
+def _trusted_keys_index(trusted_keys):
+    fingerprints = _FINGERPRINT_SEPARATOR_REGEX.split(trusted_keys.strip())
+    return frozenset(_normalize_fingerprint(fingerprint) for fingerprint in fingerprints if fingerprint)
+
+
+def _normalize_fingerprint(fingerprint):
+    if _HEX_FINGERPRINT_REGEX.fullmatch(fingerprint):
+        return fingerprint.upper()
+    return fingerprint
 
 
 def configure_argparser(cmd_args_parser):  # noqa: WPS213
@@ -189,6 +284,132 @@ def configure_argparser(cmd_args_parser):  # noqa: WPS213
         metavar="PATH",
         help=f"Repository location (default: {DEFAULTS['main']['repository']})",
     )
+    cmd_args_parser.add_argument(
+        "-j",
+        "--jobs",
+        dest="main:jobs",
+        metavar="INT",
+        type=int,
+        help=f"Number of processes to evaluate rules with (default: {DEFAULTS['main']['jobs']})",
+    )
+    cmd_args_parser.add_argument(
+        "--cache",
+        dest="main:cache",
+        help=f"Cache verdicts of checked commits inside the repository (default: {DEFAULTS['main']['cache']})",
+        default=None,
+        action="store_true",
+    )
+    cmd_args_parser.add_argument(
+        "--cache-size",
+        dest="main:cache_size",
+        metavar="INT",
+        type=int,
+        help=f"Maximum number of cached commit verdicts (default: {DEFAULTS['main']['cache_size']})",
+    )
+    cmd_args_parser.add_argument(
+        "--incremental",
+        dest="main:incremental",
+        help=f"Check only commits added since the last verified one (default: {DEFAULTS['main']['incremental']})",
+        default=None,
+        action="store_true",
+    )
+    cmd_args_parser.add_argument(
+        "--fail-fast",
+        dest="main:fail_fast",
+        help=f"Stop checks at the first failed commit (default: {DEFAULTS['main']['fail_fast']})",
+        default=None,
+        action="store_true",
+    )
+    cmd_args_parser.add_argument(
+        "--max-violations",
+        dest="main:max_violations",
+        metavar="INT",
+        type=int,
+        help=f"Stop checks after this many violations, 0 is no limit (default: {DEFAULTS['main']['max_violations']})",
+    )
+    cmd_args_parser.add_argument(
+        "--pre-receive",
+        dest="main:pre_receive",
+        help=f"Check new commits of pre-receive ref updates from stdin (default: {DEFAULTS['main']['pre_receive']})",
+        default=None,
+        action="store_true",
+    )
+    cmd_args_parser.add_argument(
+        "--check-version",
+        dest="main:check_version",
+        help=f"Check for a new dikort release once a day (default: {DEFAULTS['main']['check_version']})",
+        default=None,
+        action="store_true",
+    )
+    cmd_args_parser.add_argument(
+        "--format",
+        dest="main:format",
+        choices=tuple(REPORTERS),
+        help=f"Output format of check results (default: {DEFAULTS['main']['format']})",
+    )
+    cmd_args_parser.add_argument(
+        "--serve",
+        dest="main:serve",
+        help=f"Serve checks over the unix socket set by --socket (default: {DEFAULTS['main']['serve']})",
+        default=None,
+        action="store_true",
+    )
+    cmd_args_parser.add_argument(
+        "--socket",
+        dest="main:socket",
+        metavar="PATH",
+        help="Unix socket of a dikort server. Checks are forwarded to it if it is running",
+    )
+    cmd_args_parser.add_argument(
+        "--profile",
+        dest="main:profile",
+        help=f"Print per-rule timings and git usage to stderr (default: {DEFAULTS['main']['profile']})",
+        default=None,
+        action="store_true",
+    )
+    cmd_args_parser.add_argument(
+        "--metrics-file",
+        dest="main:metrics_file",
+        metavar="PATH",
+        help="Write per-rule timings and git usage as JSON to this file",
+    )
+    cmd_args_parser.add_argument(
+        "--backend",
+        dest="main:backend",
+        choices=BACKENDS,
+        help=f"Read commits with git or from memory-mapped packfiles (default: {DEFAULTS['main']['backend']})",
+    )
+    cmd_args_parser.add_argument(
+        "--pr-base",
+        dest="main:pr_base",
+        metavar="BRANCH",
+        help="Check only commits of HEAD since it forked from this branch, instead of the range",
+    )
+    cmd_args_parser.add_argument(
+        "--all-refs",
+        dest="main:all_refs",
+        help=f"Check commits of all refs at once, every commit once (default: {DEFAULTS['main']['all_refs']})",
+        default=None,
+        action="store_true",
+    )
+    cmd_args_parser.add_argument(
+        "--refs-glob",
+        dest="main:refs_glob",
+        metavar="PATTERN",
+        help="Check refs matching these space separated patterns with --all-refs (default: 'refs/heads refs/tags')",
+    )
+    cmd_args_parser.add_argument(
+        "--repositories-from",
+        dest="main:repositories_from",
+        metavar="PATH",
+        help="Check every repository listed in this file (one path or glob per line, - for stdin) with one report",
+    )
+    cmd_args_parser.add_argument(
+        "--message-file",
+        dest="main:message_file",
+        metavar="PATH",
+        help="Check the commit message in this file (- for stdin) without opening the repository, for commit-msg hook",
+    )
     cmd_args_parser.add_argument(
         "--enable-logging",
         dest="logging:enabled",
@@ -311,6 +532,19 @@ def configure_argparser(cmd_args_parser):  # noqa: WPS213
         action="store_false",
         help="No GPG sign",
     )
+    cmd_args_parser.add_argument(
+        "--verified-gpg",
+        dest="rules.settings:gpg",
+        action="store_const",
+        const=GPG_VERIFIED,
+        help="Valid GPG or SSH signature made by a trusted key",
+    )
+    cmd_args_parser.add_argument(
+        "--trusted-keys",
+        dest="rules.settings:trusted_keys",
+        metavar="FINGERPRINTS",
+        help="Comma separated fingerprints of signing keys trusted by --verified-gpg",
+    )
     cmd_args_parser.add_argument(
         "--enable-length-check",
         action="store_true",
@@ -471,6 +705,19 @@ def configure_argparser(cmd_args_parser):  # noqa: WPS213
         action="store_false",
         help="No GPG sign",
     )
+    cmd_args_parser.add_argument(
+        "--merge-verified-gpg",
+        dest="merge_rules.settings:gpg",
+        action="store_const",
+        const=GPG_VERIFIED,
+        help="Valid GPG or SSH signature made by a trusted key",
+    )
+    cmd_args_parser.add_argument(
+        "--merge-trusted-keys",
+        dest="merge_rules.settings:trusted_keys",
+        metavar="FINGERPRINTS",
+        help="Comma separated fingerprints of signing keys trusted by --merge-verified-gpg",
+    )
     cmd_args_parser.add_argument(
         "--enable-merge-length-check",
         action="store_true",
@@ -1,8 +1,12 @@
-import logging
+import functools
+
+AUTHOR_CACHE_SIZE = 4096
+GPG_VERIFIED = "verified"
+_VALID_SIGNATURE_STATUS = "G"
+_GOOD_SIGNATURE_STATUSES = frozenset(("G", "U"))
 
 
 def filter_singleline(commit, *, config):
-    logging.debug("Check %s commit for singleline", commit.hexsha)
     summary_lines_count = commit.summary.count("\n")
     singleline_summary = config["singleline_summary"]
     return (summary_lines_count > 1 and singleline_summary) or (  # noqa: WPS408
@@ -11,19 +15,16 @@ def filter_singleline(commit, *, config):
 
 
 def filter_trailing_period(commit, *, config):
-    logging.debug("Check %s commit for trailing period", commit.hexsha)
     summary = commit.summary
     return summary.endswith(".") != config["trailing_period"]
 
 
 def filter_capitalized(commit, *, config):
-    logging.debug("Check %s commit for capitalized subject", commit.hexsha)
     summary_first_letter = commit.summary[0]
     return summary_first_letter.isalpha() and summary_first_letter.isupper() != config["capitalized_summary"]
 
 
 def filter_length(commit, *, config):
-    logging.debug("Check %s commit for summary message length", commit.hexsha)
     min_length = config["min_length"]
     max_length = config["max_length"]
     length = len(commit.summary)
@@ -31,25 +32,35 @@ def filter_length(commit, *, config):
 
 
 def filter_signoff(commit, *, config):
-    last_msg_line = commit.message.rstrip().split("\n")[-1]
-    return last_msg_line.startswith("Signed-off-by") != config["signoff"]
+    return commit.message_tail.startswith("Signed-off-by") != config["signoff"]
 
 
 def filter_gpg(commit, *, config):
-    logging.debug("Check %s commit for GPG sign", commit.hexsha)
-    return bool(commit.gpgsig) != config["gpg"]
+    if config["gpg"] == GPG_VERIFIED:
+        return not _signature_trusted(commit.signature, config["trusted_keys"])
+    return commit.has_signature != config["gpg"]
 
 
 def filter_regex(commit, *, config):
-    logging.debug("Check %s commit for regex", commit.hexsha)
     return not config["regex"].match(commit.summary)
 
 
 def filter_author_name_regex(commit, *, config):
-    logging.debug("Check %s commit for author name", commit.hexsha)
-    return not config["author_name_regex"].match(commit.author.name)
+    return not _author_matches(config["author_name_regex"], commit.author_name)
 
 
 def filter_author_email_regex(commit, *, config):
-    logging.debug("Check %s commit for author email", commit.hexsha)
-    return not config["author_email_regex"].match(commit.author.email)
+    return not _author_matches(config["author_email_regex"], commit.author_email)
+
+
+@functools.lru_cache(maxsize=AUTHOR_CACHE_SIZE)
+def _author_matches(pattern, author):
+    return pattern.match(author) is not None
+
+
+def _signature_trusted(signature, trusted_keys):
+    if signature is None or signature.status not in _GOOD_SIGNATURE_STATUSES:
+        return False
+    if not trusted_keys:
+        return signature.status == _VALID_SIGNATURE_STATUS
+    return not trusted_keys.isdisjoint((signature.fingerprint, signature.primary_fingerprint))
@@ -1,48 +1,155 @@
-import argparse
-import json
+import contextlib
 import logging
-from urllib.error import URLError
-from urllib.request import urlopen
+import os
+import sys
+import threading
+import time
 
 import dikort
-from dikort.analyzer import analyze_commits
+from dikort.analyzer import analyze_commits, analyze_message
 from dikort.config import configure_argparser, merge
 from dikort.print import print_header, print_warning
+from dikort.snapshot import read_snapshot, write_snapshot
 
 GITHUB_RELEASES_API_URL = "https://api.github.com/repos/weastur/dikort/releases"
+VERSION_CHECK_INTERVAL = 86400
+VERSION_CHECK_STAMP_FILENAME = "version-check"
+
+
+class VersionCheck(threading.Thread):
+    def __init__(self):
+        super().__init__(name="dikort-version-check", daemon=True)
+        self.new_version = None
+
+    def __enter__(self):
+        if _version_check_due():
+            self.start()
+        else:
+            logging.debug("Version was checked less than %d seconds ago. Skip.", VERSION_CHECK_INTERVAL)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if self.is_alive() or not self.new_version:
+            return
+        print_warning(f"There is a new version: {self.new_version}. Please, consider to update")
+
+    def run(self):
+        self.new_version = check_for_new_version()
 
 
 def check_for_new_version():
+    import json
+    from urllib.request import urlopen
+
     try:
         with urlopen(GITHUB_RELEASES_API_URL, timeout=1) as resp:
             releases = json.loads(resp.read())
-    except URLError as err:
-        print_warning(f"Cannot check for new version. Error: {err}")
-        return
+    except (OSError, ValueError) as err:
+        logging.debug("Cannot check for new version. Error: %s", err)
+        return None
     tags = [release["tag_name"] for release in releases]
     if not tags:
-        return
+        return None
     tags.sort()
     latest_tag = tags[-1][1:]
     if dikort.__version__ < latest_tag:
-        print_warning(f"There is a new version: {latest_tag}. Please, consider to update")
+        return latest_tag
+    return None
 
 
-def main():  # pragma: nocover
-    print_header("Welcome to dikort - the ultimate commit message check tool")
-    check_for_new_version()
+def _version_check_due():
+    from dikort.cache import user_cache_dir
+
+    stamp_path = os.path.join(user_cache_dir(), VERSION_CHECK_STAMP_FILENAME)
+    try:
+        if time.time() - os.path.getmtime(stamp_path) < VERSION_CHECK_INTERVAL:
+            return False
+    except OSError:
+        logging.debug("Version check stamp %s not found", stamp_path)
+    _touch_version_check_stamp(stamp_path)
+    return True
+
+
+def _touch_version_check_stamp(stamp_path):
+    with contextlib.suppress(OSError):
+        os.makedirs(os.path.dirname(stamp_path), exist_ok=True)
+        with open(stamp_path, "a"):
+            os.utime(stamp_path)
+
+
+def parse_cmd_args(argv=None):
+    import argparse
+
     cmd_args_parser = argparse.ArgumentParser(prog="dikort", description="Commit messages checking tool")
     configure_argparser(cmd_args_parser)
-    config = merge(cmd_args_parser.parse_args())
+    return cmd_args_parser.parse_args(argv)
+
+
+def load_config(argv):
+    config = read_snapshot(argv)
+    if config is None:
+        config = merge(parse_cmd_args(argv))
+        write_snapshot(argv, config)
+    return config
+
+
+def forward_to_server(socket_path, argv):
+    from dikort.client import forward
+
+    try:
+        exit_code, output = forward(socket_path, argv)
+    except (OSError, ValueError, KeyError) as err:
+        logging.debug("Cannot forward checks to %s. Check locally. Error: %s", socket_path, err)
+        return
+    print(output, end="")
+    sys.exit(exit_code)
+
+
+def _version_check(main_config):
+    if main_config["check_version"] and main_config["format"] == "text":
+        return VersionCheck()
+    return contextlib.nullcontext()
+
+
+def _checked_locally(main_config):
+    return bool(main_config["pre_receive"] or main_config["repositories_from"] or main_config["message_file"])
+
+
+def _configure_logging(logging_settings):
     logging_config = {
-        "format": config["logging"]["format"],
-        "level": config["logging"]["level"],
-        "datefmt": config["logging"]["datefmt"],
+        "format": logging_settings["format"],
+        "level": logging_settings["level"],
+        "datefmt": logging_settings["datefmt"],
     }
-    if not config["logging"]["enabled"]:
+    if not logging_settings["enabled"]:
         logging_config["handlers"] = [logging.NullHandler()]
     logging.basicConfig(**logging_config)
-    analyze_commits(config)
+
+
+def main():  # pragma: nocover
+    argv = sys.argv[1:]
+    config = load_config(argv)
+    if config["main"]["format"] == "text":
+        print_header("Welcome to dikort - the ultimate commit message check tool")
+    _configure_logging(config["logging"])
+    main_config = config["main"]
+    socket_path = main_config["socket"]
+    if main_config["serve"]:
+        from dikort.server import serve
+
+        serve(socket_path, parse_cmd_args)
+        return
+    if socket_path and not _checked_locally(main_config):
+        forward_to_server(socket_path, argv)
+    with _version_check(main_config):
+        if main_config["repositories_from"]:
+            from dikort.batch import check_repositories_from
+
+            check_repositories_from(config)
+        elif main_config["message_file"]:
+            analyze_message(config)
+        else:
+            analyze_commits(config)
 
 
 if __name__ == "__main__":  # pragma: nocover
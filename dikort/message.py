@@ -0,0 +1,60 @@
+import os
+import sys
+
+from dikort.commits import CommitRecord
+from dikort.config import ERROR_EXIT_CODE
+from dikort.print import print_error
+
+STDIN_PATH = "-"
+NULL_HEXSHA = "0000000000000000000000000000000000000000"
+MERGE_HEAD_FILENAME = "MERGE_HEAD"
+_COMMENT_PREFIX = "#"
+_SCISSORS_LINE = "# ------------------------ >8 ------------------------"
+
+
+def read_message_commit(message_file):
+    try:
+        message = _read_message(message_file)
+    except OSError as err:
+        print_error(f"Cannot read commit message from {message_file}. Error: {err}")
+        sys.exit(ERROR_EXIT_CODE)
+    parents_count = 2 if _is_merge_in_progress(message_file) else 1
+    return message_commit(message, parents_count)
+
+
+def message_commit(message, parents_count=1):
+    message = clean_message(message)
+    return CommitRecord(
+        hexsha=NULL_HEXSHA,
+        parents_count=parents_count,
+        summary=message.split("\n", 1)[0],
+        message_tail=message.rpartition("\n")[2],
+        author_name=os.environ.get("GIT_AUTHOR_NAME"),
+        author_email=os.environ.get("GIT_AUTHOR_EMAIL"),
+    )
+
+
+def clean_message(message):
+    message_lines = []
+    for line in message.splitlines():
+        if line == _SCISSORS_LINE:
+            break
+        if not line.startswith(_COMMENT_PREFIX):
+            message_lines.append(line.rstrip())
+    return "\n".join(message_lines).strip("\n")
+
+
+def _is_merge_in_progress(message_file):
+    git_dir = os.environ.get("GIT_DIR")
+    if not git_dir and message_file != STDIN_PATH:
+        git_dir = os.path.dirname(os.path.abspath(message_file))
+    if not git_dir:
+        return False
+    return os.path.isfile(os.path.join(git_dir, MERGE_HEAD_FILENAME))
+
+
+def _read_message(message_file):
+    if message_file == STDIN_PATH:
+        return sys.stdin.read()
+    with open(message_file, encoding="utf-8", errors="replace") as message_stream:
+        return message_stream.read()
@@ -0,0 +1,85 @@
+import json
+import sys
+import time
+
+from dikort.commits import GIT_COUNTERS
+
+MILLISECONDS_PER_SECOND = 1000
+
+
+class RuleMetrics:
+    __slots__ = ("wall_time", "evaluated", "failed")
+
+    def __init__(self, wall_time=0, evaluated=0, failed=0):
+        self.wall_time = wall_time
+        self.evaluated = evaluated
+        self.failed = failed
+
+    def record(self, wall_time, failed):
+        self.wall_time += wall_time
+        self.evaluated += 1
+        self.failed += failed
+
+    def take(self):
+        rule_metrics = RuleMetrics(self.wall_time, self.evaluated, self.failed)
+        self.wall_time = 0
+        self.evaluated = 0
+        self.failed = 0
+        return rule_metrics
+
+    def merge(self, rule_metrics):
+        self.wall_time += rule_metrics.wall_time
+        self.evaluated += rule_metrics.evaluated
+        self.failed += rule_metrics.failed
+
+    def as_dict(self):
+        return {"wall_time": self.wall_time, "evaluated": self.evaluated, "failed": self.failed}
+
+
+class Metrics:
+    def __init__(self):
+        self.rules = {}
+        self._started_at = time.perf_counter()
+        self._git_counters_at_start = GIT_COUNTERS.copy()
+
+    def rule(self, rule):
+        return self.rules.setdefault(rule, RuleMetrics())
+
+    def take_rules(self):
+        return {rule: rule_metrics.take() for rule, rule_metrics in self.rules.items()}
+
+    def merge_rules(self, rules):
+        for rule, rule_metrics in rules.items():
+            self.rule(rule).merge(rule_metrics)
+
+    def as_dict(self):
+        git_counters = GIT_COUNTERS - self._git_counters_at_start
+        return {
+            "wall_time": time.perf_counter() - self._started_at,
+            "git": {"calls": git_counters["calls"], "bytes_read": git_counters["bytes_read"]},
+            "rules": {rule: rule_metrics.as_dict() for rule, rule_metrics in self.rules.items()},
+        }
+
+    def print_profile(self, stream=sys.stderr):
+        metrics = self.as_dict()
+        stream.write(
+            "Profile: {0:.3f} ms, {1} git calls, {2} bytes read\n".format(
+                metrics["wall_time"] * MILLISECONDS_PER_SECOND,
+                metrics["git"]["calls"],
+                metrics["git"]["bytes_read"],
+            )
+        )
+        for rule, rule_metrics in metrics["rules"].items():
+            stream.write(
+                "[{0}] {1:.3f} ms, {2} evaluated, {3} failed\n".format(
+                    rule,
+                    rule_metrics["wall_time"] * MILLISECONDS_PER_SECOND,
+                    rule_metrics["evaluated"],
+                    rule_metrics["failed"],
+                )
+            )
+
+    def write(self, metrics_path):
+        with open(metrics_path, "w") as metrics_fp:
+            json.dump(self.as_dict(), metrics_fp, indent=2)
+            metrics_fp.write("\n")
@@ -0,0 +1,508 @@
+import contextlib
+import functools
+import glob
+import heapq
+import itertools
+import mmap
+import os
+import re
+import struct
+import types
+import zlib
+
+from dikort.commits import CommitRecord
+
+HEAD_REF = "HEAD"
+REF_LOOKUP_RULES = ("{0}", "refs/{0}", "refs/tags/{0}", "refs/heads/{0}", "refs/remotes/{0}", "refs/remotes/{0}/HEAD")
+MIN_ABBREV_LENGTH = 4
+_INFLATE_CHUNK_SIZE = 4096
+_SHA_SIZE = 20
+_HEXSHA_REGEX = re.compile("[0-9a-f]{40}")
+_ABBREV_REGEX = re.compile("[0-9a-f]{4,39}")
+_PSEUDO_REF_REGEX = re.compile("[A-Z_]+")
+_REV_REGEX = re.compile(r"([^~^]+)((?:[~^]\d*)*)")
+_REV_SUFFIX_REGEX = re.compile(r"([~^])(\d*)")
+_AUTHOR_REGEX = re.compile("(.*) <(.*?)>")
+_SYMBOLIC_REF_PREFIX = "ref: "
+_IDX_MAGIC = b"\377tOc"
+_IDX_VERSION = 2
+_IDX_HEADER = struct.Struct(">4sI")
+_IDX_FANOUT = struct.Struct(">256I")
+_IDX_OFFSET = struct.Struct(">I")
+_IDX_LARGE_OFFSET = struct.Struct(">Q")
+_LARGE_OFFSET_FLAG = 0x80000000
+_COMMIT_TYPE = 1
+_TAG_TYPE = 4
+_OFS_DELTA_TYPE = 6
+_REF_DELTA_TYPE = 7
+_OBJECT_TYPES = types.MappingProxyType({b"commit": 1, b"tree": 2, b"blob": 3, b"tag": 4})
+_VARINT_CONTINUE = 0x80
+_VARINT_MASK = 0x7F
+_DELTA_COPY_OFFSET_BYTES = 4
+_DELTA_COPY_SIZE_BYTES = 3
+_DELTA_DEFAULT_COPY_SIZE = 0x10000
+
+
+class PackError(Exception):
+    pass  # noqa: WPS420, WPS604
+
+
+class PackCommitReader:
+    def __init__(self, git_dir):
+        self.git_dir = git_dir
+        self._common_dir = _common_dir(git_dir)
+        self._object_store = _ObjectStore(_objects_dirs(os.path.join(self._common_dir, "objects")))
+        self._packed_refs = None
+
+    def iter_commits(self, rev, fields=(), parents_counts=()):
+        tips = self.resolve(rev)
+        return _filter_parents_counts(self._walk(tips), parents_counts)
+
+    def iter_commit_parents(self, rev, parents_counts=()):
+        commits = self.iter_commits(rev, parents_counts=parents_counts)
+        return ((commit.hexsha, commit.parents_count) for commit in commits)
+
+    def load_commits(self, hexshas, fields=()):
+        return (self._read_commit(hexsha)[0] for hexsha in hexshas)
+
+    def resolve(self, rev):
+        tips = []
+        negated = False
+        for rev_arg in (rev,) if isinstance(rev, str) else rev:
+            if rev_arg == "--not":
+                negated = not negated
+            elif rev_arg == "--all":
+                tips.extend((hexsha, negated) for hexsha in self._all_refs_commits())
+            else:
+                tips.extend(self._resolve_rev_arg(rev_arg, negated))
+        return tips
+
+    def close(self):
+        self._object_store.close()
+
+    def _resolve_rev_arg(self, rev_arg, negated):
+        if rev_arg.startswith("-") or "..." in rev_arg:
+            raise PackError(f"Unsupported revision {rev_arg}")
+        if ".." in rev_arg:
+            left_rev, right_rev = rev_arg.split("..", 1)
+            return [
+                (self._resolve_commit(left_rev or HEAD_REF), not negated),
+                (self._resolve_commit(right_rev or HEAD_REF), negated),
+            ]
+        if rev_arg.startswith("^"):
+            return [(self._resolve_commit(rev_arg[1:]), not negated)]
+        return [(self._resolve_commit(rev_arg), negated)]
+
+    def _resolve_commit(self, rev):
+        rev_match = _REV_REGEX.fullmatch(rev)
+        if not rev_match:
+            raise PackError(f"Unsupported revision {rev}")
+        name, suffixes = rev_match.groups()
+        hexsha = self._peel_commit(self._resolve_name(name))
+        for operator, number in _REV_SUFFIX_REGEX.findall(suffixes):
+            hexsha = self._navigate(hexsha, operator, int(number or 1))
+        return hexsha
+
+    def _resolve_name(self, name):
+        if _HEXSHA_REGEX.fullmatch(name):
+            return name
+        for lookup_rule in REF_LOOKUP_RULES:
+            hexsha = self._read_ref(lookup_rule.format(name))
+            if hexsha:
+                return hexsha
+        if _ABBREV_REGEX.fullmatch(name):
+            return self._object_store.expand(name)
+        raise PackError(f"Unknown revision {name}")
+
+    def _navigate(self, hexsha, operator, number):
+        if operator == "~":
+            for _ in range(number):
+                hexsha = self._nth_parent(hexsha, 1)
+            return hexsha
+        if number == 0:
+            return hexsha
+        return self._nth_parent(hexsha, number)
+
+    def _nth_parent(self, hexsha, number):
+        _, _, parents = self._read_commit(hexsha)
+        if len(parents) < number:
+            raise PackError(f"Commit {hexsha} has no parent {number}")
+        return parents[number - 1]
+
+    def _peel_commit(self, hexsha):
+        object_type, object_bytes = self._object_store.read(hexsha)
+        while object_type == _TAG_TYPE:
+            object_line, _, _ = object_bytes.partition(b"\n")
+            hexsha = object_line.partition(b" ")[2].decode()
+            object_type, object_bytes = self._object_store.read(hexsha)
+        if object_type != _COMMIT_TYPE:
+            raise PackError(f"Object {hexsha} is not a commit")
+        return hexsha
+
+    def _read_ref(self, refname, depth=0):
+        if not (refname.startswith("refs/") or _PSEUDO_REF_REGEX.fullmatch(refname)) or depth > 5:
+            return None
+        for refs_dir in (self.git_dir, self._common_dir):
+            ref_path = os.path.join(refs_dir, refname)
+            if os.path.isfile(ref_path):
+                with open(ref_path) as ref_fp:
+                    ref_value = ref_fp.read().strip()
+                if ref_value.startswith(_SYMBOLIC_REF_PREFIX):
+                    return self._read_ref(ref_value.replace(_SYMBOLIC_REF_PREFIX, "", 1), depth + 1)
+                return ref_value
+        return self._read_packed_refs().get(refname)
+
+    def _read_packed_refs(self):
+        if self._packed_refs is None:
+            self._packed_refs = _parse_packed_refs(os.path.join(self._common_dir, "packed-refs"))
+        return self._packed_refs
+
+    def _all_refs_commits(self):
+        refnames = set(self._read_packed_refs())
+        refs_dir = os.path.join(self._common_dir, "refs")
+        for dir_path, _, filenames in os.walk(refs_dir):
+            for filename in filenames:
+                refnames.add(os.path.relpath(os.path.join(dir_path, filename), self._common_dir).replace(os.sep, "/"))
+        hexshas = [self._read_ref(refname) for refname in (HEAD_REF, *sorted(refnames))]
+        for hexsha in filter(None, hexshas):
+            with contextlib.suppress(PackError):
+                yield self._peel_commit(hexsha)
+
+    def _walk(self, tips):
+        queue = []
+        enqueue = functools.partial(self._enqueue, queue, set(), itertools.count())
+        uninteresting = {hexsha for hexsha, negated in tips if negated}
+        limited_commits = []
+        parents_of = {}
+        for tip, _ in tips:
+            enqueue(tip)
+        while queue and not (uninteresting and _everybody_uninteresting(queue, uninteresting)):
+            _, commit, parents = heapq.heappop(queue)
+            parents_of[commit.hexsha] = parents
+            if commit.hexsha in uninteresting:
+                _mark_uninteresting(commit.hexsha, uninteresting, parents_of)
+            elif uninteresting:
+                limited_commits.append(commit)
+            else:
+                yield commit
+            for parent in parents:
+                enqueue(parent)
+        yield from (commit for commit in limited_commits if commit.hexsha not in uninteresting)
+
+    def _enqueue(self, queue, seen, counter, hexsha):
+        if hexsha in seen:
+            return
+        seen.add(hexsha)
+        commit, commit_time, parents = self._read_commit(hexsha)
+        heapq.heappush(queue, ((-commit_time, next(counter)), commit, parents))
+
+    def _read_commit(self, hexsha):
+        object_type, object_bytes = self._object_store.read(hexsha)
+        if object_type != _COMMIT_TYPE:
+            raise PackError(f"Object {hexsha} is not a commit")
+        return _parse_commit_object(hexsha, object_bytes)
+
+
+class _ObjectStore:
+    def __init__(self, objects_dirs):
+        self._object_store_dirs = objects_dirs
+        self._packs = []
+        for objects_dir in objects_dirs:
+            idx_paths = glob.glob(os.path.join(objects_dir, "pack", "*.idx"))
+            idx_paths.sort(key=os.path.getmtime, reverse=True)
+            self._packs.extend(_Pack(idx_path) for idx_path in idx_paths)
+
+    def read(self, hexsha):
+        binsha = bytes.fromhex(hexsha)
+        for pack in self._packs:
+            offset = pack.find(binsha)
+            if offset is not None:
+                return pack.read(offset, self)
+        for objects_dir in self._object_store_dirs:
+            loose_path = os.path.join(objects_dir, hexsha[:2], hexsha[2:])
+            if os.path.isfile(loose_path):
+                return _read_loose_object(loose_path)
+        raise PackError(f"Object {hexsha} not found")
+
+    def expand(self, prefix):
+        hexshas = set()
+        for pack in self._packs:
+            hexshas.update(pack.expand(prefix))
+        for objects_dir in self._object_store_dirs:
+            loose_dir = os.path.join(objects_dir, prefix[:2])
+            if os.path.isdir(loose_dir):
+                hexshas.update(prefix[:2] + name for name in os.listdir(loose_dir) if name.startswith(prefix[2:]))
+        if len(hexshas) != 1:
+            raise PackError(f"Revision {prefix} is unknown or ambiguous")
+        return hexshas.pop()
+
+    def close(self):
+        for pack in self._packs:
+            pack.close()
+
+
+class _Pack:
+    def __init__(self, idx_path):
+        self._idx = _map_file(idx_path)
+        self._pack = _map_file("{0}.pack".format(os.path.splitext(idx_path)[0]))
+        magic, version = _IDX_HEADER.unpack_from(self._idx)
+        if magic != _IDX_MAGIC or version != _IDX_VERSION:
+            raise PackError(f"Unsupported pack index {idx_path}")
+        self._fanout = _IDX_FANOUT.unpack_from(self._idx, _IDX_HEADER.size)
+        objects_count = self._fanout[-1]
+        self._shas_start = _IDX_HEADER.size + _IDX_FANOUT.size
+        self._offsets_start = self._shas_start + objects_count * (_SHA_SIZE + 4)
+        self._large_offsets_start = self._offsets_start + objects_count * 4
+
+    def find(self, binsha):
+        lower = self._fanout[binsha[0] - 1] if binsha[0] else 0
+        upper = self._fanout[binsha[0]]
+        while lower < upper:
+            middle = (lower + upper) // 2
+            middle_sha = self._sha(middle)
+            if middle_sha < binsha:
+                lower = middle + 1
+            elif middle_sha > binsha:
+                upper = middle
+            else:
+                return self._offset(middle)
+        return None
+
+    def expand(self, prefix):
+        first_byte = int(prefix[:2], 16)
+        lower = self._fanout[first_byte - 1] if first_byte else 0
+        for index in range(lower, self._fanout[first_byte]):
+            hexsha = self._sha(index).hex()
+            if hexsha.startswith(prefix):
+                yield hexsha
+
+    def read(self, offset, object_store):
+        object_type, size, data_offset = _read_entry_header(self._pack, offset)
+        if object_type == _OFS_DELTA_TYPE:
+            base_distance, data_offset = _read_base_distance(self._pack, data_offset)
+            base_type, base_bytes = self.read(offset - base_distance, object_store)
+            return base_type, _apply_delta(base_bytes, self._inflate(data_offset, size))
+        if object_type == _REF_DELTA_TYPE:
+            base_end = data_offset + _SHA_SIZE
+            base_hexsha = self._pack[data_offset:base_end].hex()
+            base_type, base_bytes = object_store.read(base_hexsha)
+            return base_type, _apply_delta(base_bytes, self._inflate(data_offset + _SHA_SIZE, size))
+        return object_type, self._inflate(data_offset, size)
+
+    def close(self):
+        self._idx.close()
+        self._pack.close()
+
+    def _sha(self, index):
+        sha_start = self._shas_start + index * _SHA_SIZE
+        sha_end = sha_start + _SHA_SIZE
+        return self._idx[sha_start:sha_end]
+
+    def _offset(self, index):
+        offset = _IDX_OFFSET.unpack_from(self._idx, self._offsets_start + index * _IDX_OFFSET.size)[0]
+        if offset & _LARGE_OFFSET_FLAG:
+            large_offset_index = offset ^ _LARGE_OFFSET_FLAG
+            large_offset_position = self._large_offsets_start + large_offset_index * _IDX_LARGE_OFFSET.size
+            offset = _IDX_LARGE_OFFSET.unpack_from(self._idx, large_offset_position)[0]
+        return offset
+
+    def _inflate(self, data_offset, size):
+        decompressor = zlib.decompressobj()
+        chunks = []
+        while not decompressor.eof:
+            chunk_end = data_offset + _INFLATE_CHUNK_SIZE
+            chunk = self._pack[data_offset:chunk_end]
+            if not chunk:
+                raise PackError("Truncated pack entry")
+            chunks.append(decompressor.decompress(chunk))
+            data_offset += _INFLATE_CHUNK_SIZE
+        object_bytes = b"".join(chunks)
+        if len(object_bytes) != size:
+            raise PackError("Corrupted pack entry")
+        return object_bytes
+
+
+def open_pack_reader(git_dir, rev):
+    reader = PackCommitReader(git_dir)
+    reader.resolve(rev)
+    return reader
+
+
+def _common_dir(git_dir):
+    try:
+        with open(os.path.join(git_dir, "commondir")) as common_dir_fp:
+            return os.path.normpath(os.path.join(git_dir, common_dir_fp.read().strip()))
+    except FileNotFoundError:
+        return git_dir
+
+
+def _objects_dirs(objects_dir):
+    objects_dir = os.environ.get("GIT_OBJECT_DIRECTORY") or objects_dir
+    extra_dirs = os.environ.get("GIT_ALTERNATE_OBJECT_DIRECTORIES", "").split(os.pathsep)
+    objects_dirs = []
+    for store_dir in (objects_dir, *filter(None, extra_dirs)):
+        objects_dirs.append(store_dir)
+        objects_dirs.extend(_alternates(store_dir))
+    return list(dict.fromkeys(objects_dirs))
+
+
+def _alternates(objects_dir):
+    try:
+        with open(os.path.join(objects_dir, "info", "alternates")) as alternates_fp:
+            alternates = [line.strip() for line in alternates_fp]
+    except FileNotFoundError:
+        return []
+    return [
+        os.path.normpath(os.path.join(objects_dir, alternate))
+        for alternate in alternates
+        if alternate and not alternate.startswith("#")
+    ]
+
+
+def _parse_packed_refs(packed_refs_path):
+    packed_refs = {}
+    try:
+        with open(packed_refs_path) as packed_refs_fp:
+            packed_refs_lines = packed_refs_fp.read().splitlines()
+    except FileNotFoundError:
+        return packed_refs
+    for line in packed_refs_lines:
+        if line and line[0] not in "#^":
+            hexsha, _, refname = line.partition(" ")
+            packed_refs[refname] = hexsha
+    return packed_refs
+
+
+def _map_file(file_path):
+    with open(file_path, "rb") as mapped_fp:
+        return mmap.mmap(mapped_fp.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def _read_loose_object(loose_path):
+    with open(loose_path, "rb") as loose_fp:
+        loose_bytes = zlib.decompress(loose_fp.read())
+    header, _, object_bytes = loose_bytes.partition(b"\0")
+    object_kind, _, _ = header.partition(b" ")
+    return _OBJECT_TYPES[object_kind], object_bytes
+
+
+def _read_entry_header(pack, offset):
+    byte = pack[offset]
+    object_type = (byte >> 4) & 0x7
+    size = byte & 0xF
+    shift = 4
+    offset += 1
+    while byte & _VARINT_CONTINUE:
+        byte = pack[offset]
+        size |= (byte & _VARINT_MASK) << shift
+        shift += 7
+        offset += 1
+    return object_type, size, offset
+
+
+def _read_base_distance(pack, offset):
+    byte = pack[offset]
+    base_distance = byte & _VARINT_MASK
+    offset += 1
+    while byte & _VARINT_CONTINUE:
+        byte = pack[offset]
+        base_distance = ((base_distance + 1) << 7) | (byte & _VARINT_MASK)
+        offset += 1
+    return base_distance, offset
+
+
+def _read_delta_size(delta, offset):
+    size = 0
+    shift = 0
+    while True:
+        byte = delta[offset]
+        size |= (byte & _VARINT_MASK) << shift
+        shift += 7
+        offset += 1
+        if not byte & _VARINT_CONTINUE:
+            return size, offset
+
+
+def _apply_delta(base_bytes, delta):  # noqa: WPS231
+    _, offset = _read_delta_size(delta, 0)
+    target_size, offset = _read_delta_size(delta, offset)
+    target = bytearray()
+    while offset < len(delta):
+        opcode = delta[offset]
+        offset += 1
+        if opcode & _VARINT_CONTINUE:
+            copy_offset, offset = _read_delta_copy_arg(delta, offset, opcode, _DELTA_COPY_OFFSET_BYTES)
+            copy_size, offset = _read_delta_copy_arg(delta, offset, opcode >> _DELTA_COPY_OFFSET_BYTES, 3)
+            copy_end = copy_offset + (copy_size or _DELTA_DEFAULT_COPY_SIZE)
+            target += base_bytes[copy_offset:copy_end]
+        elif opcode:
+            insert_end = offset + opcode
+            target += delta[offset:insert_end]
+            offset = insert_end
+        else:
+            raise PackError("Invalid delta opcode")
+    if len(target) != target_size:
+        raise PackError("Corrupted delta")
+    return bytes(target)
+
+
+def _read_delta_copy_arg(delta, offset, flags, bytes_count):
+    copy_arg = 0
+    for byte_index in range(bytes_count):
+        if flags & (1 << byte_index):
+            copy_arg |= delta[offset] << (byte_index * 8)
+            offset += 1
+    return copy_arg, offset
+
+
+def _parse_commit_object(hexsha, object_bytes):
+    header, _, message_bytes = object_bytes.partition(b"\n\n")
+    parents = []
+    headers = {}
+    for header_line in header.split(b"\n"):
+        field_name, _, field_value = header_line.partition(b" ")
+        if field_name == b"parent":
+            parents.append(field_value.decode())
+        elif not field_name.startswith(b" "):
+            headers.setdefault(field_name, field_value)
+    encoding = headers.get(b"encoding", b"utf-8").decode()
+    message = _decode_message(message_bytes, encoding)
+    author_match = _AUTHOR_REGEX.match(headers.get(b"author", b"").decode("utf-8", "replace"))
+    author_name, author_email = author_match.groups() if author_match else ("", "")
+    commit = CommitRecord(
+        hexsha=hexsha,
+        parents_count=len(parents),
+        summary=message.split("\n", 1)[0],
+        message_tail=message.rstrip().rpartition("\n")[2],
+        author_name=author_name,
+        author_email=author_email,
+        has_signature=b"gpgsig" in headers,
+    )
+    committer_time = int(headers.get(b"committer", b"0 0").rsplit(b" ", 2)[-2])
+    return commit, committer_time, parents
+
+
+def _decode_message(message_bytes, encoding):
+    try:
+        return message_bytes.decode(encoding, "replace")
+    except LookupError:
+        return message_bytes.decode("utf-8", "replace")
+
+
+def _everybody_uninteresting(queue, uninteresting):
+    return all(commit.hexsha in uninteresting for _, commit, _ in queue)
+
+
+def _mark_uninteresting(hexsha, uninteresting, parents_of):
+    pending = [hexsha]
+    while pending:
+        for parent in parents_of.get(pending.pop(), ()):
+            if parent not in uninteresting:
+                uninteresting.add(parent)
+                pending.append(parent)
+
+
+def _filter_parents_counts(commits, parents_counts):
+    if not parents_counts:
+        return commits
+    return (commit for commit in commits if commit.parents_count in parents_counts)
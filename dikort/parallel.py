@@ -0,0 +1,37 @@
+import collections
+import contextlib
+import functools
+import itertools
+from concurrent.futures import ProcessPoolExecutor, wait
+
+CHUNK_SIZE = 1000
+_PENDING_CHUNKS_PER_JOB = 2
+
+
+def imap_chunks(func, iterable, *, jobs, initializer=None, initargs=()):
+    chunks = iter(functools.partial(_take_chunk, iter(iterable)), [])
+    with ProcessPoolExecutor(max_workers=jobs, initializer=initializer, initargs=initargs) as executor:
+        yield from _imap_pending(executor, func, chunks, jobs * _PENDING_CHUNKS_PER_JOB)
+
+
+def _imap_pending(executor, func, chunks, max_pending):
+    pending = collections.deque()
+    with contextlib.ExitStack() as stopped:
+        stopped.callback(_cancel_pending, pending)
+        for chunk in chunks:
+            pending.append(executor.submit(func, chunk))
+            if len(pending) >= max_pending:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def _cancel_pending(pending):
+    for future in pending:
+        future.cancel()
+    # Python 3.7 executor can miss the shutdown wakeup while cancelled futures are still queued
+    wait(pending)
+
+
+def _take_chunk(iterator):
+    return list(itertools.islice(iterator, CHUNK_SIZE))
@@ -0,0 +1,9 @@
+def pushed_range(ref_updates):
+    new_hexshas = {}
+    for ref_update in ref_updates:
+        if not ref_update.strip():
+            continue
+        _, new_hexsha, _ = ref_update.split()
+        if new_hexsha.strip("0"):
+            new_hexshas[new_hexsha] = None
+    return (*new_hexshas, "--not", "--all")
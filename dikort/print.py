@@ -1,3 +1,8 @@
+import logging
+
+TEXT_FORMAT = "text"
+
+
 class BColors:
     header = "\033[95m"
     okgreen = "\033[92m"
@@ -18,6 +23,13 @@ def print_warning(*args, sep=" ", end="\n"):
     _print_formatted(*args, sep=sep, end=end, formatter=BColors.warning)
 
 
+def print_format_warning(output_format, warning):
+    if output_format == TEXT_FORMAT:
+        print_warning(warning)
+    else:
+        logging.warning(warning)
+
+
 def print_success(*args, sep=" ", end="\n"):
     _print_formatted(*args, sep=sep, end=end, formatter=BColors.okgreen)
 
@@ -0,0 +1,71 @@
+import logging
+import os
+import subprocess  # noqa: S404
+
+from dikort.commits import GIT_COUNTERS
+
+HEAD = "HEAD"
+_NO_MERGE_BASE_EXIT_CODE = 1
+
+
+class PullRequestError(Exception):
+    pass  # noqa: WPS420, WPS604
+
+
+def pull_request_range(repository_path, base):
+    merge_bases = _merge_bases(repository_path, base)
+    shallow_hexshas = _shallow_hexshas(repository_path)
+    if not merge_bases:
+        if shallow_hexshas:
+            raise PullRequestError(f"{base} and {HEAD} fork beyond the shallow history. Fetch more history")
+        raise PullRequestError(f"{base} and {HEAD} have no common history")
+    logging.info("Merge bases of %s and %s: %s", base, HEAD, ", ".join(merge_bases))
+    commit_range = (HEAD, "--not", *merge_bases)
+    if shallow_hexshas:
+        _check_shallow_boundary(repository_path, commit_range, shallow_hexshas)
+    return commit_range
+
+
+def _merge_bases(repository_path, base):
+    git_merge_base = _run_git(repository_path, "merge-base", "--all", base, HEAD)
+    if git_merge_base.returncode == _NO_MERGE_BASE_EXIT_CODE:
+        return []
+    _check_returncode(git_merge_base)
+    return git_merge_base.stdout.split()
+
+
+def _shallow_hexshas(repository_path):
+    git_rev_parse = _run_git(repository_path, "rev-parse", "--is-shallow-repository", "--git-path", "shallow")
+    _check_returncode(git_rev_parse)
+    is_shallow, shallow_path = git_rev_parse.stdout.splitlines()
+    if is_shallow != "true":
+        return frozenset()
+    try:
+        with open(os.path.join(repository_path, shallow_path)) as shallow_fp:
+            return frozenset(shallow_fp.read().split())
+    except OSError as err:
+        raise PullRequestError(f"Cannot read shallow commits. Error: {err}")
+
+
+def _check_shallow_boundary(repository_path, commit_range, shallow_hexshas):
+    git_rev_list = _run_git(repository_path, "rev-list", *commit_range, "--")
+    _check_returncode(git_rev_list)
+    boundary_hexshas = shallow_hexshas.intersection(git_rev_list.stdout.split())
+    if boundary_hexshas:
+        boundary = ", ".join(sorted(boundary_hexshas))
+        raise PullRequestError(f"Shallow history ends at {boundary} inside the pull request. Fetch more history")
+
+
+def _run_git(repository_path, *git_args):
+    command = ("git", "-C", repository_path, *git_args)
+    try:
+        git_run = subprocess.run(command, capture_output=True, check=False, text=True)  # noqa: S603
+    except OSError as err:
+        raise PullRequestError(f"Cannot run git. Error: {err}")
+    GIT_COUNTERS.update(calls=1, bytes_read=len(git_run.stdout))
+    return git_run
+
+
+def _check_returncode(git_run):
+    if git_run.returncode:
+        raise PullRequestError(git_run.stderr.strip())
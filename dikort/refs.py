@@ -0,0 +1,99 @@
+import subprocess  # noqa: S404
+
+from dikort.commits import GIT_COUNTERS
+
+DIKORT_REFS_PREFIX = "refs/dikort/"
+DEFAULT_REFS_PATTERNS = ("refs/heads", "refs/tags")
+_COMMIT_TYPE = "commit"
+_REF_FORMAT = "--format=%(objectname) %(objecttype) %(*objectname) %(*objecttype) %(refname)"
+
+
+class RefsError(Exception):
+    pass  # noqa: WPS420, WPS604
+
+
+def read_ref_tips(repository_path, refs_glob=""):
+    refs_patterns = refs_glob.split() or DEFAULT_REFS_PATTERNS
+    git_for_each_ref = _run_git(repository_path, "for-each-ref", _REF_FORMAT, *refs_patterns)
+    if git_for_each_ref.returncode:
+        raise RefsError(git_for_each_ref.stderr.decode().strip())
+    ref_lines = git_for_each_ref.stdout.decode().splitlines()
+    ref_tips = dict(ref_tip for ref_tip in map(_ref_tip, ref_lines) if ref_tip)
+    if not ref_tips:
+        raise RefsError("No refs match {0}".format(" ".join(refs_patterns)))
+    return ref_tips
+
+
+def attribute_refs(commits, repository_path, ref_tips):
+    refs_masks = _refs_masks(repository_path, ref_tips, {commit.hexsha for commit in commits})
+    refnames = list(ref_tips)
+    for commit in commits:
+        commit.refs = _masked_refnames(refnames, refs_masks.get(commit.hexsha, 0))
+
+
+def _ref_tip(ref_line):
+    ref_fields = ref_line.split(" ")
+    refname = ref_fields[-1]
+    if refname.startswith(DIKORT_REFS_PREFIX):
+        return None
+    if ref_fields[1] == _COMMIT_TYPE:
+        return refname, ref_fields[0]
+    if ref_fields[3] == _COMMIT_TYPE:
+        return refname, ref_fields[2]
+    return None
+
+
+def _refs_masks(repository_path, ref_tips, hexshas):
+    walk_masks = _tips_masks(ref_tips)
+    rev_list_args = ("rev-list", "--topo-order", "--parents", *walk_masks, "--")
+    try:
+        proc = subprocess.Popen(_git_command(repository_path, *rev_list_args), stdout=subprocess.PIPE)  # noqa: S603
+    except OSError as err:
+        raise RefsError(f"Cannot run git. Error: {err}")
+    GIT_COUNTERS["calls"] += 1
+    with proc:
+        refs_masks = _propagate_masks(proc.stdout, walk_masks, hexshas)
+        proc.terminate()
+    if len(refs_masks) < len(hexshas) and proc.returncode:
+        raise RefsError(f"git rev-list exited with {proc.returncode}")
+    return refs_masks
+
+
+def _tips_masks(ref_tips):
+    tips_masks = {}
+    for ref_index, tip_hexsha in enumerate(ref_tips.values()):
+        tips_masks[tip_hexsha] = tips_masks.get(tip_hexsha, 0) | 1 << ref_index
+    return tips_masks
+
+
+def _propagate_masks(rev_list_lines, walk_masks, hexshas):
+    refs_masks = {}
+    for rev_list_line in rev_list_lines:
+        GIT_COUNTERS["bytes_read"] += len(rev_list_line)
+        hexsha, *parents = rev_list_line.decode().split()
+        refs_mask = walk_masks.pop(hexsha, 0)
+        for parent in parents:
+            walk_masks[parent] = walk_masks.get(parent, 0) | refs_mask
+        if hexsha in hexshas:
+            refs_masks[hexsha] = refs_mask
+            if len(refs_masks) == len(hexshas):
+                break
+    return refs_masks
+
+
+def _masked_refnames(refnames, refs_mask):
+    return [refname for ref_index, refname in enumerate(refnames) if refs_mask >> ref_index & 1]
+
+
+def _run_git(repository_path, *git_args):
+    command = _git_command(repository_path, *git_args)
+    try:
+        git_run = subprocess.run(command, capture_output=True, check=False)  # noqa: S603
+    except OSError as err:
+        raise RefsError(f"Cannot run git. Error: {err}")
+    GIT_COUNTERS.update(calls=1, bytes_read=len(git_run.stdout))
+    return git_run
+
+
+def _git_command(repository_path, *git_args):
+    return ("git", "-C", repository_path, *git_args)
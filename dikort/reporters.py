@@ -0,0 +1,161 @@
+import json
+import re
+import types
+
+import dikort
+from dikort.print import BColors
+
+SARIF_SCHEMA_URL = "https://json.schemastore.org/sarif-2.1.0.json"
+SARIF_VERSION = "2.1.0"
+TOOL_URL = "https://github.com/weastur/dikort"
+XML_DECLARATION = '<?xml version="1.0" encoding="utf-8"?>\n'
+_RULE_ID_SEPARATOR_REGEX = re.compile("[^a-z0-9]+")
+_ERROR_STATUS = f"{BColors.fail}ERROR{BColors.endc}"
+_SUCCESS_STATUS = f"{BColors.okgreen}SUCCESS{BColors.endc}"
+_NOT_CHECKED_STATUS = f"{BColors.warning}NOT CHECKED{BColors.endc}"
+_STOPPED_EARLY_MESSAGE = "Checks stopped early, some commits are not checked"
+_STOPPED_EARLY_LINE = f"{BColors.warning}{_STOPPED_EARLY_MESSAGE}.{BColors.endc}\n"
+
+
+class TextReporter:
+    def __init__(self, stream, rules):
+        self._stream = stream
+        self._rules_lines = {rule: [] for rule in rules}
+
+    def report_violation(self, rule, commit):
+        self._rules_lines[rule].append(_commit_line(commit))
+
+    def finish(self, all_clear, stopped_early=False):
+        passed_status = _NOT_CHECKED_STATUS if stopped_early else _SUCCESS_STATUS
+        for rule, commit_lines in self._rules_lines.items():
+            if commit_lines:
+                self._stream.write(f"[{rule}] - {_ERROR_STATUS}\n")
+                self._stream.write("".join(commit_lines))
+            else:
+                self._stream.write(f"[{rule}] - {passed_status}\n")
+        if stopped_early:
+            self._stream.write(_STOPPED_EARLY_LINE)
+        if all_clear:
+            self._stream.write(f"{BColors.okgreen}All clear.{BColors.endc}\n")
+        else:
+            self._stream.write(f"{BColors.fail}Some checks are failed.{BColors.endc}\n")
+        self._stream.flush()
+
+
+class JSONLinesReporter:
+    def __init__(self, stream, rules):
+        self._stream = stream
+
+    def report_violation(self, rule, commit):
+        self._stream.write(json.dumps(_json_record(rule, commit)))
+        self._stream.write("\n")
+
+    def finish(self, all_clear, stopped_early=False):
+        self._stream.flush()
+
+
+class SARIFReporter:
+    def __init__(self, stream, rules):
+        self._stream = stream
+        self._rule_ids = {rule: _rule_id(rule) for rule in rules}
+        self._sarif_results = []
+
+    def report_violation(self, rule, commit):
+        self._sarif_results.append(_sarif_result(self._rule_ids[rule], rule, commit))
+
+    def finish(self, all_clear, stopped_early=False):
+        driver = {
+            "name": "dikort",
+            "version": dikort.__version__,
+            "informationUri": TOOL_URL,
+            "rules": self._sarif_rules(),
+        }
+        sarif_log = {
+            "$schema": SARIF_SCHEMA_URL,
+            "version": SARIF_VERSION,
+            "runs": [{"tool": {"driver": driver}, "results": self._sarif_results}],
+        }
+        self._stream.write(json.dumps(sarif_log, indent=2))
+        self._stream.write("\n")
+        self._stream.flush()
+
+    def _sarif_rules(self):
+        return [{"id": rule_id, "name": rule} for rule, rule_id in self._rule_ids.items()]
+
+
+class JUnitReporter:
+    def __init__(self, stream, rules):
+        self._stream = stream
+        self._rules_lines = {rule: [] for rule in rules}
+
+    def report_violation(self, rule, commit):
+        self._rules_lines[rule].append(_commit_line(commit))
+
+    def finish(self, all_clear, stopped_early=False):
+        from xml.etree import ElementTree  # noqa: S405
+
+        test_suite = ElementTree.Element("testsuite", name="dikort")
+        for rule, commit_lines in self._rules_lines.items():
+            _junit_test_case(test_suite, rule, commit_lines, stopped_early=stopped_early)
+        failures_count = sum(bool(rule_lines) for rule_lines in self._rules_lines.values())
+        test_suite.set("tests", str(len(self._rules_lines)))
+        test_suite.set("failures", str(failures_count))
+        if stopped_early:
+            test_suite.set("skipped", str(len(self._rules_lines) - failures_count))
+        self._stream.write(XML_DECLARATION)
+        self._stream.write(ElementTree.tostring(test_suite, encoding="unicode"))
+        self._stream.write("\n")
+        self._stream.flush()
+
+
+REPORTERS = types.MappingProxyType(
+    {
+        "text": TextReporter,
+        "jsonl": JSONLinesReporter,
+        "sarif": SARIFReporter,
+        "junit": JUnitReporter,
+    }
+)
+
+
+def _commit_line(commit):
+    if commit.refs:
+        refs = ", ".join(commit.refs)
+        return f"Hash: {commit.hexsha}, message: '{commit.summary}', refs: {refs}\n"
+    return f"Hash: {commit.hexsha}, message: '{commit.summary}'\n"
+
+
+def _json_record(rule, commit):
+    json_record = {"rule": rule, "hexsha": commit.hexsha, "summary": commit.summary}
+    if commit.refs:
+        json_record["refs"] = commit.refs
+    return json_record
+
+
+def _sarif_result(rule_id, rule, commit):
+    sarif_result = {
+        "ruleId": rule_id,
+        "level": "error",
+        "message": {"text": "Commit {0} violates '{1}': {2}".format(commit.hexsha, rule, commit.summary)},
+        "partialFingerprints": {"commitSha": commit.hexsha},
+    }
+    if commit.refs:
+        sarif_result["properties"] = {"refs": commit.refs}
+    return sarif_result
+
+
+def _junit_test_case(test_suite, rule, commit_lines, *, stopped_early=False):
+    from xml.etree import ElementTree  # noqa: S405
+
+    test_case_attrs = {"classname": "dikort", "name": rule}
+    test_case = ElementTree.SubElement(test_suite, "testcase", test_case_attrs)
+    if commit_lines:
+        failure_message = "{0} commits failed".format(len(commit_lines))
+        failure = ElementTree.SubElement(test_case, "failure", message=failure_message)
+        failure.text = "".join(commit_lines)
+    elif stopped_early:
+        ElementTree.SubElement(test_case, "skipped", message=_STOPPED_EARLY_MESSAGE)
+
+
+def _rule_id(rule):
+    return _RULE_ID_SEPARATOR_REGEX.sub("-", rule.lower()).strip("-")
@@ -0,0 +1,184 @@
+import collections
+import contextlib
+import io
+import json
+import logging
+import os
+import socketserver
+import sys
+import threading
+
+from dikort.analyzer import analyze_commits
+from dikort.config import DEFAULTS, ERROR_EXIT_CODE, merge
+
+REPOSITORIES_POOL_SIZE = 64
+CONFIGS_CACHE_SIZE = 256
+
+
+class RequestOutput:
+    def __init__(self, default_stream):
+        self.default_stream = default_stream
+        self._local = threading.local()
+
+    def __getattr__(self, name):
+        return getattr(self._stream(), name)
+
+    @contextlib.contextmanager
+    def capture(self):
+        self._local.stream = io.StringIO()
+        try:
+            yield self._local.stream
+        finally:
+            self._local.stream = None
+
+    def write(self, text):
+        return self._stream().write(text)
+
+    def flush(self):
+        self._stream().flush()
+
+    def _stream(self):
+        return getattr(self._local, "stream", None) or self.default_stream
+
+
+class CheckServer(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, socket_path, parse_cmd_args):
+        self.parse_cmd_args = parse_cmd_args
+        self.repositories = collections.OrderedDict()
+        self.configs = collections.OrderedDict()
+        self._pool_lock = threading.Lock()
+        self._repository_locks = {}
+        self._output = RequestOutput(sys.stdout)
+        super().__init__(socket_path, CheckRequestHandler)
+        sys.stdout = self._output
+
+    def check(self, argv, cwd):
+        with self._output.capture() as output:
+            exit_code = self._check(argv, cwd)
+            return {"exit_code": exit_code, "output": output.getvalue()}
+
+    def config(self, argv, cwd):
+        cmd_args = self.parse_cmd_args(argv)
+        cmd_args_vars = vars(cmd_args)
+        config_path = _config_path(cmd_args_vars["main:config"], cwd)
+        cmd_args_vars["main:config"] = config_path
+        cmd_args_items = tuple(sorted(cmd_args_vars.items()))
+        key = (cwd, cmd_args_items, _config_mtime(config_path))
+        with self._pool_lock:
+            config = self.configs.get(key)
+        if config is None:
+            config = _with_cwd(merge(cmd_args), cwd)
+        with self._pool_lock:
+            self.configs[key] = config
+            self.configs.move_to_end(key)
+            if len(self.configs) > CONFIGS_CACHE_SIZE:
+                self.configs.popitem(last=False)
+        return config
+
+    def repository(self, repository_path):
+        from git import Repo
+        from git.exc import InvalidGitRepositoryError, NoSuchPathError
+
+        repository_path = os.path.realpath(repository_path)
+        with self._pool_lock:
+            if repository_path not in self.repositories:
+                try:
+                    self.repositories[repository_path] = Repo(repository_path)
+                except (NoSuchPathError, InvalidGitRepositoryError):
+                    return None
+            self.repositories.move_to_end(repository_path)
+            evicted_repositories = []
+            if len(self.repositories) > REPOSITORIES_POOL_SIZE:
+                evicted_repositories.append(self.repositories.popitem(last=False))
+            repo = self.repositories[repository_path]
+        for evicted_path, evicted_repo in evicted_repositories:
+            self._close_idle(evicted_path, evicted_repo)
+        return repo
+
+    def repository_lock(self, repository_path):
+        with self._pool_lock:
+            return self._repository_locks.setdefault(os.path.realpath(repository_path), threading.Lock())
+
+    def server_close(self):
+        super().server_close()
+        if sys.stdout is self._output:
+            sys.stdout = self._output.default_stream
+        for repo in self.repositories.values():
+            repo.close()
+        with contextlib.suppress(OSError):
+            os.unlink(self.server_address)
+
+    def _check(self, argv, cwd):
+        try:
+            self._analyze_commits(argv, cwd)
+        except SystemExit as exit_err:
+            return exit_err.code or 0
+        return 0
+
+    def _analyze_commits(self, argv, cwd):
+        config = self.config(argv, cwd)
+        repository_path = config["main"]["repository"]
+        with self.repository_lock(repository_path):
+            analyze_commits(config, self.repository(repository_path))
+
+    def _close_idle(self, repository_path, repo):
+        repository_lock = self.repository_lock(repository_path)
+        if repository_lock.acquire(blocking=False):
+            with contextlib.ExitStack() as locked:
+                locked.callback(repository_lock.release)
+                repo.close()
+
+
+class CheckRequestHandler(socketserver.StreamRequestHandler):
+    def handle(self):  # noqa: WPS110
+        try:
+            argv, cwd = self._read_request()
+        except (ValueError, KeyError, TypeError, OSError) as err:
+            logging.warning("Bad request. Error: %s", err)
+            check_response = {"exit_code": ERROR_EXIT_CODE, "output": f"Bad request. Error: {err}\n"}
+        else:
+            check_response = self.server.check(argv, cwd)
+        self.wfile.write(json.dumps(check_response).encode())
+        self.wfile.write(b"\n")
+
+    def _read_request(self):
+        check_request = json.loads(self.rfile.readline())
+        cwd = check_request["cwd"]
+        if not isinstance(cwd, str) or not os.path.isabs(cwd):
+            raise ValueError(f"cwd must be an absolute path, got {cwd!r}")
+        logging.info("Check %s in %s", check_request["argv"], cwd)
+        return list(check_request["argv"]), cwd
+
+
+def serve(socket_path, parse_cmd_args):
+    with contextlib.suppress(FileNotFoundError):
+        os.unlink(socket_path)
+    with CheckServer(socket_path, parse_cmd_args) as check_server:
+        logging.info("Serve checks at %s", socket_path)
+        with contextlib.suppress(KeyboardInterrupt):
+            check_server.serve_forever()
+
+
+def _with_cwd(config, cwd):
+    main_config = config["main"]
+    metrics_file = main_config["metrics_file"] and os.path.join(cwd, main_config["metrics_file"])
+    repository_path = os.path.join(cwd, main_config["repository"])
+    return {**config, "main": {**main_config, "repository": repository_path, "metrics_file": metrics_file}}
+
+
+def _config_path(config_path, cwd):
+    if config_path:
+        return os.path.join(cwd, config_path)
+    default_config_path = os.path.join(cwd, DEFAULTS["main"]["config"])
+    if os.path.exists(default_config_path):
+        return default_config_path
+    return os.devnull
+
+
+def _config_mtime(config_path):
+    try:
+        return os.stat(config_path).st_mtime_ns
+    except OSError:
+        return None
@@ -0,0 +1,195 @@
+import contextlib
+import functools
+import hashlib
+import itertools
+import json
+import logging
+import os
+import sqlite3
+import subprocess  # noqa: S404
+from concurrent.futures import ThreadPoolExecutor
+
+from dikort.cache import CACHE_FILENAME
+from dikort.commits import GIT_COUNTERS
+
+VERIFY_BATCH_SIZE = 1000
+VERIFY_CHUNK_SIZE = 100
+_CACHED_STATUSES = frozenset(("G", "U", "B"))
+_FIELD_SEPARATOR = "\x1f"
+_VERIFY_FORMAT = "--format=%H%x1f%G?%x1f%GF%x1f%GP"
+_QUERY_CHUNK_SIZE = 500
+_TRUST_CONFIG_REGEX = r"^gpg\."
+_TRUST_FILE_KEYS = ("gpg.ssh.allowedsignersfile", "gpg.ssh.revocationfile")
+_KEYRING_FILES = ("pubring.kbx", "pubring.gpg", "trustdb.gpg", os.path.join("public-keys.d", "pubring.db"))
+_DEFAULT_GNUPG_HOME = os.path.join(os.path.expanduser("~"), ".gnupg")
+_CREATE_TABLE_QUERY = """
+CREATE TABLE IF NOT EXISTS trusted_signatures (
+    digest TEXT NOT NULL,
+    hexsha TEXT NOT NULL,
+    fingerprint TEXT NOT NULL,
+    primary_fingerprint TEXT NOT NULL,
+    status TEXT NOT NULL,
+    PRIMARY KEY (digest, hexsha)
+)
+"""
+_SELECT_QUERY = """
+SELECT hexsha, status, fingerprint, primary_fingerprint FROM trusted_signatures
+WHERE digest = ? AND hexsha IN ({placeholders})
+"""
+_INSERT_QUERY = "INSERT OR REPLACE INTO trusted_signatures VALUES (?, ?, ?, ?, ?)"
+
+
+class Signature:
+    __slots__ = ("status", "fingerprint", "primary_fingerprint")
+
+    def __init__(self, status, fingerprint="", primary_fingerprint=""):
+        self.status = status
+        self.fingerprint = fingerprint
+        self.primary_fingerprint = primary_fingerprint
+
+
+class SignatureCache:
+    def __init__(self, git_dir, *, digest):
+        self._digest = digest
+        self._connection = sqlite3.connect(os.path.join(git_dir, CACHE_FILENAME))
+        self._connection.execute(_CREATE_TABLE_QUERY)
+
+    def get(self, hexshas):
+        signatures = {}
+        for offset in range(0, len(hexshas), _QUERY_CHUNK_SIZE):
+            chunk_end = offset + _QUERY_CHUNK_SIZE
+            signatures.update(self._select(hexshas[offset:chunk_end]))
+        return signatures
+
+    def update(self, signatures):
+        with self._connection:
+            self._connection.executemany(_INSERT_QUERY, self._rows(signatures))
+
+    def close(self):
+        self._connection.close()
+
+    def _rows(self, signatures):
+        rows = []
+        for hexsha, signature in signatures.items():
+            if signature.status in _CACHED_STATUSES:
+                rows.append(
+                    (self._digest, hexsha, signature.fingerprint, signature.primary_fingerprint, signature.status)
+                )
+        return rows
+
+    def _select(self, hexshas):
+        placeholders = ", ".join("?" * len(hexshas))
+        rows = self._connection.execute(
+            _SELECT_QUERY.format(placeholders=placeholders),
+            (self._digest, *hexshas),
+        )
+        return {hexsha: Signature(*signature_fields) for hexsha, *signature_fields in rows}
+
+
+def trust_digest(git_dir):
+    trust_settings = _trust_settings(git_dir)
+    gnupg_home = os.environ.get("GNUPGHOME") or _DEFAULT_GNUPG_HOME
+    trust_files = [os.path.join(gnupg_home, keyring_file) for keyring_file in _KEYRING_FILES]
+    for setting_key, setting_value in trust_settings:
+        if setting_key in _TRUST_FILE_KEYS:
+            trust_files.append(os.path.expanduser(setting_value))
+    trust_state = [trust_settings, [_file_stat(trust_file) for trust_file in trust_files]]
+    return hashlib.sha256(json.dumps(trust_state).encode()).hexdigest()
+
+
+def _trust_settings(git_dir):
+    command = ("git", f"--git-dir={git_dir}", "config", "--get-regexp", _TRUST_CONFIG_REGEX)
+    git_config = subprocess.run(command, capture_output=True, check=False)  # noqa: S603
+    GIT_COUNTERS.update(calls=1, bytes_read=len(git_config.stdout))
+    setting_lines = sorted(git_config.stdout.decode("utf-8", "replace").splitlines())
+    return [setting_line.partition(" ")[::2] for setting_line in setting_lines]
+
+
+def verify_signatures(git_dir, hexshas, *, jobs=1):
+    take_chunk = functools.partial(_take_chunk, iter(hexshas), VERIFY_CHUNK_SIZE)
+    chunks = list(iter(take_chunk, []))
+    signatures = {}
+    with ThreadPoolExecutor(max_workers=max(1, min(jobs, len(chunks)))) as executor:
+        for chunk_signatures in executor.map(functools.partial(_verify_chunk, git_dir), chunks):
+            signatures.update(chunk_signatures)
+    return signatures
+
+
+def attach_signatures(commits, git_dir, *, parents_counts, jobs=1):
+    signature_cache = _open_signature_cache(git_dir)
+    take_batch = functools.partial(_take_chunk, iter(commits), VERIFY_BATCH_SIZE)
+    with contextlib.ExitStack() as stack:
+        if signature_cache:
+            stack.callback(signature_cache.close)
+        for batch in iter(take_batch, []):
+            hexshas = [commit.hexsha for commit in batch if commit.parents_count in parents_counts]
+            signatures = _load_signatures(git_dir, signature_cache, hexshas, jobs=jobs)
+            for commit in batch:
+                commit.signature = signatures.get(commit.hexsha)
+            yield from batch
+
+
+def _take_chunk(iterator, chunk_size):
+    return list(itertools.islice(iterator, chunk_size))
+
+
+def _open_signature_cache(git_dir):
+    try:
+        return SignatureCache(git_dir, digest=trust_digest(git_dir))
+    except sqlite3.Error as err:
+        logging.warning("Cannot open signature cache. Error: %s", err)
+    return None
+
+
+def _load_signatures(git_dir, signature_cache, hexshas, *, jobs):
+    signatures = _cached_signatures(signature_cache, hexshas)
+    unknown_hexshas = [hexsha for hexsha in hexshas if hexsha not in signatures]
+    logging.debug("Found %d cached signatures, verify %d commits", len(signatures), len(unknown_hexshas))
+    if unknown_hexshas:
+        new_signatures = verify_signatures(git_dir, unknown_hexshas, jobs=jobs)
+        _update_cache(signature_cache, new_signatures)
+        signatures.update(new_signatures)
+    return signatures
+
+
+def _cached_signatures(signature_cache, hexshas):
+    if not signature_cache:
+        return {}
+    try:
+        return signature_cache.get(hexshas)
+    except sqlite3.Error as err:
+        logging.warning("Cannot read signature cache. Error: %s", err)
+    return {}
+
+
+def _update_cache(signature_cache, signatures):
+    if not signature_cache:
+        return
+    try:
+        signature_cache.update(signatures)
+    except sqlite3.Error as err:
+        logging.warning("Cannot update signature cache. Error: %s", err)
+
+
+def _file_stat(file_path):
+    try:
+        file_stat = os.stat(file_path)
+    except OSError:
+        return [file_path, None]
+    return [file_path, file_stat.st_mtime_ns, file_stat.st_size]
+
+
+def _verify_chunk(git_dir, hexshas):
+    command = ("git", f"--git-dir={git_dir}", "log", "--no-walk=unsorted", "--stdin", _VERIFY_FORMAT)
+    git_log = subprocess.run(  # noqa: S603
+        command,
+        input="".join(f"{hexsha}\n" for hexsha in hexshas).encode(),
+        capture_output=True,
+        check=True,
+    )
+    GIT_COUNTERS.update(calls=1, bytes_read=len(git_log.stdout))
+    signatures = {}
+    for line in git_log.stdout.decode("utf-8", "replace").splitlines():
+        hexsha, status, fingerprint, primary_fingerprint = line.split(_FIELD_SEPARATOR)
+        signatures[hexsha] = Signature(status, fingerprint, primary_fingerprint)
+    return signatures
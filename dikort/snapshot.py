@@ -0,0 +1,100 @@
+import hashlib
+import json
+import logging
+import os
+import re
+
+import dikort
+from dikort import config as config_module
+from dikort.cache import user_cache_dir
+
+SNAPSHOTS_DIRNAME = "config-snapshots"
+SNAPSHOTS_MAX_COUNT = 256
+_SNAPSHOT_SUFFIX = ".json"
+_REGEX_KEY = "__regex__"
+_FROZENSET_KEY = "__frozenset__"
+_LOGGER = logging.getLogger(__name__)
+
+
+def read_snapshot(argv):
+    try:
+        with open(_snapshot_path(argv)) as snapshot_fp:
+            snapshot = json.load(snapshot_fp, object_hook=_decode_setting)
+    except (OSError, ValueError) as err:
+        _LOGGER.debug("Config snapshot is not found. Error: %s", err)
+        return None
+    if snapshot["key"] != _snapshot_key(argv):
+        return None
+    config = snapshot["config"]
+    if snapshot["config_file"] != _config_file_stat(config["main"]["config"]):
+        _LOGGER.debug("Config file %s changed. Skip config snapshot.", config["main"]["config"])
+        return None
+    return config
+
+
+def write_snapshot(argv, config):
+    snapshot_path = _snapshot_path(argv)
+    snapshot = {
+        "key": _snapshot_key(argv),
+        "config_file": _config_file_stat(config["main"]["config"]),
+        "config": config,
+    }
+    try:
+        _store_snapshot(snapshot_path, snapshot)
+    except OSError as err:
+        _LOGGER.debug("Cannot write config snapshot. Error: %s", err)
+
+
+def _snapshot_key(argv):
+    return [dikort.__version__, _config_file_stat(config_module.__file__), os.getcwd(), list(argv)]
+
+
+def _snapshot_path(argv):
+    serialized_key = json.dumps(_snapshot_key(argv))
+    snapshot_name = hashlib.sha256(serialized_key.encode()).hexdigest()
+    return os.path.join(user_cache_dir(), SNAPSHOTS_DIRNAME, f"{snapshot_name}{_SNAPSHOT_SUFFIX}")
+
+
+def _config_file_stat(config_path):
+    try:
+        config_stat = os.stat(config_path)
+    except OSError:
+        return None
+    return [os.path.abspath(config_path), config_stat.st_mtime_ns, config_stat.st_size]
+
+
+def _store_snapshot(snapshot_path, snapshot):
+    snapshots_dir = os.path.dirname(snapshot_path)
+    temporary_path = f"{snapshot_path}.{os.getpid()}"
+    os.makedirs(snapshots_dir, exist_ok=True)
+    with open(temporary_path, "w") as snapshot_fp:
+        json.dump(snapshot, snapshot_fp, default=_encode_setting)
+    os.replace(temporary_path, snapshot_path)
+    _evict_snapshots(snapshots_dir)
+
+
+def _evict_snapshots(snapshots_dir):
+    snapshot_paths = [
+        os.path.join(snapshots_dir, snapshot_name)
+        for snapshot_name in os.listdir(snapshots_dir)
+        if snapshot_name.endswith(_SNAPSHOT_SUFFIX)
+    ]
+    snapshot_paths.sort(key=os.path.getmtime, reverse=True)
+    for evicted_path in snapshot_paths[SNAPSHOTS_MAX_COUNT:]:
+        os.remove(evicted_path)
+
+
+def _encode_setting(setting):
+    if isinstance(setting, frozenset):
+        return {_FROZENSET_KEY: sorted(setting)}
+    return {_REGEX_KEY: setting.pattern}
+
+
+def _decode_setting(json_object):
+    pattern = json_object.get(_REGEX_KEY)
+    if pattern is not None:
+        return re.compile(pattern)
+    fingerprints = json_object.get(_FROZENSET_KEY)
+    if fingerprints is not None:
+        return frozenset(fingerprints)
+    return json_object
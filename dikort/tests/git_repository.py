@@ -0,0 +1,12 @@
+import os
+import subprocess  # noqa: S404
+
+
+def run_git(repository_path, *git_args, commit_time=None):
+    environment = {**os.environ, "GIT_AUTHOR_NAME": "Neo", "GIT_AUTHOR_EMAIL": "neo@matrix.com"}
+    environment.update(GIT_COMMITTER_NAME="Neo", GIT_COMMITTER_EMAIL="neo@matrix.com")
+    if commit_time:
+        environment.update(GIT_AUTHOR_DATE=f"{commit_time} +0000", GIT_COMMITTER_DATE=f"{commit_time} +0000")
+    command = ("git", "-C", repository_path, *git_args)
+    git_run = subprocess.run(command, check=True, capture_output=True, env=environment, text=True)  # noqa: S603
+    return git_run.stdout.strip()
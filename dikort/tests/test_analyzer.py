@@ -1,63 +1,243 @@
 import copy
+import functools
+import io
+import sqlite3
 from unittest import TestCase
-from unittest.mock import MagicMock, Mock, patch
+from unittest.mock import ANY, MagicMock, Mock, patch
 
 from git.exc import GitCommandError, InvalidGitRepositoryError, NoSuchPathError
 
 from dikort.analyzer import (
+    FAST_PATH_MAX_COMMITS,
+    _check_commits,
+    _collect_violations,
+    _collect_violations_fast,
+    _enabled_checks,
+    _export_metrics,
     _finish,
-    _generic_check,
+    _open_commit_reader,
     _open_repository,
-    _process_failed_commits,
+    _open_watermark,
+    _read_pull_request_range,
+    _read_pushed_range,
+    _read_ref_tips,
+    _report_violations,
+    _required_fields,
+    _verdicts_from_violations,
+    _violations_from_verdicts,
+    _with_signatures,
     analyze_commits,
+    analyze_message,
 )
+from dikort.commits import CommitRecord
 from dikort.config import DEFAULTS, ERROR_EXIT_CODE, FAILED_EXIT_CODE
+from dikort.filters import filter_length
+from dikort.metrics import Metrics
+
+
+def _hexshas_by_rule(violations):
+    hexshas_by_rule = {}
+    for rule, commit in violations:
+        hexshas_by_rule.setdefault(rule, []).append(commit.hexsha)
+    return hexshas_by_rule
 
 
 class TestCheck(TestCase):
     @patch("dikort.analyzer.print_error")
     @patch("sys.exit")
-    def test_generic_check_fail(self, sys_exit_mock, print_error_mock):
+    def test_check_commits_fail(self, sys_exit_mock, print_error_mock):
         commit_range = MagicMock()
         commit_range.__iter__.side_effect = GitCommandError("test", 123)
-        _generic_check(commit_range, None, check_merge_commits=False)
+        list(_check_commits(commit_range, {}))
         print_error_mock.assert_called_once()
         sys_exit_mock.assert_called_once_with(ERROR_EXIT_CODE)
 
-    def test_generic_check_success(self):
+    def test_check_commits_success(self):
         commit_range = [Mock(), Mock(), Mock()]
         commit_range[1].good = True
         commit_range[2].good = True
-        commit_range[0].parents = []
-        commit_range[1].parents = [Mock()]
-        commit_range[2].parents = [Mock(), Mock()]
-        actual_result = _generic_check(commit_range, lambda commit: commit.good, check_merge_commits=False)
-        self.assertEqual(len(actual_result), 1)
-        actual_result = _generic_check(commit_range, lambda commit: commit.good, check_merge_commits=True)
-        self.assertEqual(len(actual_result), 1)
+        commit_range[0].parents_count = 0
+        commit_range[1].parents_count = 1
+        commit_range[2].parents_count = 2
+        checks = {
+            1: [("rule", lambda commit: commit.good)],
+            2: [("merge rule", lambda commit: commit.good)],
+        }
+        actual_result = list(_check_commits(commit_range, checks))
+        self.assertEqual(actual_result, [("rule", commit_range[1]), ("merge rule", commit_range[2])])
+
+    def test_check_commits_single_walk(self):
+        commit_range = MagicMock()
+        commit_range.__iter__.return_value = iter([])
+        checks = {1: [("rule", bool), ("another rule", bool)], 2: [("merge rule", bool)]}
+        self.assertEqual(list(_check_commits(commit_range, checks)), [])
+        commit_range.__iter__.assert_called_once()
+
+    def test_check_commits_lazy(self):
+        walked_commits = []
+
+        def commit_range():
+            for index in range(3):
+                walked_commits.append(index)
+                yield CommitRecord(str(index), 1, "Bad")
+
+        violations = _check_commits(commit_range(), {1: [("rule", bool)]})
+        self.assertEqual(walked_commits, [])
+        next(violations)
+        self.assertEqual(walked_commits, [0])
+
+    def test_check_commits_in_pool(self):  # noqa: WPS210
+        commit_range = [CommitRecord(str(index), index % 3, "A" * index) for index in range(10)]
+        checks = {
+            1: [("rule", functools.partial(filter_length, config={"min_length": 3, "max_length": 50}))],
+            2: [("merge rule", functools.partial(filter_length, config={"min_length": 6, "max_length": 50}))],
+        }
+        expected_result = _hexshas_by_rule(_check_commits(commit_range, checks))
+        with patch("dikort.parallel.CHUNK_SIZE", 2):
+            actual_result = _hexshas_by_rule(_check_commits(commit_range, checks, jobs=2))
+        self.assertEqual(actual_result, expected_result)
+        self.assertEqual(actual_result, {"rule": ["1"], "merge rule": ["2", "5"]})
+
+    def test_check_commits_in_pool_metrics(self):
+        commit_range = [CommitRecord(str(index), index % 3, "A" * index) for index in range(10)]
+        config = copy.deepcopy(DEFAULTS.copy())
+        config["rules"]["enable_length"] = True
+        metrics = Metrics()
+        checks = _enabled_checks(config, metrics)
+        with patch("dikort.parallel.CHUNK_SIZE", 2):
+            list(_check_commits(commit_range, checks, jobs=2, metrics=metrics))
+        self.assertEqual(metrics.rules["Summary length"].evaluated, 3)
+        self.assertEqual(metrics.rules["Summary length"].failed, 3)
+
+    def test_check_commits_max_violations(self):
+        walked_commits = []
+
+        def commit_range():
+            for index in range(10):
+                walked_commits.append(index)
+                yield CommitRecord(str(index), 1, "Bad" if index % 2 else "Good")
+
+        checks = {1: [("another rule", bool), ("rule", lambda commit: commit.summary == "Bad")]}
+        actual_result = _hexshas_by_rule(_check_commits(commit_range(), checks, max_violations=3))
+        self.assertEqual(walked_commits, [0, 1])
+        self.assertEqual(actual_result, {"another rule": ["0", "1"], "rule": ["1"]})
+
+        walked_commits.clear()
+        actual_result = _hexshas_by_rule(_check_commits(commit_range(), checks, max_violations=2))
+        self.assertEqual(walked_commits, [0, 1])
+        self.assertEqual(actual_result, {"another rule": ["0", "1"]})
+
+    def test_check_commits_in_pool_max_violations(self):
+        commit_range = [CommitRecord(str(index), 1, "A" * index) for index in range(10)]
+        checks = {1: [("rule", functools.partial(filter_length, config={"min_length": 50, "max_length": 50}))]}
+        with patch("dikort.parallel.CHUNK_SIZE", 2):
+            actual_result = _hexshas_by_rule(_check_commits(commit_range, checks, jobs=2, max_violations=3))
+        self.assertEqual(actual_result, {"rule": ["0", "1", "2"]})
+
+    @patch("dikort.parallel.wait")
+    @patch("dikort.parallel.ProcessPoolExecutor")
+    def test_check_commits_in_pool_cancel(self, executor_mock, wait_mock):  # noqa: WPS210
+        commit_range = [CommitRecord(str(index), 1, "Bad") for index in range(8)]
+        futures = [Mock() for _ in range(4)]
+        for future, commit in zip(futures, commit_range[::2]):
+            future.result.return_value = ([("rule", commit)], None)
+        pool_executor = executor_mock.return_value.__enter__.return_value
+        pool_executor.submit.side_effect = futures
+        with patch("dikort.parallel.CHUNK_SIZE", 2):
+            violations = _check_commits(commit_range, {1: [("rule", bool)]}, jobs=2, max_violations=1)
+            actual_result = _hexshas_by_rule(violations)
+        self.assertEqual(actual_result, {"rule": ["0"]})
+        for pending_future in futures[1:]:
+            pending_future.cancel.assert_called_once_with()
+        self.assertEqual(list(wait_mock.call_args[0][0]), futures[1:])
+
+    def test_enabled_checks(self):
+        config = copy.deepcopy(DEFAULTS.copy())
+        self.assertEqual(_enabled_checks(config), {})
+        config["rules"]["enable_length"] = True
+        config["merge_rules"]["enable_gpg"] = True
+        config["merge_rules"]["enable_regex"] = True
+        checks = _enabled_checks(config)
+        self.assertEqual([rule for rule, _ in checks[1]], ["Summary length"])
+        self.assertEqual([rule for rule, _ in checks[2]], ["GPG (merge commits)", "Regex (merge commits)"])
+
+    def test_enabled_checks_debug(self):
+        config = copy.deepcopy(DEFAULTS.copy())
+        config["rules"]["enable_length"] = True
+        commit = CommitRecord("aaa", 1, "Bad")
+        (_, predicate), *_ = _enabled_checks(config)[1]
+        self.assertIs(predicate.func, filter_length)
+
+        with self.assertLogs(level="DEBUG"):
+            (_, predicate), *_ = _enabled_checks(config)[1]
+            self.assertIs(predicate.func, filter_length)
+
+        config["logging"]["enabled"] = True
+        with self.assertLogs(level="DEBUG") as logs:
+            (_, logged_predicate), *_ = _enabled_checks(config)[1]
+            self.assertTrue(logged_predicate(commit))
+            self.assertIn("DEBUG:root:Check aaa commit for 'Summary length' rule", logs.output)
+
+    def test_enabled_checks_metrics(self):
+        config = copy.deepcopy(DEFAULTS.copy())
+        config["rules"]["enable_length"] = True
+        metrics = Metrics()
+        (_, timed_predicate), *_ = _enabled_checks(config, metrics)[1]
+        self.assertTrue(timed_predicate(CommitRecord("aaa", 1, "Bad")))
+        self.assertFalse(timed_predicate(CommitRecord("bbb", 1, "Good summary")))
+        self.assertEqual(metrics.rules["Summary length"].evaluated, 2)
+        self.assertEqual(metrics.rules["Summary length"].failed, 1)
+
+    def test_required_fields(self):
+        config = copy.deepcopy(DEFAULTS.copy())
+        config["rules"]["enable_length"] = True
+        self.assertEqual(_required_fields(config), frozenset())
+        config["rules"]["enable_signoff"] = True
+        config["merge_rules"]["enable_author_email_regex"] = True
+        self.assertEqual(_required_fields(config), frozenset(("message_tail", "author_email")))
 
 
 class TestAnalyzer(TestCase):
-    @patch("dikort.analyzer.print_error")
-    @patch("dikort.analyzer.print_success")
+    @patch("dikort.print.print_warning")
+    def test_export_metrics(self, print_warning_mock):
+        metrics = Mock()
+        _export_metrics(None, {"profile": True, "metrics_file": "metrics.json"})
+        _export_metrics(metrics, {"profile": True, "metrics_file": ""})
+        metrics.print_profile.assert_called_once_with()
+        self.assertEqual(metrics.write.call_count, 0)
+
+        metrics.reset_mock()
+        metrics.write.side_effect = PermissionError()
+        _export_metrics(metrics, {"profile": False, "metrics_file": "metrics.json", "format": "text"})
+        self.assertEqual(metrics.print_profile.call_count, 0)
+        metrics.write.assert_called_once_with("metrics.json")
+        print_warning_mock.assert_called_once()
+
+        with self.assertLogs(level="WARNING"):
+            _export_metrics(metrics, {"profile": False, "metrics_file": "metrics.json", "format": "sarif"})
+        print_warning_mock.assert_called_once()
+
     @patch("sys.exit")
-    def test_finish(self, sys_exit_mock, print_success_mock, print_error_mock):
-        _finish(True)
+    def test_finish(self, sys_exit_mock):
+        reporter = Mock()
+        _finish(True, reporter)
         self.assertEqual(sys_exit_mock.call_count, 0)
-        self.assertEqual(print_error_mock.call_count, 0)
-        print_success_mock.assert_called_once()
+        reporter.finish.assert_called_once_with(True, stopped_early=False)
 
-        print_success_mock.reset_mock()
-        _finish(False)
-        self.assertEqual(print_success_mock.call_count, 0)
-        print_error_mock.assert_called_once()
+        reporter.reset_mock()
+        _finish(False, reporter, stopped_early=True)
+        reporter.finish.assert_called_once_with(False, stopped_early=True)
         sys_exit_mock.assert_called_once_with(FAILED_EXIT_CODE)
 
     @patch("sys.exit")
+    @patch("dikort.print.print_warning")
     @patch("dikort.analyzer.print_error")
-    @patch("dikort.analyzer.Repo")
-    def test_open_repository(self, repo_mock, print_error_mock, sys_exit_mock):
-        config = {"main": {"repository": "./"}}
+    @patch("dikort.analyzer.has_commit_graph")
+    @patch("git.Repo")
+    def test_open_repository(  # noqa: WPS211
+        self, repo_mock, has_commit_graph_mock, print_error_mock, print_warning_mock, sys_exit_mock
+    ):
+        config = {"main": {"repository": "./", "format": "text"}}
         repo_mock.side_effect = NoSuchPathError()
         _open_repository(config)
         print_error_mock.assert_called_once()
@@ -73,39 +253,346 @@ class TestAnalyzer(TestCase):
         repo_mock.side_effect = None
         print_error_mock.reset_mock()
         sys_exit_mock.reset_mock()
-        _open_repository(config)
+        has_commit_graph_mock.return_value = True
+        self.assertIs(_open_repository(config), repo_mock.return_value)
         repo_mock.assert_called_with(config["main"]["repository"])
         self.assertEqual(sys_exit_mock.call_count, 0)
         self.assertEqual(print_error_mock.call_count, 0)
+        self.assertEqual(print_warning_mock.call_count, 0)
 
-    @patch("dikort.analyzer.print_error")
-    @patch("dikort.analyzer.print_success")
-    def test_process_failed_commits(self, print_success_mock, print_error_mock):
-        _process_failed_commits([], "rule")
-        self.assertEqual(print_error_mock.call_count, 0)
-        print_success_mock.assert_called_once()
+        has_commit_graph_mock.return_value = False
+        _open_repository(config)
+        print_warning_mock.assert_called_once()
 
-        print_success_mock.reset_mock()
-        _process_failed_commits([Mock()], "rule")
-        self.assertEqual(print_success_mock.call_count, 0)
-        print_error_mock.assert_called_once()
+        config["main"]["format"] = "jsonl"
+        with self.assertLogs(level="WARNING"):
+            _open_repository(config)
+        print_warning_mock.assert_called_once()
+
+    @patch("dikort.print.print_warning")
+    @patch("dikort.packs.open_pack_reader")
+    def test_open_commit_reader(self, open_pack_reader_mock, print_warning_mock):
+        config = copy.deepcopy(DEFAULTS.copy())
+        repo = Mock()
+        self.assertIs(_open_commit_reader(repo, config).repo, repo)
+        open_pack_reader_mock.assert_not_called()
+
+        config["main"]["backend"] = "mmap"
+        self.assertEqual(_open_commit_reader(repo, config), open_pack_reader_mock.return_value)
+        open_pack_reader_mock.assert_called_once_with(repo.git_dir, config["main"]["range"])
+
+        open_pack_reader_mock.side_effect = OSError("Permission denied")
+        self.assertIs(_open_commit_reader(repo, config).repo, repo)
+        print_warning_mock.assert_called_once()
+
+    def test_report_violations(self):
+        reporter = Mock()
+        self.assertEqual(_report_violations(iter([]), ["rule"], reporter), 0)
+        self.assertEqual(reporter.report_violation.call_count, 0)
+
+        commit = CommitRecord("aaa", 1, "Bad")
+        self.assertEqual(_report_violations(iter([("rule", commit)]), ["rule"], reporter), 1)
+        reporter.report_violation.assert_called_once_with("rule", commit)
 
     @patch("dikort.analyzer._open_repository")
-    @patch("dikort.analyzer._generic_check")
-    @patch("dikort.analyzer._process_failed_commits")
+    @patch("dikort.commits.iter_commits")
+    @patch("dikort.analyzer._check_commits")
     @patch("dikort.analyzer._finish")
-    def test_analyze(
+    def test_analyze(  # noqa: WPS211
         self,
         _finish_mock,
-        _process_failed_commits_mock,
-        _generic_check_mock,
+        _check_commits_mock,
+        iter_commits_mock,
         _open_repository_mock,
     ):
         config = copy.deepcopy(DEFAULTS.copy())
         config["rules"]["enable_length"] = True
+        config["rules"]["enable_gpg"] = True
         repo = Mock()
         _open_repository_mock.return_value = repo
-        _generic_check_mock.return_value = []
-        _process_failed_commits_mock.return_value = False
+        _check_commits_mock.return_value = iter([("GPG", CommitRecord("aaa", 1, "Good summary"))])
+        with patch("dikort.analyzer.read_commits", return_value=None):
+            analyze_commits(config)
+        iter_commits_mock.assert_called_once_with(
+            repo,
+            config["main"]["range"],
+            frozenset(("has_signature",)),
+            frozenset((1,)),
+        )
+        _finish_mock.assert_called_with(False, ANY, False)
+
+    @patch("dikort.analyzer._open_repository")
+    @patch("dikort.watermark.Watermark")
+    @patch("dikort.analyzer._collect_violations")
+    @patch("dikort.analyzer._finish")
+    def test_analyze_incremental(
+        self,
+        _finish_mock,
+        _collect_violations_mock,
+        watermark_mock,
+        _open_repository_mock,
+    ):
+        config = copy.deepcopy(DEFAULTS.copy())
+        config["main"]["incremental"] = True
+        config["rules"]["enable_length"] = True
+        watermark = watermark_mock.return_value
+        watermark.commit_range.return_value = "aaa..bbb"
+        _collect_violations_mock.return_value = iter([])
+        analyze_commits(config)
+        actual_config = _collect_violations_mock.call_args[0][1]
+        self.assertEqual(actual_config["main"]["range"], "aaa..bbb")
+        self.assertEqual(config["main"]["range"], DEFAULTS["main"]["range"])
+        watermark.update.assert_called_once()
+        _finish_mock.assert_called_with(True, ANY, False)
+
+        watermark.reset_mock()
+        _collect_violations_mock.return_value = iter([("Summary length", CommitRecord("aaa", 1, "Bad"))])
         analyze_commits(config)
-        _finish_mock.assert_called_with(False)
+        self.assertEqual(watermark.update.call_count, 0)
+        _finish_mock.assert_called_with(False, ANY, False)
+
+    @patch("dikort.analyzer.read_commits")
+    @patch("dikort.analyzer._finish")
+    def test_analyze_pre_receive(self, _finish_mock, read_commits_mock):
+        config = copy.deepcopy(DEFAULTS.copy())
+        config["main"]["pre_receive"] = True
+        config["rules"]["enable_length"] = True
+        read_commits_mock.return_value = [CommitRecord("bbb", 1, "Good summary")]
+        ref_updates = io.StringIO("aaa bbb refs/heads/main\n0000 bbb refs/heads/copy\nccc 0000 refs/heads/gone\n")
+        with patch("sys.stdin", ref_updates):
+            analyze_commits(config)
+        self.assertEqual(read_commits_mock.call_args[0][1], ("bbb", "--not", "--all"))
+        _finish_mock.assert_called_with(True, ANY, False)
+
+    @patch("dikort.analyzer.read_commits")
+    @patch("sys.exit")
+    def test_analyze_fail_fast(self, sys_exit_mock, read_commits_mock):
+        config = copy.deepcopy(DEFAULTS.copy())
+        config["main"]["fail_fast"] = True
+        config["rules"]["enable_capitalized_summary"] = True
+        config["rules"]["enable_trailing_period"] = True
+        read_commits_mock.return_value = [CommitRecord("aaa", 1, "bad"), CommitRecord("bbb", 1, "worse")]
+        stdout = io.StringIO()
+        with patch("sys.stdout", stdout):
+            analyze_commits(config)
+        self.assertEqual(stdout.getvalue().count("Hash: "), 1)
+        self.assertIn("NOT CHECKED", stdout.getvalue())
+        self.assertIn("Checks stopped early", stdout.getvalue())
+        sys_exit_mock.assert_called_once_with(FAILED_EXIT_CODE)
+
+    @patch("dikort.pullrequest.pull_request_range")
+    @patch("dikort.analyzer.read_commits")
+    @patch("dikort.analyzer._finish")
+    def test_analyze_pr_base(self, _finish_mock, read_commits_mock, pull_request_range_mock):
+        config = copy.deepcopy(DEFAULTS.copy())
+        config["main"]["pr_base"] = "origin/main"
+        config["rules"]["enable_length"] = True
+        pull_request_range_mock.return_value = ("HEAD", "--not", "aaa")
+        read_commits_mock.return_value = []
+        analyze_commits(config)
+        pull_request_range_mock.assert_called_once_with(config["main"]["repository"], "origin/main")
+        self.assertEqual(read_commits_mock.call_args[0][1], ("HEAD", "--not", "aaa"))
+
+    @patch("dikort.refs.attribute_refs")
+    @patch("dikort.refs.read_ref_tips")
+    @patch("dikort.analyzer.read_commits")
+    @patch("dikort.analyzer._finish")
+    def test_analyze_all_refs(self, _finish_mock, read_commits_mock, read_ref_tips_mock, attribute_refs_mock):
+        config = copy.deepcopy(DEFAULTS.copy())
+        config["main"]["all_refs"] = True
+        config["main"]["refs_glob"] = "refs/heads"
+        config["rules"]["enable_length"] = True
+        read_ref_tips_mock.return_value = {"refs/heads/main": "aaa", "refs/heads/copy": "aaa", "refs/heads/side": "bbb"}
+        failed_commit = CommitRecord("ccc", 1, "Bad")
+        read_commits_mock.return_value = [CommitRecord("aaa", 1, "Good summary"), failed_commit]
+        analyze_commits(config)
+        read_ref_tips_mock.assert_called_once_with(config["main"]["repository"], "refs/heads")
+        self.assertEqual(read_commits_mock.call_args[0][1], ("aaa", "bbb"))
+        attribute_refs_mock.assert_called_once_with(
+            [failed_commit], config["main"]["repository"], read_ref_tips_mock.return_value
+        )
+        _finish_mock.assert_called_with(False, ANY, False)
+
+    @patch("dikort.analyzer.print_error")
+    @patch("sys.exit")
+    def test_read_ref_tips_error(self, sys_exit_mock, print_error_mock):
+        _read_ref_tips({"repository": "/no/such/repository", "refs_glob": ""})
+        sys_exit_mock.assert_called_once_with(ERROR_EXIT_CODE)
+        print_error_mock.assert_called_once()
+
+    @patch("dikort.analyzer.print_error")
+    @patch("sys.exit")
+    def test_read_pull_request_range_error(self, sys_exit_mock, print_error_mock):
+        _read_pull_request_range({"repository": "/no/such/repository", "pr_base": "main"})
+        sys_exit_mock.assert_called_once_with(ERROR_EXIT_CODE)
+        print_error_mock.assert_called_once()
+
+    @patch("dikort.analyzer.print_error")
+    @patch("sys.exit")
+    def test_read_pushed_range_error(self, sys_exit_mock, print_error_mock):
+        with patch("sys.stdin", io.StringIO("garbage\n")):
+            _read_pushed_range()
+        sys_exit_mock.assert_called_once_with(ERROR_EXIT_CODE)
+        print_error_mock.assert_called_once()
+
+    @patch("dikort.print.print_warning")
+    @patch("dikort.watermark.Watermark")
+    def test_open_watermark_detached(self, watermark_mock, print_warning_mock):
+        watermark_mock.side_effect = TypeError("HEAD is a detached symbolic reference")
+        self.assertIsNone(_open_watermark(Mock(), {"format": "text"}))
+        print_warning_mock.assert_called_once()
+
+        with self.assertLogs(level="WARNING"):
+            self.assertIsNone(_open_watermark(Mock(), {"format": "jsonl"}))
+        print_warning_mock.assert_called_once()
+
+    @patch("dikort.analyzer._open_repository")
+    @patch("dikort.analyzer.read_commits")
+    @patch("dikort.analyzer._finish")
+    def test_analyze_fast_path(self, _finish_mock, read_commits_mock, _open_repository_mock):
+        config = copy.deepcopy(DEFAULTS.copy())
+        config["rules"]["enable_length"] = True
+        read_commits_mock.return_value = [CommitRecord("a", 1, "Good summary"), CommitRecord("b", 1, "Bad")]
+        analyze_commits(config)
+        read_commits_mock.assert_called_once_with(
+            config["main"]["repository"],
+            config["main"]["range"],
+            frozenset(),
+            frozenset((1,)),
+            max_count=FAST_PATH_MAX_COMMITS,
+        )
+        self.assertEqual(_open_repository_mock.call_count, 0)
+        _finish_mock.assert_called_with(False, ANY, False)
+
+        config["main"]["cache"] = True
+        read_commits_mock.reset_mock()
+        self.assertIsNone(_collect_violations_fast(config, _enabled_checks(config)))
+        self.assertEqual(read_commits_mock.call_count, 0)
+
+    @patch("dikort.analyzer._open_repository")
+    @patch("dikort.analyzer.read_message_commit")
+    @patch("dikort.analyzer._finish")
+    @patch("sys.stdout", new_callable=io.StringIO)
+    def test_analyze_message(self, stdout_mock, _finish_mock, read_message_commit_mock, _open_repository_mock):
+        config = copy.deepcopy(DEFAULTS.copy())
+        config["main"]["message_file"] = "-"
+        config["main"]["format"] = "jsonl"
+        for rule_param in ("enable_length", "enable_gpg", "enable_author_email_regex"):
+            config["rules"][rule_param] = True
+        config["merge_rules"]["enable_length"] = True
+        read_message_commit_mock.return_value = CommitRecord("0", 1, "Bad", message_tail="", author_name="Author")
+        analyze_message(config)
+        read_message_commit_mock.assert_called_once_with("-")
+        self.assertEqual(_open_repository_mock.call_count, 0)
+        reporter = _finish_mock.call_args[0][1]
+        _finish_mock.assert_called_once_with(False, reporter)
+        self.assertIn('"rule": "Summary length"', stdout_mock.getvalue())
+        self.assertEqual(len(stdout_mock.getvalue().splitlines()), 1)
+
+    @patch("dikort.analyzer._finish")
+    @patch("sys.stdout", new_callable=io.StringIO)
+    def test_analyze_empty_message(self, stdout_mock, _finish_mock):
+        config = copy.deepcopy(DEFAULTS.copy())
+        config["main"]["message_file"] = "-"
+        config["rules"]["enable_capitalized_summary"] = True
+        with patch("sys.stdin", io.StringIO("# Please enter the commit message for your changes.\n\n")):
+            analyze_message(config)
+        self.assertEqual(_finish_mock.call_count, 0)
+        self.assertEqual(stdout_mock.getvalue(), "")
+
+    @patch("dikort.analyzer._open_repository")
+    @patch("dikort.analyzer._check_commits")
+    @patch("dikort.analyzer._finish")
+    def test_analyze_nothing_enabled(self, _finish_mock, _check_commits_mock, _open_repository_mock):
+        config = copy.deepcopy(DEFAULTS.copy())
+        analyze_commits(config)
+        self.assertEqual(_check_commits_mock.call_count, 0)
+        _finish_mock.assert_called_with(True, ANY, False)
+
+    @patch("dikort.signatures.attach_signatures")
+    def test_with_signatures(self, attach_signatures_mock):
+        config = copy.deepcopy(DEFAULTS.copy())
+        commits = [CommitRecord("a", 1, "Good summary")]
+        config["rules"]["enable_gpg"] = True
+        self.assertIs(_with_signatures(commits, ".git", config), commits)
+
+        config["merge_rules"]["enable_gpg"] = True
+        config["merge_rules.settings"]["gpg"] = "verified"
+        _with_signatures(commits, ".git", config)
+        attach_signatures_mock.assert_called_once_with(commits, ".git", parents_counts=frozenset((2,)), jobs=1)
+        self.assertIsNone(_collect_violations_fast(config, _enabled_checks(config)))
+
+
+class TestVerdicts(TestCase):
+    def test_verdicts_from_violations(self):
+        violations = [
+            ("another rule", CommitRecord("a", 1, "First")),
+            ("rule", CommitRecord("b", 1, "Second")),
+            ("another rule", CommitRecord("b", 1, "Second")),
+        ]
+        actual_result = _verdicts_from_violations(["a", "b", "c"], violations, ["rule", "another rule"])
+        self.assertEqual(actual_result, {"a": (2, "First"), "b": (3, "Second"), "c": (0, "")})
+
+    def test_violations_from_verdicts(self):
+        verdicts = {"a": (2, "First"), "b": (3, "Second"), "c": (0, "")}
+        commit_parents = [("b", 1), ("a", 1), ("c", 2)]
+        violations = list(_violations_from_verdicts(commit_parents, verdicts, ["rule", "another rule"]))
+        self.assertEqual(_hexshas_by_rule(violations), {"rule": ["b"], "another rule": ["b", "a"]})
+        self.assertEqual(violations[0][1].summary, "Second")
+
+    @patch("dikort.cache.VerdictCache")
+    def test_collect_violations_cached(self, verdict_cache_mock):
+        config = copy.deepcopy(DEFAULTS.copy())
+        config["main"]["cache"] = True
+        checks = {1: [("rule", lambda commit: commit.summary == "Bad")]}
+        verdict_cache = verdict_cache_mock.return_value
+        verdict_cache.get.return_value = {"a": (1, "Bad"), "b": (0, "")}
+        reader = Mock()
+        reader.iter_commit_parents.return_value = iter([("c", 1), ("b", 1), ("a", 1)])
+        reader.load_commits.return_value = iter([CommitRecord("c", 1, "Bad")])
+        actual_result = _hexshas_by_rule(_collect_violations(reader, config, checks))
+        self.assertEqual(actual_result, {"rule": ["c", "a"]})
+        reader.load_commits.assert_called_once_with(["c"], frozenset())
+        verdict_cache.update.assert_called_once_with({"c": (1, "Bad")})
+        verdict_cache.close.assert_called_once()
+
+        config["main"]["fail_fast"] = True
+        verdict_cache.reset_mock()
+        verdict_cache.get.return_value = {"a": (1, "Bad"), "b": (0, "")}
+        reader.iter_commit_parents.return_value = iter([("c", 1), ("b", 1), ("a", 1)])
+        reader.load_commits.return_value = iter([CommitRecord("c", 1, "Bad")])
+        _collect_violations(reader, config, checks)
+        self.assertEqual(verdict_cache.update.call_count, 0)
+
+    @patch("dikort.cache.VerdictCache")
+    def test_collect_violations_cached_max_violations(self, verdict_cache_mock):
+        config = copy.deepcopy(DEFAULTS.copy())
+        config["main"]["cache"] = True
+        config["main"]["max_violations"] = 2
+        checks = {1: [("rule", lambda commit: commit.summary == "Bad")]}
+        verdict_cache = verdict_cache_mock.return_value
+        verdict_cache.get.return_value = {"b": (1, "Bad"), "c": (1, "Bad"), "d": (1, "Bad")}
+        reader = Mock()
+        reader.iter_commit_parents.return_value = iter([("a", 1), ("b", 1), ("c", 1), ("d", 1)])
+        reader.load_commits.return_value = iter([CommitRecord("a", 1, "Good")])
+        actual_result = _hexshas_by_rule(_collect_violations(reader, config, checks))
+        self.assertEqual(actual_result, {"rule": ["b", "c"]})
+
+        config["main"]["fail_fast"] = True
+        verdict_cache.get.return_value = {"b": (1, "Bad"), "c": (1, "Bad"), "d": (1, "Bad")}
+        reader.iter_commit_parents.return_value = iter([("a", 1), ("b", 1), ("c", 1), ("d", 1)])
+        reader.load_commits.return_value = iter([CommitRecord("a", 1, "Good")])
+        actual_result = _hexshas_by_rule(_collect_violations(reader, config, checks))
+        self.assertEqual(actual_result, {"rule": ["b"]})
+
+    @patch("dikort.print.print_warning")
+    @patch("dikort.cache.VerdictCache")
+    def test_collect_violations_cache_error(self, verdict_cache_mock, print_warning_mock):
+        config = copy.deepcopy(DEFAULTS.copy())
+        config["main"]["cache"] = True
+        verdict_cache_mock.side_effect = sqlite3.OperationalError("readonly")
+        reader = Mock()
+        reader.iter_commits.return_value = iter([CommitRecord("a", 1, "Bad")])
+        actual_result = _hexshas_by_rule(_collect_violations(reader, config, {1: [("rule", bool)]}))
+        print_warning_mock.assert_called_once()
+        self.assertEqual(actual_result, {"rule": ["a"]})
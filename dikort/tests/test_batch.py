@@ -0,0 +1,117 @@
+import copy
+import io
+import json
+import os
+import sys
+import tempfile
+from unittest import TestCase
+from unittest.mock import patch
+from xml.etree import ElementTree  # noqa: S405
+
+from dikort.batch import (
+    BATCH_REPORTERS,
+    check_repositories,
+    check_repositories_from,
+    check_repository,
+    read_repositories,
+)
+from dikort.config import DEFAULTS, ERROR_EXIT_CODE
+
+REPOSITORIES_RESULTS = (
+    ("first", 0, ""),
+    ("second", 1, '{"rule": "Summary length", "hexsha": "aaa", "summary": "Bad"}\n'),
+    ("third", ERROR_EXIT_CODE, "Cannot open git repo at third\n"),
+)
+
+
+def _fake_analyze_commits(config):
+    print("checked", config["main"]["repository"], config["main"]["jobs"])
+    if config["main"]["repository"] != "good":
+        sys.exit(1)
+
+
+class TestBatch(TestCase):
+    def setUp(self):
+        self.config = copy.deepcopy(DEFAULTS.copy())
+        self.config["main"]["jobs"] = 2
+
+    @patch("dikort.batch.analyze_commits", _fake_analyze_commits)
+    def test_check_repository(self):
+        self.assertEqual(check_repository(self.config, "good"), (0, "checked good 1\n"))
+        self.assertEqual(check_repository(self.config, "bad"), (1, "checked bad 1\n"))
+
+    @patch("dikort.batch.ProcessPoolExecutor")
+    @patch("dikort.batch.analyze_commits", _fake_analyze_commits)
+    def test_check_repositories(self, executor_mock):
+        executor = executor_mock.return_value.__enter__.return_value
+        executor.map.side_effect = map
+        repositories_results = list(check_repositories(self.config, ["good", "bad"]))
+        self.assertEqual(repositories_results, [("good", (0, "checked good 1\n")), ("bad", (1, "checked bad 1\n"))])
+        executor_mock.assert_called_once_with(max_workers=2)
+
+    def test_read_repositories(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            for repository_name in ("b", "a", "c.txt"):
+                os.mkdir(os.path.join(tmp_dir, repository_name))
+            lines = ["# comment\n", "\n", "./plain\n", os.path.join(tmp_dir, "?\n"), "./plain\n", "/no/match/*\n"]
+            expected_paths = ["./plain", os.path.join(tmp_dir, "a"), os.path.join(tmp_dir, "b")]
+            self.assertEqual(read_repositories(lines), expected_paths)
+
+    @patch("dikort.batch.check_repositories")
+    @patch("sys.stdout", new_callable=io.StringIO)
+    @patch("sys.stdin", io.StringIO("good\nbad\n"))
+    @patch("sys.exit")
+    def test_check_repositories_from(self, sys_exit_mock, stdout_mock, check_repositories_mock):
+        check_repositories_mock.return_value = iter([("good", (0, "")), ("bad", (1, ""))])
+        self.config["main"]["repositories_from"] = "-"
+        check_repositories_from(self.config)
+        check_repositories_mock.assert_called_once_with(self.config, ["good", "bad"])
+        sys_exit_mock.assert_called_once_with(1)
+        self.assertIn("[bad]", stdout_mock.getvalue())
+
+    @patch("dikort.batch.print_error")
+    @patch("sys.exit")
+    def test_check_repositories_from_error(self, sys_exit_mock, print_error_mock):
+        sys_exit_mock.side_effect = SystemExit
+        self.config["main"]["repositories_from"] = "/no/such/file"
+        with self.assertRaises(SystemExit):
+            check_repositories_from(self.config)
+        sys_exit_mock.assert_called_once_with(ERROR_EXIT_CODE)
+        print_error_mock.assert_called_once()
+
+
+class TestBatchReporters(TestCase):
+    def test_text(self):
+        stream = io.StringIO()
+        BATCH_REPORTERS["text"](iter(REPOSITORIES_RESULTS), stream)
+        self.assertIn("Repository second", stream.getvalue())
+        self.assertIn("Cannot open git repo at third", stream.getvalue())
+        self.assertIn("(exit 128)", stream.getvalue().splitlines()[-1])
+
+    def test_jsonl(self):
+        stream = io.StringIO()
+        BATCH_REPORTERS["jsonl"](iter(REPOSITORIES_RESULTS), stream)
+        records = [json.loads(line) for line in stream.getvalue().splitlines()]
+        self.assertEqual(records[0], {"repository": "first", "exit_code": 0, "messages": []})
+        self.assertEqual(
+            records[1], {"repository": "second", "rule": "Summary length", "hexsha": "aaa", "summary": "Bad"}
+        )
+        self.assertEqual(records[3]["messages"], ["Cannot open git repo at third"])
+
+    def test_sarif(self):
+        stream = io.StringIO()
+        repositories_results = [("first", 1, json.dumps({"runs": [{"results": [{"ruleId": "rule"}]}]}))]
+        BATCH_REPORTERS["sarif"](iter([*repositories_results, REPOSITORIES_RESULTS[2]]), stream)
+        sarif_runs = json.loads(stream.getvalue())["runs"]
+        self.assertEqual(sarif_runs[0]["results"], [{"ruleId": "rule"}])
+        self.assertEqual(sarif_runs[0]["invocations"][0]["exitCode"], 1)
+        self.assertFalse(sarif_runs[1]["invocations"][0]["executionSuccessful"])
+
+    def test_junit(self):
+        stream = io.StringIO()
+        repositories_results = [("first", 0, '<?xml version="1.0" encoding="utf-8"?>\n<testsuite tests="2" />\n')]
+        BATCH_REPORTERS["junit"](iter([*repositories_results, REPOSITORIES_RESULTS[2]]), stream)
+        test_suites = ElementTree.fromstring(stream.getvalue().split("\n", 1)[1])  # noqa: S314
+        self.assertEqual([test_suite.get("name") for test_suite in test_suites], ["first", "third"])
+        self.assertEqual(test_suites[0].get("tests"), "2")
+        self.assertEqual(test_suites[1].get("errors"), "1")
@@ -0,0 +1,61 @@
+import copy
+import re
+import tempfile
+from unittest import TestCase
+
+from dikort.cache import VerdictCache, config_digest
+from dikort.config import DEFAULTS
+
+
+class TestConfigDigest(TestCase):
+    def test_config_digest(self):
+        config = copy.deepcopy(DEFAULTS.copy())
+        config["rules.settings"]["regex"] = re.compile(".*")
+        digest = config_digest(config)
+        self.assertEqual(digest, config_digest(copy.deepcopy(config)))
+
+        config["main"]["range"] = "HEAD~10..HEAD"
+        config["logging"]["enabled"] = True
+        self.assertEqual(digest, config_digest(config))
+
+        config["merge_rules.settings"]["max_length"] = 72
+        self.assertNotEqual(digest, config_digest(config))
+
+        config["merge_rules.settings"]["max_length"] = DEFAULTS["merge_rules.settings"]["max_length"]
+        config["rules.settings"]["regex"] = re.compile("DEV-.*")
+        self.assertNotEqual(digest, config_digest(config))
+
+        config["rules.settings"]["trusted_keys"] = frozenset(("B", "A"))
+        digest = config_digest(config)
+        config["rules.settings"]["trusted_keys"] = frozenset(("A", "B"))
+        self.assertEqual(digest, config_digest(config))
+        config["rules.settings"]["trusted_keys"] = frozenset(("A",))
+        self.assertNotEqual(digest, config_digest(config))
+
+
+class TestVerdictCache(TestCase):
+    def setUp(self):
+        self.git_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.git_dir.cleanup()
+
+    def test_get_update(self):
+        verdict_cache = VerdictCache(self.git_dir.name, digest="digest", max_size=10)
+        self.assertEqual(verdict_cache.get(["a", "b"]), {})
+        verdict_cache.update({"a": (0, ""), "b": (3, "Bad commit")})
+        self.assertEqual(verdict_cache.get(["a", "b", "c"]), {"a": (0, ""), "b": (3, "Bad commit")})
+        verdict_cache.close()
+
+        verdict_cache = VerdictCache(self.git_dir.name, digest="another digest", max_size=10)
+        self.assertEqual(verdict_cache.get(["a", "b"]), {})
+        verdict_cache.close()
+
+    def test_eviction(self):
+        verdict_cache = VerdictCache(self.git_dir.name, digest="digest", max_size=2)
+        verdict_cache.update({"a": (0, "")})
+        verdict_cache.update({"b": (0, "")})
+        verdict_cache.get(["a"])
+        verdict_cache.update({"c": (0, "")})
+        self.assertEqual(set(verdict_cache.get(["a", "b", "c"])), {"a", "c"})
+        verdict_cache.close()
@@ -0,0 +1,226 @@
+import io
+import os
+import tempfile
+import types
+from unittest import TestCase
+from unittest.mock import Mock, patch
+
+from git.exc import GitCommandError
+
+from dikort.commits import (
+    GIT_COUNTERS,
+    CommitRecord,
+    _parse_formatted_commit,
+    _parse_raw_commit,
+    _split_records,
+    has_commit_graph,
+    iter_commit_parents,
+    iter_commits,
+    load_commits,
+    read_commits,
+)
+
+SIGNED_HEXSHA = b"0c3689a2b2f0e3e9b1b4f2c6c2e0c9d8a5a3f1e0"
+MERGE_HEXSHA = b"2aec0556ec024cc1342c7ecad42e6ec4425ba523"
+SIGNED_COMMIT_OBJECT = (
+    b"tree 4b825dc642cb6eb9a060e54bf8d69288fbee4904\n"
+    b"parent 2aec0556ec024cc1342c7ecad42e6ec4425ba523\n"
+    b"author Pavel Sapezhko <me@weastur.com> 1700000000 +0000\n"
+    b"committer Pavel Sapezhko <me@weastur.com> 1700000000 +0000\n"
+    b"gpgsig -----BEGIN PGP SIGNATURE-----\n"
+    b" abc\n"
+    b" -----END PGP SIGNATURE-----\n"
+    b"\n"
+    b"Signed commit\n"
+    b"\n"
+    b"Signed-off-by: Neo\n"
+)
+MERGE_COMMIT_OBJECT = (
+    b"tree 4b825dc642cb6eb9a060e54bf8d69288fbee4904\n"
+    b"parent 5305125a957861e173772d5cd6b40159a77908bb\n"
+    b"parent a363b95c500bdfa1dc1aab51e0f595723cdbebc0\n"
+    b"author Neo <neo@matrix.com> 1700000000 +0000\n"
+    b"committer Neo <neo@matrix.com> 1700000000 +0000\n"
+    b"\n"
+    b"Merge branch 'side'\n"
+)
+RAW_SIGNED_COMMIT = SIGNED_HEXSHA + b"\n" + SIGNED_COMMIT_OBJECT
+RAW_MERGE_COMMIT = MERGE_HEXSHA + b"\n" + MERGE_COMMIT_OBJECT
+COMMIT_OBJECTS = types.MappingProxyType(
+    {
+        SIGNED_HEXSHA.decode(): SIGNED_COMMIT_OBJECT,
+        MERGE_HEXSHA.decode(): MERGE_COMMIT_OBJECT,
+    }
+)
+
+
+def _get_object_data(hexsha):
+    object_bytes = COMMIT_OBJECTS[hexsha]
+    return hexsha, "commit", len(object_bytes), object_bytes
+
+
+def _batch_output(*hexshas):
+    return b"".join(
+        b"%s commit %d\n%s\n" % (hexsha, len(COMMIT_OBJECTS[hexsha.decode()]), COMMIT_OBJECTS[hexsha.decode()])
+        for hexsha in hexshas
+    )
+
+
+class TestCommits(TestCase):
+    def test_split_records(self):
+        stream = io.BytesIO(b"first\0second\0third")
+        stream.read = Mock(side_effect=[b"fir", b"st\0sec", b"ond\0third", b""])
+        self.assertEqual(list(_split_records(stream)), [b"first", b"second", b"third"])
+        self.assertEqual(list(_split_records(io.BytesIO(b""))), [])
+
+    def test_parse_raw_commit(self):
+        commit = _parse_raw_commit(RAW_SIGNED_COMMIT)
+        self.assertEqual(commit.hexsha, "0c3689a2b2f0e3e9b1b4f2c6c2e0c9d8a5a3f1e0")
+        self.assertEqual(commit.parents_count, 1)
+        self.assertEqual(commit.summary, "Signed commit")
+        self.assertEqual(commit.message_tail, "Signed-off-by: Neo")
+        self.assertEqual(commit.author_name, "Pavel Sapezhko")
+        self.assertEqual(commit.author_email, "me@weastur.com")
+        self.assertTrue(commit.has_signature)
+
+        commit = _parse_raw_commit(RAW_MERGE_COMMIT)
+        self.assertEqual(commit.parents_count, 2)
+        self.assertEqual(commit.summary, "Merge branch 'side'")
+        self.assertFalse(commit.has_signature)
+
+        commit = _parse_raw_commit(RAW_MERGE_COMMIT.replace(b"\n\nMerge", b"\n\n\nMerge"))
+        self.assertEqual(commit.summary, "")
+        self.assertEqual(commit.message_tail, "Merge branch 'side'")
+
+        latin1_commit = RAW_MERGE_COMMIT.replace(b"\n\n", b"\nencoding ISO-8859-1\n\n").replace(b"side", b"s\xe9")
+        self.assertEqual(_parse_raw_commit(latin1_commit).summary, "Merge branch 's\xe9'")
+
+    def test_parse_formatted_commit(self):
+        record = (
+            b"0c3689a2b2f0e3e9b1b4f2c6c2e0c9d8a5a3f1e0\n"
+            b"5305125a957861e173772d5cd6b40159a77908bb a363b95c500bdfa1dc1aab51e0f595723cdbebc0\n"
+            b"neo@matrix.com\n"
+            b"Merge branch 'side'\n\nSigned-off-by: Neo\n"
+        )
+        commit = _parse_formatted_commit(record, header_fields=("author_email",))
+        self.assertEqual(commit.hexsha, "0c3689a2b2f0e3e9b1b4f2c6c2e0c9d8a5a3f1e0")
+        self.assertEqual(commit.parents_count, 2)
+        self.assertEqual(commit.summary, "Merge branch 'side'")
+        self.assertEqual(commit.message_tail, "Signed-off-by: Neo")
+        self.assertEqual(commit.author_email, "neo@matrix.com")
+        self.assertIsNone(commit.author_name)
+        self.assertIsNone(commit.has_signature)
+
+        commit = _parse_formatted_commit(b"0c3689a2b2f0e3e9b1b4f2c6c2e0c9d8a5a3f1e0\n\nRoot commit\n", header_fields=())
+        self.assertEqual(commit.parents_count, 0)
+        self.assertEqual(commit.summary, "Root commit")
+
+    def test_commit_record_slots(self):
+        commit = CommitRecord("0c3689a2b2f0e3e9b1b4f2c6c2e0c9d8a5a3f1e0", 1, "Summary")
+        self.assertFalse(hasattr(commit, "__dict__"))
+        with self.assertRaises(AttributeError):
+            commit.message = "Summary"
+
+    def test_iter_commits(self):
+        repo = Mock()
+        proc = repo.git.log.return_value
+        proc.stdout = io.BytesIO(SIGNED_HEXSHA + b"\0" + MERGE_HEXSHA)
+        repo.git.get_object_data.side_effect = _get_object_data
+        commits = list(iter_commits(repo, "HEAD~2..HEAD", frozenset(("has_signature",))))
+        self.assertEqual([commit.summary for commit in commits], ["Signed commit", "Merge branch 'side'"])
+        self.assertIn("HEAD~2..HEAD", repo.git.log.call_args[0])
+        self.assertIn("--format=%H", repo.git.log.call_args[0])
+        proc.wait.assert_called_once()
+
+    def test_iter_commits_projection(self):
+        repo = Mock()
+        proc = repo.git.log.return_value
+        proc.stdout = io.BytesIO(
+            b"0c3689a2b2f0e3e9b1b4f2c6c2e0c9d8a5a3f1e0\n2aec0556ec024cc1342c7ecad42e6ec4425ba523\nNeo\nSummary\n\0"
+        )
+        commits = list(iter_commits(repo, "HEAD~1..HEAD", frozenset(("author_name",))))
+        self.assertEqual(len(commits), 1)
+        self.assertEqual(commits[0].author_name, "Neo")
+        self.assertIn("--format=%H%n%P%n%an%n%B", repo.git.log.call_args[0])
+
+    def test_iter_commits_parents_counts(self):
+        repo = Mock()
+        repo.git.log.return_value.stdout = io.BytesIO(b"")
+        list(iter_commits(repo, "HEAD", parents_counts=frozenset((1,))))
+        log_args = repo.git.log.call_args[0]
+        self.assertEqual(log_args[-4:], ("HEAD", "--min-parents=1", "--max-parents=1", "--"))
+
+        list(iter_commits(repo, "HEAD", parents_counts=frozenset((1, 2))))
+        log_args = repo.git.log.call_args[0]
+        self.assertEqual(log_args[-3:], ("--min-parents=1", "--max-parents=2", "--"))
+
+    def test_has_commit_graph(self):
+        with tempfile.TemporaryDirectory() as git_dir:
+            self.assertFalse(has_commit_graph(git_dir))
+            graphs_dir = os.path.join(git_dir, "objects", "info", "commit-graphs")
+            os.makedirs(graphs_dir)
+            with open(os.path.join(graphs_dir, "commit-graph-chain"), "w"):
+                self.assertTrue(has_commit_graph(git_dir))
+
+    def test_iter_commits_fail(self):
+        repo = Mock()
+        proc = repo.git.log.return_value
+        proc.stdout = io.BytesIO(b"")
+        proc.wait.side_effect = GitCommandError("git log", 128)
+        with self.assertRaises(GitCommandError):
+            list(iter_commits(repo, "HEAD~1..HEAD"))
+
+    def test_load_commits(self):
+        repo = Mock()
+        self.assertEqual(list(load_commits(repo, [])), [])
+        self.assertEqual(repo.git.log.call_count, 0)
+
+        proc = repo.git.log.return_value
+        proc.stdout = io.BytesIO(SIGNED_HEXSHA)
+        repo.git.get_object_data.side_effect = _get_object_data
+        commits = list(load_commits(repo, ["0c3689a2b2f0e3e9b1b4f2c6c2e0c9d8a5a3f1e0"], frozenset(("has_signature",))))
+        self.assertEqual(len(commits), 1)
+        self.assertIn("--stdin", repo.git.log.call_args[0])
+        log_call = repo.git.log.call_args
+        self.assertIsNotNone(log_call[1]["istream"])
+
+    @patch.dict(GIT_COUNTERS, clear=True)
+    def test_iter_commit_parents(self):
+        repo = Mock()
+        proc = repo.git.rev_list.return_value
+        proc.stdout = io.BytesIO(b"aaa bbb ccc\nbbb ddd\nddd\n")
+        self.assertEqual(list(iter_commit_parents(repo, "HEAD")), [("aaa", 2), ("bbb", 1), ("ddd", 0)])
+        proc.wait.assert_called_once()
+        self.assertEqual(GIT_COUNTERS, {"calls": 1, "bytes_read": 24})
+
+        list(iter_commit_parents(repo, ("aaa", "--not", "--all")))
+        repo.git.rev_list.assert_called_with("--parents", "aaa", "--not", "--all", "--", as_process=True)
+
+    @patch("subprocess.run")
+    def test_read_commits(self, run_mock):
+        run_mock.return_value.returncode = 0
+        run_mock.return_value.stdout = SIGNED_HEXSHA + b"\n\nSigned commit\n\0"
+        self.assertEqual(read_commits("./", "HEAD~2..HEAD", max_count=2)[0].summary, "Signed commit")
+        command = run_mock.call_args[0][0]
+        self.assertEqual(command[:4], ("git", "-C", "./", "log"))
+        self.assertIn("--max-count=3", command)
+
+        log_run, batch_run = Mock(returncode=0), Mock(returncode=0)
+        log_run.stdout = SIGNED_HEXSHA + b"\0" + MERGE_HEXSHA + b"\0"
+        batch_run.stdout = _batch_output(SIGNED_HEXSHA, MERGE_HEXSHA)
+        run_mock.side_effect = [log_run, batch_run]
+        commits = read_commits("./", "HEAD~2..HEAD", frozenset(("has_signature",)), max_count=2)
+        self.assertEqual([commit.parents_count for commit in commits], [1, 2])
+        self.assertEqual([commit.message_tail for commit in commits], ["Signed-off-by: Neo", "Merge branch 'side'"])
+        self.assertEqual(run_mock.call_args[0][0][3:], ("cat-file", "--batch"))
+        self.assertEqual(run_mock.call_args[1]["input"], SIGNED_HEXSHA + b"\n" + MERGE_HEXSHA + b"\n")
+
+        run_mock.side_effect = None
+        run_mock.return_value.stdout = SIGNED_HEXSHA + b"\0" + MERGE_HEXSHA + b"\0"
+        self.assertIsNone(read_commits("./", "HEAD~2..HEAD", frozenset(("has_signature",)), max_count=1))
+
+        run_mock.return_value.returncode = 128
+        self.assertIsNone(read_commits("./", "HEAD~2..HEAD", max_count=2))
+
+        run_mock.side_effect = FileNotFoundError()
+        self.assertIsNone(read_commits("./", "HEAD~2..HEAD", max_count=2))
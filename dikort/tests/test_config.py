@@ -21,6 +21,22 @@ from dikort.config import (
 class TestValidators(TestCase):
     def setUp(self):
         self.config = {
+            "main": {
+                "jobs": 1,
+                "cache_size": 1,
+                "serve": False,
+                "socket": "",
+                "pre_receive": False,
+                "incremental": False,
+                "format": "text",
+                "max_violations": 0,
+                "backend": "git",
+                "repositories_from": "",
+                "message_file": "",
+                "pr_base": "",
+                "all_refs": False,
+                "refs_glob": "",
+            },
             "rules.settings": {
                 "min_length": 10,
                 "max_length": 100,
@@ -54,6 +70,115 @@ class TestValidators(TestCase):
         sys_exit_mock.assert_called_once_with(ERROR_EXIT_CODE)
         self.assertEqual(print_error_mock.call_count, 1)
 
+    @patch("dikort.config.print_error")
+    @patch("sys.exit")
+    def test_validate_error_jobs(self, sys_exit_mock, print_error_mock):
+        self.config["main"]["jobs"] = 0
+        _validate(self.config)
+        sys_exit_mock.assert_called_once_with(ERROR_EXIT_CODE)
+        self.assertEqual(print_error_mock.call_count, 1)
+
+    @patch("dikort.config.print_error")
+    @patch("sys.exit")
+    def test_validate_error_cache_size(self, sys_exit_mock, print_error_mock):
+        self.config["main"]["cache_size"] = 0
+        _validate(self.config)
+        sys_exit_mock.assert_called_once_with(ERROR_EXIT_CODE)
+        self.assertEqual(print_error_mock.call_count, 1)
+
+    @patch("dikort.config.print_error")
+    @patch("sys.exit")
+    def test_validate_error_serve_without_socket(self, sys_exit_mock, print_error_mock):
+        self.config["main"]["serve"] = True
+        _validate(self.config)
+        sys_exit_mock.assert_called_once_with(ERROR_EXIT_CODE)
+        self.assertEqual(print_error_mock.call_count, 1)
+
+        sys_exit_mock.reset_mock()
+        self.config["main"]["socket"] = "/run/dikort.sock"
+        _validate(self.config)
+        sys_exit_mock.assert_not_called()
+
+    @patch("dikort.config.print_error")
+    @patch("sys.exit")
+    def test_validate_error_max_violations(self, sys_exit_mock, print_error_mock):
+        self.config["main"]["max_violations"] = -1
+        _validate(self.config)
+        sys_exit_mock.assert_called_once_with(ERROR_EXIT_CODE)
+        self.assertEqual(print_error_mock.call_count, 1)
+
+    @patch("dikort.config.print_error")
+    @patch("sys.exit")
+    def test_validate_error_format(self, sys_exit_mock, print_error_mock):
+        self.config["main"]["format"] = "xml"
+        _validate(self.config)
+        sys_exit_mock.assert_called_once_with(ERROR_EXIT_CODE)
+        self.assertEqual(print_error_mock.call_count, 1)
+
+    @patch("dikort.config.print_error")
+    @patch("sys.exit")
+    def test_validate_error_repositories_pre_receive(self, sys_exit_mock, print_error_mock):
+        self.config["main"]["pre_receive"] = True
+        self.config["main"]["repositories_from"] = "repositories.txt"
+        _validate(self.config)
+        sys_exit_mock.assert_called_once_with(ERROR_EXIT_CODE)
+        self.assertEqual(print_error_mock.call_count, 1)
+
+    @patch("dikort.config.print_error")
+    @patch("sys.exit")
+    def test_validate_error_message_file_repositories(self, sys_exit_mock, print_error_mock):
+        self.config["main"]["message_file"] = ".git/COMMIT_EDITMSG"
+        self.config["main"]["repositories_from"] = "repositories.txt"
+        _validate(self.config)
+        sys_exit_mock.assert_called_once_with(ERROR_EXIT_CODE)
+        self.assertEqual(print_error_mock.call_count, 1)
+
+    @patch("dikort.config.print_error")
+    @patch("sys.exit")
+    def test_validate_error_pr_base_pre_receive(self, sys_exit_mock, print_error_mock):
+        self.config["main"]["pr_base"] = "main"
+        self.config["main"]["pre_receive"] = True
+        _validate(self.config)
+        sys_exit_mock.assert_called_once_with(ERROR_EXIT_CODE)
+        self.assertEqual(print_error_mock.call_count, 1)
+
+    @patch("dikort.config.print_error")
+    @patch("sys.exit")
+    def test_validate_error_pr_base_incremental(self, sys_exit_mock, print_error_mock):
+        self.config["main"]["pr_base"] = "main"
+        self.config["main"]["incremental"] = True
+        _validate(self.config)
+        sys_exit_mock.assert_called_once_with(ERROR_EXIT_CODE)
+        self.assertEqual(print_error_mock.call_count, 1)
+
+    @patch("dikort.config.print_error")
+    @patch("sys.exit")
+    def test_validate_error_all_refs(self, sys_exit_mock, print_error_mock):
+        self.config["main"]["refs_glob"] = "refs/heads"
+        _validate(self.config)
+        self.config["main"]["all_refs"] = True
+        self.config["main"]["incremental"] = True
+        _validate(self.config)
+        self.assertEqual(sys_exit_mock.call_count, 2)
+        self.assertEqual(print_error_mock.call_count, 2)
+
+    @patch("dikort.config.print_error")
+    @patch("sys.exit")
+    def test_validate_error_backend(self, sys_exit_mock, print_error_mock):
+        self.config["main"]["backend"] = "libgit2"
+        _validate(self.config)
+        sys_exit_mock.assert_called_once_with(ERROR_EXIT_CODE)
+        self.assertEqual(print_error_mock.call_count, 1)
+
+    @patch("dikort.config.print_error")
+    @patch("sys.exit")
+    def test_validate_error_pre_receive_incremental(self, sys_exit_mock, print_error_mock):
+        self.config["main"]["pre_receive"] = True
+        self.config["main"]["incremental"] = True
+        _validate(self.config)
+        sys_exit_mock.assert_called_once_with(ERROR_EXIT_CODE)
+        self.assertEqual(print_error_mock.call_count, 1)
+
 
 class TestFileConfig(TestCase):
     @patch("builtins.open")
@@ -122,6 +247,16 @@ class TestMerge(TestCase):
             config["merge_rules.settings"]["regex"].pattern,
             DEFAULTS["merge_rules.settings"]["regex"],
         )
+        self.assertEqual(config["rules.settings"]["trusted_keys"], frozenset())
+
+    def test_post_processing_trusted_keys(self):
+        config = copy.deepcopy(DEFAULTS.copy())
+        config["merge_rules.settings"]["trusted_keys"] = "4aee18f83afdeb23,\n SHA256:kKY/pTzGwzbA3bXk"
+        _post_processing(config)
+        self.assertEqual(
+            config["merge_rules.settings"]["trusted_keys"],
+            frozenset(("4AEE18F83AFDEB23", "SHA256:kKY/pTzGwzbA3bXk")),
+        )
 
     @patch("dikort.config.print_error")
     @patch("sys.exit")
@@ -132,9 +267,13 @@ class TestMerge(TestCase):
         config["logging"]["enabled"] = "yes"
         config["rules.settings"]["min_length"] = "5"
         config["logging"]["format"] = "format"
+        config["rules.settings"]["gpg"] = "verified"
+        config["rules.settings"]["trusted_keys"] = "4AEE18F83AFDEB23"
         self.assertEqual(_parse_value_from_file(config, "enabled", "logging"), True)
         self.assertEqual(_parse_value_from_file(config, "format", "logging"), "format")
         self.assertEqual(_parse_value_from_file(config, "min_length", "rules.settings"), 5)
+        self.assertEqual(_parse_value_from_file(config, "gpg", "rules.settings"), "verified")
+        self.assertEqual(_parse_value_from_file(config, "trusted_keys", "rules.settings"), "4AEE18F83AFDEB23")
         self.assertEqual(print_error_mock.call_count, 0)
         self.assertEqual(sys_exit_mock.call_count, 0)
 
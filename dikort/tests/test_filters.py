@@ -3,6 +3,8 @@ from unittest import TestCase
 from unittest.mock import Mock
 
 from dikort.filters import (
+    GPG_VERIFIED,
+    _author_matches,
     filter_author_email_regex,
     filter_author_name_regex,
     filter_capitalized,
@@ -78,31 +80,50 @@ class TestFilters(TestCase):
         self.assertFalse(filter_length(self.commit, config=self.config))
 
     def test_signoff(self):
-        self.commit.message = "My Awesome commit\n" "Fixed all bugs.\n" "Signed-off-by: Neo\n"
+        self.commit.message_tail = "Signed-off-by: Neo"
         self.config["signoff"] = True
         self.assertFalse(filter_signoff(self.commit, config=self.config))
         self.config["signoff"] = False
         self.assertTrue(filter_signoff(self.commit, config=self.config))
 
-        self.commit.message = "My Awesome commit\n" "Fixed all bugs.\n"
+        self.commit.message_tail = "Fixed all bugs."
         self.config["signoff"] = False
         self.assertFalse(filter_signoff(self.commit, config=self.config))
         self.config["signoff"] = True
         self.assertTrue(filter_signoff(self.commit, config=self.config))
 
     def test_gpg(self):
-        self.commit.gpgsig = "GPG-SIGNATURE"
+        self.commit.has_signature = True
         self.config["gpg"] = True
         self.assertFalse(filter_gpg(self.commit, config=self.config))
         self.config["gpg"] = False
         self.assertTrue(filter_gpg(self.commit, config=self.config))
 
-        self.commit.gpgsig = ""
+        self.commit.has_signature = False
         self.config["gpg"] = False
         self.assertFalse(filter_gpg(self.commit, config=self.config))
         self.config["gpg"] = True
         self.assertTrue(filter_gpg(self.commit, config=self.config))
 
+    def test_gpg_verified(self):
+        self.config["gpg"] = GPG_VERIFIED
+        self.config["trusted_keys"] = frozenset()
+        self.commit.signature = None
+        self.assertTrue(filter_gpg(self.commit, config=self.config))
+        self.commit.signature = Mock(status="U", fingerprint="AAAA", primary_fingerprint="BBBB")
+        self.assertTrue(filter_gpg(self.commit, config=self.config))
+        self.commit.signature.status = "G"
+        self.assertFalse(filter_gpg(self.commit, config=self.config))
+
+        self.config["trusted_keys"] = frozenset(("CCCC",))
+        self.assertTrue(filter_gpg(self.commit, config=self.config))
+        self.config["trusted_keys"] = frozenset(("BBBB",))
+        self.assertFalse(filter_gpg(self.commit, config=self.config))
+        self.commit.signature.status = "U"
+        self.assertFalse(filter_gpg(self.commit, config=self.config))
+        self.commit.signature.status = "B"
+        self.assertTrue(filter_gpg(self.commit, config=self.config))
+
     def test_regex(self):
         self.config["regex"] = re.compile(r"DEV-\d+: \w+")
 
@@ -114,15 +135,28 @@ class TestFilters(TestCase):
     def test_author_name_regex(self):
         self.config["author_name_regex"] = re.compile(r"\w+ \w+")
 
-        self.commit.author.name = "Pavel Sapezhko"
+        self.commit.author_name = "Pavel Sapezhko"
         self.assertFalse(filter_author_name_regex(self.commit, config=self.config))
-        self.commit.author.name = "Pavel"
+        self.commit.author_name = "Pavel"
         self.assertTrue(filter_author_name_regex(self.commit, config=self.config))
 
     def test_author_email_regex(self):
         self.config["author_email_regex"] = re.compile(r"\w+@example.com")
 
-        self.commit.author.email = "neo@example.com"
+        self.commit.author_email = "neo@example.com"
         self.assertFalse(filter_author_email_regex(self.commit, config=self.config))
-        self.commit.author.email = "neo@matrix.com"
+        self.commit.author_email = "neo@matrix.com"
         self.assertTrue(filter_author_email_regex(self.commit, config=self.config))
+
+    def test_author_regex_memoized(self):
+        _author_matches.cache_clear()
+        author_name_regex = Mock()
+        self.config["author_name_regex"] = author_name_regex
+        self.commit.author_name = "Pavel Sapezhko"
+        for _ in range(3):
+            filter_author_name_regex(self.commit, config=self.config)
+        author_name_regex.match.assert_called_once_with("Pavel Sapezhko")
+
+        self.commit.author_name = "Neo"
+        filter_author_name_regex(self.commit, config=self.config)
+        self.assertEqual(author_name_regex.match.call_count, 2)
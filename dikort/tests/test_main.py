@@ -1,48 +1,144 @@
 import io
 import json
+import os
+import subprocess  # noqa: S404
+import sys
+import tempfile
+import time
 from unittest import TestCase
 from unittest.mock import patch
 from urllib.error import URLError
 
 import dikort
-from dikort.main import GITHUB_RELEASES_API_URL, check_for_new_version
+from dikort.main import (
+    GITHUB_RELEASES_API_URL,
+    VERSION_CHECK_INTERVAL,
+    VERSION_CHECK_STAMP_FILENAME,
+    VersionCheck,
+    _version_check_due,
+    check_for_new_version,
+    load_config,
+)
+
+LAZY_MODULES = ("git", "urllib.request", "sqlite3", "concurrent.futures", "tempfile", "argparse", "configparser")
 
 
 class TestMain(TestCase):
-    @patch("dikort.main.urlopen")
+    @patch("urllib.request.urlopen")
     @patch("dikort.main.print_warning")
     def test_check_for_new_version_fail(self, mock_print_warning, mock_urlopen):
         mock_urlopen.side_effect = URLError("Fail")
-        check_for_new_version()
+        self.assertIsNone(check_for_new_version())
         mock_urlopen.assert_called_once_with(GITHUB_RELEASES_API_URL, timeout=1)
-        mock_print_warning.assert_called_once()
+        self.assertEqual(mock_print_warning.call_count, 0)
 
-    @patch("dikort.main.urlopen")
-    @patch("dikort.main.print_warning")
-    def test_check_for_new_version_empty_release_list(self, mock_print_warning, mock_urlopen):
+    @patch("urllib.request.urlopen")
+    def test_check_for_new_version_empty_release_list(self, mock_urlopen):
         releases = []
         mock_urlopen.return_value = io.BytesIO(json.dumps(releases).encode())
-        check_for_new_version()
+        self.assertIsNone(check_for_new_version())
         mock_urlopen.assert_called_once_with(GITHUB_RELEASES_API_URL, timeout=1)
-        self.assertEqual(mock_print_warning.call_count, 0)
 
-    @patch("dikort.main.urlopen")
-    @patch("dikort.main.print_warning")
-    def test_check_for_new_version_no_new_versions(self, mock_print_warning, mock_urlopen):
+    @patch("urllib.request.urlopen")
+    def test_check_for_new_version_no_new_versions(self, mock_urlopen):
         releases = [{"tag_name": "v0.0.0"}]
         mock_urlopen.return_value = io.BytesIO(json.dumps(releases).encode())
-        check_for_new_version()
+        self.assertIsNone(check_for_new_version())
         mock_urlopen.assert_called_once_with(GITHUB_RELEASES_API_URL, timeout=1)
-        self.assertEqual(mock_print_warning.call_count, 0)
 
-    @patch("dikort.main.urlopen")
-    @patch("dikort.main.print_warning")
-    def test_check_for_new_version_success(self, mock_print_warning, mock_urlopen):
+    @patch("urllib.request.urlopen")
+    def test_check_for_new_version_success(self, mock_urlopen):
         current_version_value = dikort.__version__[:-1]
         current_version_minor_value = int(dikort.__version__[-1])
-        next_version = "v" + current_version_value + str(current_version_minor_value + 1)
-        releases = [{"tag_name": "v0.0.0"}, {"tag_name": next_version}]
+        next_version = current_version_value + str(current_version_minor_value + 1)
+        releases = [{"tag_name": "v0.0.0"}, {"tag_name": f"v{next_version}"}]
         mock_urlopen.return_value = io.BytesIO(json.dumps(releases).encode())
-        check_for_new_version()
+        self.assertEqual(check_for_new_version(), next_version)
         mock_urlopen.assert_called_once_with(GITHUB_RELEASES_API_URL, timeout=1)
+
+
+class TestVersionCheck(TestCase):
+    def setUp(self):
+        self.cache_dir = tempfile.TemporaryDirectory()
+        self.stamp_path = os.path.join(self.cache_dir.name, VERSION_CHECK_STAMP_FILENAME)
+        patcher = patch("dikort.cache.user_cache_dir", return_value=self.cache_dir.name)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self.cache_dir.cleanup()
+
+    def test_version_check_due(self):
+        self.assertTrue(_version_check_due())
+        self.assertTrue(os.path.exists(self.stamp_path))
+        self.assertFalse(_version_check_due())
+
+        expired = time.time() - VERSION_CHECK_INTERVAL - 1
+        os.utime(self.stamp_path, (expired, expired))
+        self.assertTrue(_version_check_due())
+
+    @patch("dikort.main.check_for_new_version")
+    @patch("dikort.main.print_warning")
+    def test_version_check_report(self, mock_print_warning, mock_check_for_new_version):
+        mock_check_for_new_version.return_value = "100.0.0"
+        with VersionCheck() as version_check:
+            version_check.join()
         mock_print_warning.assert_called_once()
+
+        mock_print_warning.reset_mock()
+        with VersionCheck() as skipped_version_check:
+            self.assertFalse(skipped_version_check.is_alive())
+        self.assertEqual(mock_print_warning.call_count, 0)
+        mock_check_for_new_version.assert_called_once()
+
+
+class TestLoadConfig(TestCase):
+    @patch("dikort.main.write_snapshot")
+    @patch("dikort.main.merge")
+    @patch("dikort.main.read_snapshot")
+    def test_load_config(self, read_snapshot_mock, merge_mock, write_snapshot_mock):
+        read_snapshot_mock.return_value = None
+        self.assertIs(load_config(["--enable-length"]), merge_mock.return_value)
+        write_snapshot_mock.assert_called_once_with(["--enable-length"], merge_mock.return_value)
+
+        merge_mock.reset_mock()
+        read_snapshot_mock.return_value = {"main": {}}
+        self.assertEqual(load_config(["--enable-length"]), {"main": {}})
+        self.assertEqual(merge_mock.call_count, 0)
+
+
+class TestImports(TestCase):
+    def test_lazy_imports(self):
+        command = (sys.executable, "-c", "import sys, dikort.main; print(' '.join(sys.modules))")
+        python_run = subprocess.run(command, capture_output=True, check=True, text=True)  # noqa: S603
+        imported_modules = python_run.stdout.split()
+        for heavy_module in LAZY_MODULES:
+            self.assertNotIn(heavy_module, imported_modules)
+
+    def test_client_imports(self):
+        command = (sys.executable, "-c", "import sys, dikort.client; print(' '.join(sys.modules))")
+        python_run = subprocess.run(command, capture_output=True, check=True, text=True)  # noqa: S603
+        self.assertNotIn("git", python_run.stdout.split())
+
+    def test_message_file_imports(self):
+        command = (
+            sys.executable,
+            "-c",
+            "import atexit, sys, dikort.main; "
+            "atexit.register(lambda: sys.stderr.write(' '.join(sys.modules))); "
+            "sys.argv = ['dikort', '--enable-length', '--message-file', '-']; "
+            "dikort.main.main()",
+        )
+        with tempfile.TemporaryDirectory() as cache_home:
+            python_run = subprocess.run(  # noqa: S603
+                command,
+                capture_output=True,
+                check=False,
+                input="Short\n",
+                text=True,
+                env={**os.environ, "XDG_CACHE_HOME": cache_home},
+            )
+            self.assertTrue(os.listdir(cache_home))
+        self.assertEqual(python_run.returncode, 1)
+        self.assertIn("0000000000000000000000000000000000000000", python_run.stdout)
+        self.assertNotIn("git", python_run.stderr.split())
@@ -0,0 +1,82 @@
+import io
+import os
+import tempfile
+from unittest import TestCase
+from unittest.mock import patch
+
+from dikort.config import ERROR_EXIT_CODE
+from dikort.message import (
+    MERGE_HEAD_FILENAME,
+    NULL_HEXSHA,
+    clean_message,
+    message_commit,
+    read_message_commit,
+)
+
+COMMIT_MESSAGE = """
+Add feature
+
+Signed-off-by: Author <author@example.com>
+# Please enter the commit message for your changes.
+#
+# ------------------------ >8 ------------------------
+diff --git a/file b/file
+"""
+
+
+class TestMessage(TestCase):
+    def test_clean_message(self):
+        self.assertEqual(clean_message(COMMIT_MESSAGE), "Add feature\n\nSigned-off-by: Author <author@example.com>")
+        self.assertEqual(clean_message("# Only comments\n\n"), "")
+
+    @patch.dict(os.environ, {"GIT_AUTHOR_NAME": "Author", "GIT_AUTHOR_EMAIL": "author@example.com"})
+    def test_message_commit(self):
+        commit = message_commit(COMMIT_MESSAGE)
+        self.assertEqual(commit.hexsha, NULL_HEXSHA)
+        self.assertEqual(commit.parents_count, 1)
+        self.assertEqual(commit.summary, "Add feature")
+        self.assertEqual(commit.message_tail, "Signed-off-by: Author <author@example.com>")
+        self.assertEqual(commit.author_name, "Author")
+        self.assertEqual(commit.author_email, "author@example.com")
+        self.assertIsNone(commit.has_signature)
+
+    @patch.dict(os.environ, clear=True)
+    def test_message_commit_without_author(self):
+        commit = message_commit("Add feature\n")
+        self.assertIsNone(commit.author_name)
+        self.assertIsNone(commit.author_email)
+
+    @patch.dict(os.environ, clear=True)
+    @patch("sys.stdin", io.StringIO("Add feature\n"))
+    def test_read_message_commit(self):
+        commit = read_message_commit("-")
+        self.assertEqual(commit.summary, "Add feature")
+        self.assertEqual(commit.parents_count, 1)
+        with tempfile.TemporaryDirectory() as git_dir:
+            message_file = os.path.join(git_dir, "COMMIT_EDITMSG")
+            with open(message_file, "w") as message_stream:
+                message_stream.write("Merge branch 'feature'\n")
+            self.assertEqual(read_message_commit(message_file).parents_count, 1)
+            with open(os.path.join(git_dir, MERGE_HEAD_FILENAME), "w") as merge_head_stream:
+                merge_head_stream.write(f"{NULL_HEXSHA}\n")
+            commit = read_message_commit(message_file)
+        self.assertEqual(commit.summary, "Merge branch 'feature'")
+        self.assertEqual(commit.parents_count, 2)
+
+    @patch("sys.stdin", io.StringIO("Merge branch 'feature'\n"))
+    def test_read_message_commit_git_dir(self):
+        with tempfile.TemporaryDirectory() as git_dir:
+            with open(os.path.join(git_dir, MERGE_HEAD_FILENAME), "w") as merge_head_stream:
+                merge_head_stream.write(f"{NULL_HEXSHA}\n")
+            with patch.dict(os.environ, {"GIT_DIR": git_dir}):
+                commit = read_message_commit("-")
+        self.assertEqual(commit.parents_count, 2)
+
+    @patch("dikort.message.print_error")
+    @patch("sys.exit")
+    def test_read_message_commit_error(self, sys_exit_mock, print_error_mock):
+        sys_exit_mock.side_effect = SystemExit
+        with self.assertRaises(SystemExit):
+            read_message_commit("/no/such/file")
+        sys_exit_mock.assert_called_once_with(ERROR_EXIT_CODE)
+        print_error_mock.assert_called_once()
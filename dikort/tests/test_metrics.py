@@ -0,0 +1,58 @@
+import io
+import json
+import os
+import tempfile
+from unittest import TestCase
+from unittest.mock import patch
+
+from dikort.commits import GIT_COUNTERS
+from dikort.metrics import Metrics, RuleMetrics
+
+
+class TestMetrics(TestCase):
+    def test_rule_metrics(self):
+        rule_metrics = RuleMetrics()
+        rule_metrics.record(0.5, True)
+        rule_metrics.record(0.25, False)
+        self.assertEqual(rule_metrics.as_dict(), {"wall_time": 0.75, "evaluated": 2, "failed": 1})
+
+        taken_metrics = rule_metrics.take()
+        self.assertEqual(taken_metrics.as_dict(), {"wall_time": 0.75, "evaluated": 2, "failed": 1})
+        self.assertEqual(rule_metrics.as_dict(), {"wall_time": 0, "evaluated": 0, "failed": 0})
+
+    def test_merge_rules(self):
+        metrics = Metrics()
+        metrics.rule("rule").record(1, True)
+        worker_metrics = Metrics()
+        worker_metrics.rule("rule").record(2, False)
+        worker_metrics.rule("another rule").record(3, True)
+        metrics.merge_rules(worker_metrics.take_rules())
+        self.assertEqual(metrics.rules["rule"].as_dict(), {"wall_time": 3, "evaluated": 2, "failed": 1})
+        self.assertEqual(metrics.rules["another rule"].as_dict(), {"wall_time": 3, "evaluated": 1, "failed": 1})
+        self.assertEqual(worker_metrics.rules["another rule"].evaluated, 0)
+
+    @patch.dict(GIT_COUNTERS, {"calls": 5, "bytes_read": 100})
+    def test_as_dict(self):
+        metrics = Metrics()
+        GIT_COUNTERS.update(calls=2, bytes_read=50)
+        metrics.rule("rule").record(1, True)
+        metrics_dict = metrics.as_dict()
+        self.assertEqual(metrics_dict["git"], {"calls": 2, "bytes_read": 50})
+        self.assertEqual(metrics_dict["rules"], {"rule": {"wall_time": 1, "evaluated": 1, "failed": 1}})
+
+    def test_print_profile(self):
+        metrics = Metrics()
+        metrics.rule("rule").record(0.002, True)
+        stream = io.StringIO()
+        metrics.print_profile(stream)
+        self.assertIn("[rule] 2.000 ms, 1 evaluated, 1 failed\n", stream.getvalue())
+
+    def test_write(self):
+        metrics = Metrics()
+        metrics.rule("rule").record(1, False)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            metrics_path = os.path.join(tmp_dir, "metrics.json")
+            metrics.write(metrics_path)
+            with open(metrics_path) as metrics_fp:
+                metrics_dict = json.load(metrics_fp)
+        self.assertEqual(metrics_dict["rules"], {"rule": {"wall_time": 1, "evaluated": 1, "failed": 0}})
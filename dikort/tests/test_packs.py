@@ -0,0 +1,151 @@
+import os
+import tempfile
+from unittest import TestCase
+from unittest.mock import patch
+
+from git import Repo
+
+from dikort.commits import iter_commits
+from dikort.packs import (
+    PackCommitReader,
+    PackError,
+    _apply_delta,
+    _parse_commit_object,
+    open_pack_reader,
+)
+from dikort.tests.git_repository import run_git
+
+ALL_FIELDS = frozenset(("has_signature", "author_name", "author_email"))
+COMMIT_OBJECT = (
+    b"tree 4b825dc642cb6eb9a060e54bf8d69288fbee4904\n"
+    b"parent 2aec0556ec024cc1342c7ecad42e6ec4425ba523\n"
+    b"author Neo <neo@matrix.com> 1700000000 +0000\n"
+    b"committer Neo <neo@matrix.com> 1700000001 +0000\n"
+    b"encoding ISO-8859-1\n"
+    b"gpgsig -----BEGIN PGP SIGNATURE-----\n"
+    b" abc\n"
+    b" -----END PGP SIGNATURE-----\n"
+    b"\n"
+    b"Caf\xe9 summary\n"
+    b"\n"
+    b"Signed-off-by: Neo\n"
+)
+RANGES = ("HEAD", "HEAD~2..HEAD", "HEAD^2", "main..side", "side..", "HEAD ^HEAD~3", "HEAD --not side", "--all")
+
+
+def _commit_tuples(commits):
+    return [tuple(getattr(commit, field) for field in commit.__slots__) for commit in commits]
+
+
+class TestPacks(TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.repository_path = self.temp_dir.name
+        run_git(self.repository_path, "init", "--quiet", "--initial-branch=main")
+        for commit_index in range(6):
+            message = f"Change {commit_index}\n\nSigned-off-by: Neo"
+            run_git(
+                self.repository_path, "commit", "--allow-empty", "-m", message, commit_time=1700000000 + commit_index
+            )
+        run_git(self.repository_path, "checkout", "--quiet", "-b", "side", "HEAD~2")
+        run_git(self.repository_path, "commit", "--allow-empty", "-m", "Side change", commit_time=1700000010)
+        side_message = "\nSide change after a blank line"
+        run_git(
+            self.repository_path,
+            "commit",
+            "--allow-empty",
+            "--cleanup=verbatim",
+            "-m",
+            side_message,
+            commit_time=1700000011,
+        )
+        run_git(self.repository_path, "checkout", "--quiet", "main")
+        run_git(self.repository_path, "merge", "--no-ff", "-m", "Merge side", "side", commit_time=1700000020)
+        run_git(self.repository_path, "tag", "-a", "-m", "Release", "v1", "HEAD~1", commit_time=1700000030)
+        self.repo = Repo(self.repository_path)
+
+    def tearDown(self):
+        self.repo.close()
+        self.temp_dir.cleanup()
+
+    def assert_same_as_git(self):
+        reader = PackCommitReader(self.repo.git_dir)
+        for rev in RANGES:
+            rev = tuple(rev.split())
+            for parents_counts in ((), frozenset((1,)), frozenset((2,))):
+                expected_commits = iter_commits(self.repo, rev, ALL_FIELDS, parents_counts)
+                actual_commits = reader.iter_commits(rev, ALL_FIELDS, parents_counts)
+                self.assertEqual(_commit_tuples(actual_commits), _commit_tuples(expected_commits), rev)
+
+    def test_loose_objects(self):
+        self.assert_same_as_git()
+
+    def test_packed_objects(self):
+        run_git(self.repository_path, "gc", "--quiet", "--aggressive")
+        self.assertTrue(os.listdir(os.path.join(self.repo.git_dir, "objects", "pack")))
+        self.assert_same_as_git()
+
+    def test_resolve(self):
+        reader = PackCommitReader(self.repo.git_dir)
+        head_hexsha = self.repo.head.commit.hexsha
+        self.assertEqual(reader.resolve("HEAD"), [(head_hexsha, False)])
+        self.assertEqual(reader.resolve(head_hexsha[:7]), [(head_hexsha, False)])
+        self.assertEqual(reader.resolve("v1^0"), [(self.repo.commit("HEAD~1").hexsha, False)])
+        self.assertEqual(
+            reader.resolve(("HEAD", "--not", "v1")), [(head_hexsha, False), (reader.resolve("v1")[0][0], True)]
+        )
+        for unsupported_rev in ("HEAD...side", "HEAD@{1}", "HEAD~10", "unknown", "--since=yesterday"):
+            with self.assertRaises(PackError):
+                reader.resolve(unsupported_rev)
+
+    def test_open_pack_reader(self):
+        self.assertIsInstance(open_pack_reader(self.repo.git_dir, "HEAD~1..HEAD"), PackCommitReader)
+        with self.assertRaises(PackError):
+            open_pack_reader(self.repo.git_dir, "HEAD...side")
+
+    def test_load_commits(self):
+        reader = PackCommitReader(self.repo.git_dir)
+        hexshas = [self.repo.commit("HEAD~1").hexsha, self.repo.head.commit.hexsha]
+        self.assertEqual([commit.hexsha for commit in reader.load_commits(hexshas)], hexshas)
+        self.assertEqual(list(reader.iter_commit_parents("HEAD~2..HEAD~1")), [(hexshas[0], 1)])
+
+    def test_quarantine_objects(self):
+        quarantine_dir = os.path.join(self.repository_path, "incoming")
+        os.mkdir(quarantine_dir)
+        quarantine_env = {
+            "GIT_OBJECT_DIRECTORY": quarantine_dir,
+            "GIT_ALTERNATE_OBJECT_DIRECTORIES": os.path.join(self.repo.git_dir, "objects"),
+        }
+        with patch.dict(os.environ, quarantine_env):
+            run_git(self.repository_path, "commit", "--allow-empty", "-m", "Pushed change", commit_time=1700000040)
+            reader = PackCommitReader(self.repo.git_dir)
+            actual_commits = list(reader.iter_commits("HEAD~2..HEAD", ALL_FIELDS))
+            expected_commits = _commit_tuples(iter_commits(self.repo, "HEAD~2..HEAD", ALL_FIELDS))
+        self.assertEqual(_commit_tuples(actual_commits), expected_commits)
+        self.assertEqual(actual_commits[0].summary, "Pushed change")
+        with self.assertRaises(PackError):
+            list(PackCommitReader(self.repo.git_dir).iter_commits("HEAD"))
+
+
+class TestPackObjects(TestCase):
+    def test_parse_commit_object(self):
+        commit, commit_time, parents = _parse_commit_object("aaa", COMMIT_OBJECT)
+        self.assertEqual(commit_time, 1700000001)
+        self.assertEqual(parents, ["2aec0556ec024cc1342c7ecad42e6ec4425ba523"])
+        self.assertEqual(commit.parents_count, 1)
+        self.assertEqual(commit.summary, "Café summary")
+        self.assertEqual(commit.message_tail, "Signed-off-by: Neo")
+        self.assertEqual((commit.author_name, commit.author_email), ("Neo", "neo@matrix.com"))
+        self.assertTrue(commit.has_signature)
+
+        commit, _, _ = _parse_commit_object("aaa", COMMIT_OBJECT.replace(b"\n\nCaf", b"\n\n\nCaf"))
+        self.assertEqual(commit.summary, "")
+
+    def test_apply_delta(self):
+        base_bytes = b"9876543210"
+        delta = b"\x0a\x08" + b"\x91\x02\x04" + b"\x02ab" + b"\x90\x02"
+        self.assertEqual(_apply_delta(base_bytes, delta), b"7654ab98")
+        with self.assertRaises(PackError):
+            _apply_delta(base_bytes, b"\x0a\x08\x00")
+        with self.assertRaises(PackError):
+            _apply_delta(base_bytes, b"\x0a\x09\x90\x02")
@@ -0,0 +1,14 @@
+from unittest import TestCase
+from unittest.mock import patch
+
+from dikort.parallel import imap_chunks
+
+
+class TestParallel(TestCase):
+    def test_imap_chunks(self):
+        with patch("dikort.parallel.CHUNK_SIZE", 3):
+            actual_result = list(imap_chunks(sum, range(10), jobs=2))
+        self.assertEqual(actual_result, [3, 12, 21, 9])
+
+    def test_imap_chunks_empty(self):
+        self.assertEqual(list(imap_chunks(sum, [], jobs=2)), [])
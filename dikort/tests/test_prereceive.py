@@ -0,0 +1,27 @@
+from unittest import TestCase
+
+from dikort.prereceive import pushed_range
+
+ZERO_HEXSHA = "0" * 40
+OLD_HEXSHA = "a" * 40
+NEW_HEXSHA = "b" * 40
+OTHER_HEXSHA = "c" * 40
+
+
+class TestPreReceive(TestCase):
+    def test_pushed_range(self):
+        ref_updates = [
+            f"{OLD_HEXSHA} {NEW_HEXSHA} refs/heads/main\n",
+            f"{ZERO_HEXSHA} {NEW_HEXSHA} refs/heads/copy\n",
+            f"{ZERO_HEXSHA} {OTHER_HEXSHA} refs/tags/v1\n",
+            f"{OLD_HEXSHA} {ZERO_HEXSHA} refs/heads/gone\n",
+            "\n",
+        ]
+        self.assertEqual(pushed_range(ref_updates), (NEW_HEXSHA, OTHER_HEXSHA, "--not", "--all"))
+
+    def test_pushed_range_deletions_only(self):
+        self.assertEqual(pushed_range([f"{OLD_HEXSHA} {ZERO_HEXSHA} refs/heads/gone\n"]), ("--not", "--all"))
+
+    def test_pushed_range_malformed(self):
+        with self.assertRaises(ValueError):
+            pushed_range(["garbage\n"])
@@ -5,6 +5,7 @@ from dikort.print import (
     BColors,
     _print_formatted,
     print_error,
+    print_format_warning,
     print_header,
     print_success,
     print_warning,
@@ -41,3 +42,11 @@ class TestPrint(TestCase):
         line = "Hello!"
         print_header(line)
         mock_print.assert_called_once_with(line, sep=" ", end="\n", formatter=BColors.header)
+
+    @patch("dikort.print.print_warning")
+    def test_format_warning(self, mock_print_warning):
+        print_format_warning("text", "Warning")
+        mock_print_warning.assert_called_once_with("Warning")
+        with self.assertLogs(level="WARNING"):
+            print_format_warning("jsonl", "Warning")
+        mock_print_warning.assert_called_once()
@@ -0,0 +1,71 @@
+import os
+import tempfile
+from unittest import TestCase
+
+from dikort.pullrequest import PullRequestError, pull_request_range
+from dikort.tests.git_repository import run_git
+
+
+def _range_summaries(repository_path, commit_range):
+    return sorted(run_git(repository_path, "log", "--format=%s", *commit_range, "--").split())
+
+
+class TestPullRequest(TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.repository_path = os.path.join(self.temp_dir.name, "origin")
+        run_git(self.temp_dir.name, "init", "--quiet", "--initial-branch=main", self.repository_path)
+        for commit_index in range(3):
+            run_git(self.repository_path, "commit", "--allow-empty", "-m", f"Main{commit_index}")
+        run_git(self.repository_path, "checkout", "--quiet", "-b", "feature")
+        run_git(self.repository_path, "commit", "--allow-empty", "-m", "Feature0")
+        run_git(self.repository_path, "checkout", "--quiet", "-b", "other", "main")
+        run_git(self.repository_path, "commit", "--allow-empty", "-m", "Other0")
+        run_git(self.repository_path, "checkout", "--quiet", "feature")
+        run_git(self.repository_path, "merge", "--no-ff", "-m", "MergeOther", "other")
+        run_git(self.repository_path, "checkout", "--quiet", "other")
+        run_git(self.repository_path, "merge", "--no-ff", "-m", "MergeFeature", "feature~1")
+        run_git(self.repository_path, "checkout", "--quiet", "feature")
+        run_git(self.repository_path, "commit", "--allow-empty", "-m", "Feature1")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_pull_request_range(self):
+        commit_range = pull_request_range(self.repository_path, "main")
+        self.assertEqual(commit_range, ("HEAD", "--not", run_git(self.repository_path, "rev-parse", "main")))
+        self.assertEqual(
+            _range_summaries(self.repository_path, commit_range),
+            ["Feature0", "Feature1", "MergeOther", "Other0"],
+        )
+
+    def test_criss_cross(self):
+        commit_range = pull_request_range(self.repository_path, "other")
+        self.assertEqual(len(commit_range), 4)
+        self.assertEqual(_range_summaries(self.repository_path, commit_range), ["Feature1", "MergeOther"])
+
+    def test_errors(self):
+        with self.assertRaises(PullRequestError):
+            pull_request_range(self.repository_path, "no-such-branch")
+        run_git(self.repository_path, "checkout", "--quiet", "--orphan", "unrelated")
+        run_git(self.repository_path, "commit", "--allow-empty", "-m", "Unrelated")
+        with self.assertRaisesRegex(PullRequestError, "no common history"):
+            pull_request_range(self.repository_path, "main")
+
+    def test_shallow(self):
+        clone_path = os.path.join(self.temp_dir.name, "clone")
+        origin_url = f"file://{self.repository_path}"
+        run_git(self.temp_dir.name, "clone", "--quiet", "--depth=1", "--no-single-branch", origin_url, clone_path)
+        run_git(clone_path, "checkout", "--quiet", "feature")
+        with self.assertRaisesRegex(PullRequestError, "shallow history"):
+            pull_request_range(clone_path, "origin/main")
+
+        run_git(clone_path, "fetch", "--quiet", "--unshallow")
+        commit_range = pull_request_range(clone_path, "origin/main")
+        self.assertEqual(len(_range_summaries(clone_path, commit_range)), 4)
+
+        other_hexsha = run_git(clone_path, "rev-parse", "origin/other~1")
+        with open(os.path.join(clone_path, ".git", "shallow"), "w") as shallow_fp:
+            shallow_fp.write(f"{other_hexsha}\n")
+        with self.assertRaisesRegex(PullRequestError, "inside the pull request"):
+            pull_request_range(clone_path, "origin/main")
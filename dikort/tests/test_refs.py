@@ -0,0 +1,60 @@
+import os
+import tempfile
+from unittest import TestCase
+
+from dikort.commits import CommitRecord
+from dikort.refs import RefsError, attribute_refs, read_ref_tips
+from dikort.tests.git_repository import run_git
+
+
+class TestRefs(TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.repository_path = self.temp_dir.name
+        run_git(self.repository_path, "init", "--quiet", "--initial-branch=main")
+        for commit_index in range(3):
+            run_git(self.repository_path, "commit", "--allow-empty", "-m", f"Main{commit_index}")
+        run_git(self.repository_path, "checkout", "--quiet", "-b", "side", "HEAD~1")
+        run_git(self.repository_path, "commit", "--allow-empty", "-m", "Side")
+        run_git(self.repository_path, "checkout", "--quiet", "main")
+        run_git(self.repository_path, "tag", "--annotate", "--message=Release", "v1", "HEAD~2")
+        run_git(self.repository_path, "tag", "tree-tag", "HEAD^{tree}")
+        run_git(self.repository_path, "update-ref", "refs/dikort/verified/main", "HEAD")
+        with open(os.path.join(self.repository_path, "stashed.txt"), "w") as stashed_fp:
+            stashed_fp.write("WIP\n")
+        run_git(self.repository_path, "stash", "--include-untracked", "--quiet")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_read_ref_tips(self):
+        ref_tips = read_ref_tips(self.repository_path)
+        self.assertEqual(list(ref_tips), ["refs/heads/main", "refs/heads/side", "refs/tags/v1"])
+        self.assertEqual(ref_tips["refs/tags/v1"], run_git(self.repository_path, "rev-parse", "HEAD~2"))
+        self.assertEqual(
+            list(read_ref_tips(self.repository_path, "refs/heads/s* refs/tags")), ["refs/heads/side", "refs/tags/v1"]
+        )
+        self.assertEqual(list(read_ref_tips(self.repository_path, "refs/stash")), ["refs/stash"])
+
+    def test_read_ref_tips_errors(self):
+        with self.assertRaisesRegex(RefsError, "No refs match refs/remotes"):
+            read_ref_tips(self.repository_path, "refs/remotes")
+        with self.assertRaises(RefsError):
+            read_ref_tips(os.path.join(self.repository_path, "no-such-repository"))
+
+    def test_attribute_refs(self):
+        ref_tips = read_ref_tips(self.repository_path)
+        commits = [
+            CommitRecord(run_git(self.repository_path, "rev-parse", rev), 1, rev)
+            for rev in ("main", "side", "HEAD~1", "HEAD~2")
+        ]
+        attribute_refs(commits, self.repository_path, ref_tips)
+        self.assertEqual(
+            [commit.refs for commit in commits],
+            [
+                ["refs/heads/main"],
+                ["refs/heads/side"],
+                ["refs/heads/main", "refs/heads/side"],
+                ["refs/heads/main", "refs/heads/side", "refs/tags/v1"],
+            ],
+        )
@@ -0,0 +1,107 @@
+import io
+import json
+from unittest import TestCase
+from xml.etree import ElementTree  # noqa: S405
+
+from dikort.commits import CommitRecord
+from dikort.print import BColors
+from dikort.reporters import (
+    JSONLinesReporter,
+    JUnitReporter,
+    SARIFReporter,
+    TextReporter,
+)
+
+
+class TestReporters(TestCase):
+    def setUp(self):
+        self.stream = io.StringIO()
+        self.rules = ["Summary length", "Trailing period (merge commits)"]
+        self.failed_commits = [CommitRecord("aaa", 1, "bad one"), CommitRecord("bbb", 1, "bad two")]
+
+    def test_text(self):
+        self.assertEqual(
+            self._report(TextReporter(self.stream, self.rules)),
+            f"[Summary length] - {BColors.okgreen}SUCCESS{BColors.endc}\n"
+            f"[Trailing period (merge commits)] - {BColors.fail}ERROR{BColors.endc}\n"
+            "Hash: aaa, message: 'bad one'\n"
+            "Hash: bbb, message: 'bad two'\n"
+            f"{BColors.fail}Some checks are failed.{BColors.endc}\n",
+        )
+
+    def test_text_stopped_early(self):
+        self.assertEqual(
+            self._report(TextReporter(self.stream, self.rules), stopped_early=True),
+            f"[Summary length] - {BColors.warning}NOT CHECKED{BColors.endc}\n"
+            f"[Trailing period (merge commits)] - {BColors.fail}ERROR{BColors.endc}\n"
+            "Hash: aaa, message: 'bad one'\n"
+            "Hash: bbb, message: 'bad two'\n"
+            f"{BColors.warning}Checks stopped early, some commits are not checked.{BColors.endc}\n"
+            f"{BColors.fail}Some checks are failed.{BColors.endc}\n",
+        )
+
+    def test_text_refs(self):
+        self.failed_commits[1].refs = ["refs/heads/main", "refs/tags/v1"]
+        self.assertIn(
+            "Hash: bbb, message: 'bad two', refs: refs/heads/main, refs/tags/v1\n",
+            self._report(TextReporter(self.stream, self.rules)),
+        )
+
+    def test_text_all_clear(self):
+        TextReporter(self.stream, []).finish(True)
+        self.assertEqual(self.stream.getvalue(), f"{BColors.okgreen}All clear.{BColors.endc}\n")
+
+    def test_jsonl(self):
+        records = [json.loads(line) for line in self._report(JSONLinesReporter(self.stream, self.rules)).splitlines()]
+        self.assertEqual(
+            records,
+            [
+                {"rule": "Trailing period (merge commits)", "hexsha": "aaa", "summary": "bad one"},
+                {"rule": "Trailing period (merge commits)", "hexsha": "bbb", "summary": "bad two"},
+            ],
+        )
+
+    def test_jsonl_refs(self):
+        self.failed_commits[0].refs = ["refs/heads/main"]
+        records = [json.loads(line) for line in self._report(JSONLinesReporter(self.stream, self.rules)).splitlines()]
+        self.assertEqual(records[0]["refs"], ["refs/heads/main"])
+        self.assertNotIn("refs", records[1])
+
+    def test_sarif(self):
+        sarif_log = json.loads(self._report(SARIFReporter(self.stream, self.rules)))
+        self.assertEqual(sarif_log["version"], "2.1.0")
+        sarif_run = sarif_log["runs"][0]
+        rule_ids = [rule["id"] for rule in sarif_run["tool"]["driver"]["rules"]]
+        self.assertEqual(rule_ids, ["summary-length", "trailing-period-merge-commits"])
+        self.assertEqual([sarif_result["ruleId"] for sarif_result in sarif_run["results"]], rule_ids[1:] * 2)
+        self.assertEqual(sarif_run["results"][1]["partialFingerprints"], {"commitSha": "bbb"})
+
+    def test_sarif_refs(self):
+        self.failed_commits[0].refs = ["refs/heads/main"]
+        sarif_results = json.loads(self._report(SARIFReporter(self.stream, self.rules)))["runs"][0]["results"]
+        self.assertEqual(sarif_results[0]["properties"], {"refs": ["refs/heads/main"]})
+        self.assertNotIn("properties", sarif_results[1])
+
+    def test_junit(self):
+        test_suite = ElementTree.fromstring(self._report(JUnitReporter(self.stream, self.rules)))  # noqa: S314
+        self.assertEqual(test_suite.get("tests"), "2")
+        self.assertEqual(test_suite.get("failures"), "1")
+        test_cases = test_suite.findall("testcase")
+        self.assertIsNone(test_cases[0].find("failure"))
+        failure = test_cases[1].find("failure")
+        self.assertEqual(failure.get("message"), "2 commits failed")
+        self.assertIn("Hash: bbb, message: 'bad two'", failure.text)
+
+    def test_junit_stopped_early(self):
+        junit_report = self._report(JUnitReporter(self.stream, self.rules), stopped_early=True)
+        test_suite = ElementTree.fromstring(junit_report)  # noqa: S314
+        self.assertEqual(test_suite.get("skipped"), "1")
+        test_cases = test_suite.findall("testcase")
+        self.assertIsNotNone(test_cases[0].find("skipped"))
+        self.assertIsNone(test_cases[1].find("skipped"))
+
+    def _report(self, reporter, stopped_early=False):
+        for commit in self.failed_commits:
+            reporter.report_violation("Trailing period (merge commits)", commit)
+        reporter.finish(False, stopped_early=stopped_early)
+        return self.stream.getvalue()
@@ -0,0 +1,140 @@
+import argparse
+import json
+import os
+import socket
+import sys
+import tempfile
+import threading
+from unittest import TestCase
+from unittest.mock import Mock, patch
+
+from dikort.client import forward
+from dikort.config import DEFAULTS, ERROR_EXIT_CODE
+from dikort.server import CheckServer
+
+SLOW_REPOSITORY = "slow"
+
+
+def _fake_analyze_commits(config, repo):
+    print("checked", config["main"]["range"])
+    sys.exit(1)
+
+
+def _fake_merge(cmd_args):
+    repository_path = vars(cmd_args).get("main:repository", "./")
+    return {"main": {"range": "HEAD", "repository": repository_path, "metrics_file": ""}}
+
+
+class TestCheckServer(TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.socket_path = os.path.join(self.tmp_dir.name, "dikort.sock")
+        self.config_path = os.path.join(self.tmp_dir.name, "dikort.cfg")
+        cmd_args = argparse.Namespace()
+        vars(cmd_args)["main:config"] = self.config_path
+        self.parse_cmd_args = Mock(return_value=cmd_args)
+        self.check_server = CheckServer(self.socket_path, self.parse_cmd_args)
+        self.addCleanup(self.check_server.server_close)
+
+    def parse_repository_argv(self, argv):
+        cmd_args = argparse.Namespace()
+        vars(cmd_args).update({"main:config": self.config_path, "main:repository": argv[0]})
+        return cmd_args
+
+    def serve_in_thread(self):
+        server_thread = threading.Thread(target=self.check_server.serve_forever)
+        server_thread.start()
+        self.addCleanup(server_thread.join)
+        self.addCleanup(self.check_server.shutdown)
+
+    @patch("git.Repo")
+    @patch("dikort.server.merge")
+    @patch("dikort.server.analyze_commits", _fake_analyze_commits)
+    def test_check(self, merge_mock, repo_mock):
+        merge_mock.return_value = {"main": {"range": "HEAD~1..HEAD", "repository": "./", "metrics_file": ""}}
+        check_response = self.check_server.check(["HEAD~1..HEAD"], self.tmp_dir.name)
+        self.assertEqual(check_response, {"exit_code": 1, "output": "checked HEAD~1..HEAD\n"})
+        repo_mock.assert_called_once_with(os.path.realpath(self.tmp_dir.name))
+        self.assertEqual(os.getcwd(), os.path.realpath(os.curdir))
+
+    @patch("dikort.server.merge")
+    def test_config(self, merge_mock):
+        merge_mock.return_value = {"main": {"repository": "./", "metrics_file": "metrics.json"}}
+        config = self.check_server.config(["HEAD"], self.tmp_dir.name)
+        self.check_server.config(["HEAD"], self.tmp_dir.name)
+        self.assertEqual(merge_mock.call_count, 1)
+        self.assertEqual(config["main"]["metrics_file"], os.path.join(self.tmp_dir.name, "metrics.json"))
+
+        with open(self.config_path, "w") as config_fp:
+            config_fp.write("[main]\n")
+        self.check_server.config(["HEAD"], self.tmp_dir.name)
+        self.assertEqual(merge_mock.call_count, 2)
+
+    @patch("dikort.server.merge")
+    def test_default_config(self, merge_mock):
+        merge_mock.return_value = {"main": {"repository": "./", "metrics_file": ""}}
+        vars(self.parse_cmd_args.return_value)["main:config"] = None
+        self.check_server.config(["HEAD"], self.tmp_dir.name)
+        self.assertEqual(vars(merge_mock.call_args[0][0])["main:config"], os.devnull)
+
+        default_config_path = os.path.join(self.tmp_dir.name, DEFAULTS["main"]["config"])
+        with open(default_config_path, "w") as config_fp:
+            config_fp.write("[main]\n")
+        vars(self.parse_cmd_args.return_value)["main:config"] = None
+        self.check_server.config(["HEAD"], self.tmp_dir.name)
+        self.assertEqual(vars(merge_mock.call_args[0][0])["main:config"], default_config_path)
+
+    @patch("dikort.server.REPOSITORIES_POOL_SIZE", 1)
+    @patch("git.Repo")
+    def test_repository(self, repo_mock):
+        first_repo = self.check_server.repository("./")
+        self.assertIs(self.check_server.repository("./"), first_repo)
+        repo_mock.assert_called_once_with(os.path.realpath("./"))
+
+        self.check_server.repository(self.tmp_dir.name)
+        first_repo.close.assert_called_once_with()
+        self.assertEqual(list(self.check_server.repositories), [os.path.realpath(self.tmp_dir.name)])
+
+    @patch("git.Repo")
+    @patch("dikort.server.merge")
+    @patch("dikort.server.analyze_commits", _fake_analyze_commits)
+    def test_forward(self, merge_mock, repo_mock):
+        merge_mock.return_value = {"main": {"range": "HEAD", "repository": "./", "metrics_file": ""}}
+        self.serve_in_thread()
+
+        self.assertEqual(forward(self.socket_path, ["HEAD"]), (1, "checked HEAD\n"))
+
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.connect(self.socket_path)
+            client.sendall(b"not a json\n")
+            with client.makefile("rb") as response_file:
+                check_response = json.loads(response_file.readline())
+        self.assertEqual(check_response["exit_code"], ERROR_EXIT_CODE)
+
+    @patch("git.Repo")
+    @patch("dikort.server.merge", _fake_merge)
+    def test_concurrent_checks(self, repo_mock):
+        slow_check_started = threading.Event()
+        fast_check_done = threading.Event()
+
+        def analyze_commits(config, repo):  # noqa: WPS430
+            repository_name = os.path.basename(config["main"]["repository"])
+            print("checked", repository_name)
+            if repository_name == SLOW_REPOSITORY:
+                slow_check_started.set()
+                fast_check_done.wait(timeout=10)
+
+        self.parse_cmd_args.side_effect = self.parse_repository_argv
+        self.serve_in_thread()
+        slow_responses = []
+        with patch("dikort.server.analyze_commits", analyze_commits):
+            slow_client = threading.Thread(
+                target=lambda: slow_responses.append(forward(self.socket_path, [SLOW_REPOSITORY]))
+            )
+            slow_client.start()
+            self.assertTrue(slow_check_started.wait(timeout=10))
+            self.assertEqual(forward(self.socket_path, ["fast"]), (0, "checked fast\n"))
+            fast_check_done.set()
+            slow_client.join()
+        self.assertEqual(slow_responses, [(0, f"checked {SLOW_REPOSITORY}\n")])
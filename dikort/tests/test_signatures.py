@@ -0,0 +1,139 @@
+import os
+import shutil
+import sqlite3
+import subprocess  # noqa: S404
+import tempfile
+from unittest import TestCase, skipUnless
+from unittest.mock import patch
+
+from dikort.commits import CommitRecord
+from dikort.signatures import (
+    Signature,
+    SignatureCache,
+    attach_signatures,
+    trust_digest,
+    verify_signatures,
+)
+from dikort.tests.git_repository import run_git
+
+GOOD_KEY = "4AEE18F83AFDEB23"
+
+
+def _fake_git_log(command, **kwargs):
+    if "config" in command:
+        return subprocess.CompletedProcess(command, 1, stdout=b"")
+    lines = []
+    for hexsha in kwargs["input"].decode().split():
+        status = "G" if hexsha.startswith("good") else "N"
+        fingerprint = GOOD_KEY if status == "G" else ""
+        lines.append(f"{hexsha}\x1f{status}\x1f{fingerprint}\x1f{fingerprint}\n")
+    return subprocess.CompletedProcess(command, 0, stdout="".join(lines).encode())
+
+
+class TestSignatureCache(TestCase):
+    def setUp(self):
+        self.git_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.git_dir.cleanup()
+
+    def test_get_update(self):
+        signature_cache = SignatureCache(self.git_dir.name, digest="trust")
+        self.assertEqual(signature_cache.get(["a", "b"]), {})
+        signature_cache.update({"a": Signature("G", GOOD_KEY, GOOD_KEY), "b": Signature("N")})
+        signature_cache.close()
+
+        signature_cache = SignatureCache(self.git_dir.name, digest="trust")
+        signatures = signature_cache.get(["a", "b"])
+        signature_cache.close()
+        self.assertEqual(list(signatures), ["a"])
+        self.assertEqual(signatures["a"].status, "G")
+        self.assertEqual(signatures["a"].fingerprint, GOOD_KEY)
+
+        signature_cache = SignatureCache(self.git_dir.name, digest="revoked trust")
+        self.assertEqual(signature_cache.get(["a", "b"]), {})
+        signature_cache.close()
+
+
+class TestVerifySignatures(TestCase):
+    def setUp(self):
+        self.git_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.git_dir.cleanup()
+
+    @patch("dikort.signatures.VERIFY_CHUNK_SIZE", 2)
+    @patch("subprocess.run", side_effect=_fake_git_log)
+    def test_verify_signatures(self, run_mock):
+        signatures = verify_signatures(self.git_dir.name, ["good1", "bad1", "good2"], jobs=2)
+        self.assertEqual(run_mock.call_count, 2)
+        self.assertEqual(
+            {hexsha: signature.status for hexsha, signature in signatures.items()},
+            {
+                "good1": "G",
+                "bad1": "N",
+                "good2": "G",
+            },
+        )
+
+    @patch("subprocess.run", side_effect=_fake_git_log)
+    def test_attach_signatures(self, run_mock):
+        commits = [CommitRecord("good1", 1, "Summary"), CommitRecord("merge", 2, "Merge"), CommitRecord("bad1", 1, "")]
+        attached_commits = list(attach_signatures(commits, self.git_dir.name, parents_counts=frozenset((1,))))
+        self.assertEqual(attached_commits, commits)
+        self.assertEqual(commits[0].signature.status, "G")
+        self.assertIsNone(commits[1].signature)
+        self.assertEqual(commits[2].signature.status, "N")
+
+        list(attach_signatures(commits, self.git_dir.name, parents_counts=frozenset((1,))))
+        log_calls = [run_call for run_call in run_mock.call_args_list if "log" in run_call[0][0]]
+        self.assertEqual(len(log_calls), 2)
+        self.assertEqual(log_calls[-1][1]["input"], b"bad1\n")
+
+    @patch("dikort.signatures.SignatureCache", side_effect=sqlite3.Error("locked"))
+    @patch("subprocess.run", side_effect=_fake_git_log)
+    def test_attach_signatures_without_cache(self, run_mock, signature_cache_mock):
+        commits = [CommitRecord("good1", 1, "Summary")]
+        with self.assertLogs(level="WARNING"):
+            list(attach_signatures(commits, self.git_dir.name, parents_counts=frozenset((1,))))
+        self.assertEqual(commits[0].signature.status, "G")
+
+
+@skipUnless(shutil.which("ssh-keygen"), "ssh-keygen is required to sign commits")
+class TestSignatureTrust(TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.repository_path = os.path.join(self.temp_dir.name, "repository")
+        key_path = os.path.join(self.temp_dir.name, "key")
+        self.allowed_signers_path = os.path.join(self.temp_dir.name, "allowed_signers")
+        keygen_command = ("ssh-keygen", "-q", "-t", "ed25519", "-N", "", "-f", key_path)
+        subprocess.run(keygen_command, check=True, capture_output=True)  # noqa: S603
+        with open(f"{key_path}.pub") as public_key_fp:
+            self.allowed_signer = f"neo@matrix.com {public_key_fp.read()}"
+        with open(self.allowed_signers_path, "w") as allowed_signers_fp:
+            allowed_signers_fp.write(self.allowed_signer)
+        run_git(self.temp_dir.name, "init", "--quiet", self.repository_path)
+        run_git(self.repository_path, "config", "gpg.format", "ssh")
+        run_git(self.repository_path, "config", "user.signingkey", f"{key_path}.pub")
+        run_git(self.repository_path, "config", "gpg.ssh.allowedSignersFile", self.allowed_signers_path)
+        run_git(self.repository_path, "commit", "--quiet", "--allow-empty", "-S", "-m", "Signed change")
+        self.git_dir = os.path.join(self.repository_path, ".git")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def attached_status(self):
+        commits = [CommitRecord(run_git(self.repository_path, "rev-parse", "HEAD"), 0, "Signed change")]
+        list(attach_signatures(commits, self.git_dir, parents_counts=frozenset((0,))))
+        return commits[0].signature.status
+
+    def test_revoked_trust(self):
+        self.assertEqual(self.attached_status(), "G")
+        good_digest = trust_digest(self.git_dir)
+        with open(self.allowed_signers_path, "w"):
+            self.assertNotEqual(trust_digest(self.git_dir), good_digest)
+        self.assertEqual(self.attached_status(), "U")
+
+        with open(self.allowed_signers_path, "w") as allowed_signers_fp:
+            allowed_signers_fp.write(self.allowed_signer)
+        self.assertEqual(self.attached_status(), "G")
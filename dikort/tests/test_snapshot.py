@@ -0,0 +1,83 @@
+import copy
+import os
+import subprocess  # noqa: S404
+import sys
+import tempfile
+from unittest import TestCase
+from unittest.mock import patch
+
+from dikort.config import DEFAULTS, _post_processing
+from dikort.snapshot import SNAPSHOTS_DIRNAME, read_snapshot, write_snapshot
+
+ARGV = ("--enable-length", "HEAD~5..HEAD")
+
+
+class TestSnapshot(TestCase):
+    def setUp(self):
+        self.cache_home = tempfile.TemporaryDirectory()
+        self.environ_patch = patch.dict(os.environ, {"XDG_CACHE_HOME": self.cache_home.name})
+        self.environ_patch.start()
+        self.config_path = os.path.join(self.cache_home.name, "dikort.cfg")
+        with open(self.config_path, "w") as config_fp:
+            config_fp.write("[rules]\nenable_length = yes\n")
+        self.config = copy.deepcopy(DEFAULTS.copy())
+        self.config["main"]["config"] = self.config_path
+        self.config["rules.settings"]["trusted_keys"] = "4AEE18F83AFDEB23"
+        _post_processing(self.config)
+
+    def tearDown(self):
+        self.environ_patch.stop()
+        self.cache_home.cleanup()
+
+    def test_read_write(self):
+        self.assertIsNone(read_snapshot(ARGV))
+        write_snapshot(ARGV, self.config)
+        self.assertEqual(read_snapshot(ARGV), self.config)
+        self.assertIsNone(read_snapshot(ARGV[:1]))
+
+    def test_config_file_changed(self):
+        write_snapshot(ARGV, self.config)
+        with open(self.config_path, "a") as config_fp:
+            config_fp.write("enable_regex = yes\n")
+        self.assertIsNone(read_snapshot(ARGV))
+
+        os.remove(self.config_path)
+        write_snapshot(ARGV, self.config)
+        self.assertEqual(read_snapshot(ARGV), self.config)
+        with open(self.config_path, "w") as new_config_fp:
+            new_config_fp.write("[rules]\n")
+        self.assertIsNone(read_snapshot(ARGV))
+
+    def test_dikort_changed(self):
+        write_snapshot(ARGV, self.config)
+        with patch("dikort.snapshot.config_module.__file__", self.config_path):
+            self.assertIsNone(read_snapshot(ARGV))
+
+    @patch("dikort.snapshot.SNAPSHOTS_MAX_COUNT", 2)
+    def test_eviction(self):
+        for argv_index in range(3):
+            write_snapshot((str(argv_index),), self.config)
+        snapshots_dir = os.path.join(self.cache_home.name, "dikort", SNAPSHOTS_DIRNAME)
+        self.assertEqual(len(os.listdir(snapshots_dir)), 2)
+
+    @patch("os.replace", side_effect=PermissionError)
+    def test_write_error(self, replace_mock):
+        write_snapshot(ARGV, self.config)
+        self.assertIsNone(read_snapshot(ARGV))
+
+    def test_miss_keeps_logging_unconfigured(self):
+        command = (
+            sys.executable,
+            "-c",
+            "import logging; from dikort.snapshot import read_snapshot, write_snapshot; "
+            "read_snapshot(['--enable-logging']); write_snapshot(['--enable-logging'], {'main': {'config': ''}}); "
+            "logging.basicConfig(level=logging.DEBUG, format='configured %(message)s'); logging.debug('check')",
+        )
+        python_run = subprocess.run(  # noqa: S603
+            command,
+            capture_output=True,
+            check=True,
+            env={**os.environ, "XDG_CACHE_HOME": self.cache_home.name},
+            text=True,
+        )
+        self.assertEqual(python_run.stderr, "configured check\n")
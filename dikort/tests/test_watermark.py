@@ -0,0 +1,32 @@
+from unittest import TestCase
+from unittest.mock import Mock
+
+from git.exc import GitCommandError
+
+from dikort.watermark import Watermark
+
+
+class TestWatermark(TestCase):
+    def setUp(self):
+        self.repo = Mock()
+        self.repo.active_branch.name = "main"
+        self.repo.git.rev_parse.return_value = "bbb"
+
+    def test_init(self):
+        watermark = Watermark(self.repo)
+        self.assertEqual(watermark.ref, "refs/dikort/verified/main")
+        self.assertEqual(watermark.head_hexsha, "bbb")
+
+    def test_commit_range(self):
+        watermark = Watermark(self.repo)
+        self.repo.git.rev_parse.return_value = "aaa"
+        self.assertEqual(watermark.commit_range("HEAD~1..HEAD"), "aaa..bbb")
+        self.repo.git.rev_parse.assert_called_with("--verify", "--quiet", "refs/dikort/verified/main^{commit}")
+
+        self.repo.git.rev_parse.side_effect = GitCommandError("git rev-parse", 1)
+        self.assertEqual(watermark.commit_range("HEAD~1..HEAD"), "HEAD~1..HEAD")
+
+    def test_update(self):
+        watermark = Watermark(self.repo)
+        watermark.update()
+        self.repo.git.update_ref.assert_called_once_with("refs/dikort/verified/main", "bbb")
@@ -0,0 +1,26 @@
+import logging
+
+from git.exc import GitCommandError
+
+WATERMARK_REF_PREFIX = "refs/dikort/verified/"
+
+
+class Watermark:
+    def __init__(self, repo):
+        self._repo = repo
+        branch = repo.active_branch.name
+        self.ref = f"{WATERMARK_REF_PREFIX}{branch}"
+        self.head_hexsha = repo.git.rev_parse("HEAD")
+
+    def commit_range(self, default_range):
+        try:
+            verified_hexsha = self._repo.git.rev_parse("--verify", "--quiet", f"{self.ref}^{{commit}}")
+        except GitCommandError:
+            logging.info("Watermark %s not found. Use range %s", self.ref, default_range)
+            return default_range
+        logging.info("Watermark %s points to %s", self.ref, verified_hexsha)
+        return f"{verified_hexsha}..{self.head_hexsha}"
+
+    def update(self):
+        logging.info("Move watermark %s to %s", self.ref, self.head_hexsha)
+        self._repo.git.update_ref(self.ref, self.head_hexsha)